@@ -0,0 +1,124 @@
+# Akses SQLite untuk mode async (asgi.py). sqlite3 tidak punya API async,
+# jadi setiap koneksi mendapat satu thread executor khusus: coroutine
+# menunggu hasil query tanpa memblok event loop, dan koneksi tidak pernah
+# dipakai dua thread. Thread itu memasang koneksinya lewat db.bind_thread,
+# sehingga helper sinkron yang memanggil get_db_connection() (get_movie_screenings,
+# session store, dll.) bisa dijalankan apa adanya lewat `await pool.call(fn, ...)`.
+import asyncio
+import contextvars
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+from flask import has_app_context
+
+import db
+
+
+class AsyncConnection:
+    """Satu koneksi SQLite + satu thread yang menjalankan semua pekerjaannya"""
+    def __init__(self, path):
+        self.path = path
+        self.conn = None
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix='aiodb', initializer=self._open)
+
+    def _open(self):
+        self.conn = db.connect(self.path, check_same_thread=False)
+        db.bind_thread(self.conn)
+
+    def _run(self, fn, args, kwargs):
+        # Hook checkout/release (metrics) hanya jika context Flask ikut disalin
+        hooked = has_app_context()
+        if hooked:
+            for hook in db.checkout_hooks:
+                hook(self.conn)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            if hooked:
+                for hook in db.release_hooks:
+                    hook(self.conn)
+            if self.conn.in_transaction:
+                self.conn.rollback()
+
+    async def call(self, fn, *args, **kwargs):
+        """Jalankan fn(*args, **kwargs) di thread koneksi ini.
+
+        Context pemanggil (request/app context Flask) disalin ke thread itu,
+        jadi session, g dan current_app tetap bisa dipakai di dalam fn.
+        """
+        ctx = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, ctx.run, self._run, fn, args, kwargs)
+
+    async def fetchall(self, sql, params=()):
+        return await self.call(lambda: self.conn.execute(sql, params).fetchall())
+
+    async def fetchone(self, sql, params=()):
+        return await self.call(lambda: self.conn.execute(sql, params).fetchone())
+
+    def _close(self):
+        try:
+            self.conn.close()
+        except sqlite3.Error:
+            pass
+
+    def close(self):
+        if self.conn is not None:
+            self._executor.submit(self._close)
+        self._executor.shutdown(wait=True)
+
+
+class AsyncPool:
+    """Pool AsyncConnection berukuran tetap, padanan db.ConnectionPool untuk coroutine.
+
+    Koneksi dipinjam per panggilan (bukan per request), jadi coroutine yang
+    sedang merender template tidak menahan thread database.
+    """
+    def __init__(self, path, max_size=8, timeout=10.0):
+        self.path = path
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle = None  # asyncio.LifoQueue, dibuat di event loop yang memakainya
+        self._all = []
+
+    async def acquire(self):
+        if self._idle is None:
+            self._idle = asyncio.LifoQueue()
+        if self._idle.empty() and len(self._all) < self.max_size:
+            conn = AsyncConnection(self.path)
+            self._all.append(conn)
+            return conn
+        try:
+            return await asyncio.wait_for(self._idle.get(), self.timeout)
+        except asyncio.TimeoutError:
+            raise db.PoolTimeout(f"Tidak ada koneksi database tersedia dalam {self.timeout} detik") from None
+
+    def release(self, conn):
+        self._idle.put_nowait(conn)
+
+    @asynccontextmanager
+    async def connection(self):
+        conn = await self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    async def call(self, fn, *args, **kwargs):
+        async with self.connection() as conn:
+            return await conn.call(fn, *args, **kwargs)
+
+    async def fetchall(self, sql, params=()):
+        async with self.connection() as conn:
+            return await conn.fetchall(sql, params)
+
+    async def fetchone(self, sql, params=()):
+        async with self.connection() as conn:
+            return await conn.fetchone(sql, params)
+
+    def close_all(self):
+        for conn in self._all:
+            conn.close()
+        self._all = []
+        self._idle = None
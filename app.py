@@ -1,92 +1,149 @@
 # Imports untuk Flask dan library pendukung
-from flask import Flask, render_template, request, redirect, url_for, session, flash
-from datetime import datetime
+from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify
+from datetime import datetime, timedelta, timezone
+from collections import OrderedDict
+from jinja2 import FileSystemBytecodeCache
+from markupsafe import Markup
+import hashlib
+import hmac
 import sqlite3
 import os
-from werkzeug.security import generate_password_hash, check_password_hash
-from functools import wraps
+import threading
+import time
+import uuid
+from functools import lru_cache, wraps
+
+import assets
+import auditoriums
+import db
+import media
+import metrics
+import migrations
+import passwords
+import posters
+import querylog
+import screenings
+import seatfeed
+import sessions
+from db import DB_PATH, get_db_connection
 
 # Inisialisasi aplikasi Flask
 app = Flask(__name__)
 app.secret_key = 'your_secret_key_here'  # Kunci untuk enkripsi session
 
-# Konfigurasi database
-DB_PATH = os.path.join(os.path.dirname(__file__), 'database.db')
-
-# Fungsi koneksi database
-def get_db_connection():
-    """Membuat koneksi ke database SQLite"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row  # Kembalikan hasil query sebagai dictionary
-    return conn
+# Konfigurasi database (koneksi per request dari pool, lihat db.py)
+app.config['DATABASE'] = DB_PATH
+app.config['DB_WAL'] = True
+db.init_app(app)
+
+# Mode diagnostik: timing per statement + log query lambat dengan EXPLAIN QUERY PLAN
+# (lihat querylog.py, ringkasan lewat scripts/query_report.py)
+app.config['DB_DIAGNOSTICS'] = os.environ.get('DB_DIAGNOSTICS') == '1'
+app.config['DB_SLOW_QUERY_MS'] = float(os.environ.get('DB_SLOW_QUERY_MS', 50))
+querylog.init_app(app)
+
+# Session server-side: cookie hanya membawa ID (lihat sessions.py)
+sessions.init_app(app)
+
+# Poster film di-cache lokal + thumbnail (lihat posters.py)
+posters.init_app(app)
+
+# CSS/JS hasil build (minify + hash + precompress, lihat scripts/build_assets.py)
+assets.init_app(app)
+
+# Video/GIF: Range/206, cache panjang, varian mobile (lihat media.py)
+media.init_app(app)
+
+# Jadwal tayang: pemutaran (screenings) dibentuk dari pola movies.showtimes (lihat screenings.py)
+screenings.init_app(app)
+
+# Hashing password di process pool terbatas + admission control (lihat passwords.py)
+passwords.init_app(app)
+
+# Instrumentasi request (latensi, query/koneksi per request, render template) di /admin/metrics
+metrics.init_app(app)
+app.config['METRICS_TOKEN'] = os.environ.get('METRICS_TOKEN')  # bearer token untuk scraper Prometheus
+for _key, _kind, _help in (
+    ('inflight', 'gauge', 'Hashing password yang sedang antre/berjalan'),
+    ('rejected', 'counter', 'Login/registrasi yang ditolak 503 karena antrean hashing penuh'),
+    ('timeout', 'counter', 'Hashing password yang melewati PASSWORD_HASH_TIMEOUT'),
+    ('rehash', 'counter', 'Password yang di-hash ulang ke cost baru saat login'),
+):
+    metrics.registry.register(metrics.Sampled(
+        f'password_hash_{_key}', _help, lambda key=_key: passwords.hasher.stats()[key], _kind))
+metrics.registry.register(metrics.Sampled(
+    'password_hash_latency_p95_seconds', 'Latensi hashing password p95 (termasuk antre)',
+    lambda: passwords.hasher.stats()['latency_p95']))
+
+# Hold kursi: berlaku selama user di halaman pembayaran
+app.config['SEAT_HOLD_TTL'] = 600  # detik
+app.config['SEAT_HOLD_SWEEP_INTERVAL'] = 30  # detik
+
+# Perubahan kursi didorong ke halaman /book yang terbuka lewat SSE (lihat seatfeed.py)
+seatfeed.init_app(app)
+for _key, _kind, _help in (
+    ('subscribers', 'gauge', 'Koneksi SSE feed kursi yang terbuka di worker ini'),
+    ('screenings', 'gauge', 'Pemutaran yang dipantau feed kursi'),
+    ('events', 'counter', 'Delta kursi yang disusun feed (sekali per pemutaran, bukan per koneksi)'),
+    ('resyncs', 'counter', 'Antrean koneksi lambat yang dibuang dan diganti snapshot'),
+):
+    metrics.registry.register(metrics.Sampled(
+        f'seat_feed_{_key}', _help, lambda key=_key: seatfeed.stats()[key], _kind))
+
+# Cache katalog: versi di database dicek paling sering sekali per interval
+app.config['CATALOG_CHECK_INTERVAL'] = 2.0  # detik
+# Cache identitas user (role/membership) untuk session & admin_required
+app.config['IDENTITY_CACHE_TTL'] = 30  # detik
+app.config['IDENTITY_CACHE_SIZE'] = 4096
+# Halaman utama yang sudah dirender, per versi katalog x status login
+app.config['HOME_PAGE_CACHE_SIZE'] = 256
+
+# Pagination keyset: jumlah baris per halaman (dan batas maksimalnya)
+app.config['PAGE_SIZE'] = 50
+app.config['MAX_PAGE_SIZE'] = 500
+
+# Bytecode template Jinja di disk, dipakai bersama semua worker dan restart:
+# proses baru memuat template terkompilasi alih-alih mengompilasi ulang.
+# JINJA_CACHE_DIR='' mematikan cache ini.
+app.config['JINJA_CACHE_DIR'] = os.environ.get('JINJA_CACHE_DIR', os.path.join(app.root_path, '.jinja_cache'))
+
+
+def init_template_cache(flask_app):
+    """Pasang FileSystemBytecodeCache di JINJA_CACHE_DIR (dilewati jika tidak bisa ditulis).
+
+    Dipanggil saat server start (configure_app/warm_app), bukan saat import:
+    import harus bebas I/O dan tetap jalan di tree deploy yang read-only.
+    """
+    directory = flask_app.config['JINJA_CACHE_DIR']
+    cache = None
+    if directory:
+        try:
+            os.makedirs(directory, exist_ok=True)
+            if os.access(directory, os.W_OK):
+                cache = FileSystemBytecodeCache(directory)
+        except OSError:
+            pass
+    flask_app.jinja_env.bytecode_cache = cache
 
 
-# Inisialisasi database
+# Inisialisasi database: terapkan migrasi skema yang belum dijalankan
 def init_db():
+    if app.config['DB_WAL']:
+        db.configure_database(app.config['DATABASE'])
     conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute(
-        '''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            email TEXT NOT NULL UNIQUE,
-            password TEXT NOT NULL,
-            membership TEXT NOT NULL DEFAULT 'member',
-            created_at TEXT
-        )
-        '''
-    )
-    # Ensure 'role' column exists for admin/user roles
-    cur.execute("PRAGMA table_info(users)")
-    cols = [r[1] for r in cur.fetchall()]
-    if 'role' not in cols:
-        try:
-            cur.execute("ALTER TABLE users ADD COLUMN role TEXT DEFAULT 'user'")
-        except Exception:
-            pass
-    # movies table - untuk menyimpan data film yang dapat dikelola admin
-    cur.execute(
-        '''
-        CREATE TABLE IF NOT EXISTS movies (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT NOT NULL,
-            genre TEXT,
-            duration INTEGER,
-            poster TEXT,
-            showtimes TEXT,
-            regular_price INTEGER DEFAULT 50000,
-            vip_price INTEGER DEFAULT 75000,
-            available_seats INTEGER DEFAULT 50,
-            created_at TEXT,
-            updated_at TEXT
-        )
-        '''
-    )
-    # orders table
-    cur.execute(
-        '''
-        CREATE TABLE IF NOT EXISTS orders (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            movie_id INTEGER,
-            movie_title TEXT,
-            seat TEXT,
-            ticket_type TEXT,
-            showtime TEXT,
-            ticket_price INTEGER,
-            admin_fee INTEGER,
-            price INTEGER,
-            membership TEXT,
-            snack_included INTEGER DEFAULT 0,
-            customer TEXT,
-            email TEXT,
-            date TEXT,
-            payment_method TEXT
-        )
-        '''
-    )
-    conn.commit()
-    conn.close()
+    migrations.migrate(conn)
+
+
+def split_seats(seat_str):
+    """Pecah string kursi "A1, A2" menjadi list unik (urutan dipertahankan)"""
+    seats = []
+    seen = set()
+    for part in (seat_str or '').split(','):
+        p = part.strip()
+        if p and p not in seen:
+            seen.add(p)
+            seats.append(p)
+    return seats
 
 
 # Helper functions untuk user management
@@ -94,7 +151,7 @@ def create_user(name, email, password, membership='member'):
     """Membuat user baru dan menyimpan ke database"""
     conn = get_db_connection()
     cur = conn.cursor()
-    hashed = generate_password_hash(password)  # Hash password untuk keamanan
+    hashed = passwords.hash_password(password)  # Hash password untuk keamanan (process pool)
     now = datetime.now().strftime("%Y-%m-%d %H:%M")
     try:
         cur.execute("INSERT INTO users (name, email, password, membership, created_at, role) VALUES (?, ?, ?, ?, ?, ?)",
@@ -102,10 +159,18 @@ def create_user(name, email, password, membership='member'):
         conn.commit()
         user_id = cur.lastrowid
     except sqlite3.IntegrityError:
-        conn.close()
         return None
-    conn.close()
-    return get_user_by_id(user_id)
+    # Data baru sudah diketahui: isi cache identitas tanpa membaca ulang database
+    identity = {'id': user_id, 'name': name, 'email': email, 'membership': membership, 'role': 'user', 'version': 1}
+    identity_cache.put(identity)
+    return dict(identity)
+
+
+def update_password_hash(user_id, pwhash):
+    """Simpan hash password baru (rehash saat login)"""
+    conn = get_db_connection()
+    conn.execute("UPDATE users SET password = ? WHERE id = ?", (pwhash, user_id))
+    conn.commit()
 
 
 def get_user_by_email(email):
@@ -114,7 +179,6 @@ def get_user_by_email(email):
     cur = conn.cursor()
     cur.execute("SELECT * FROM users WHERE email = ?", (email,))
     row = cur.fetchone()
-    conn.close()
     return row
 
 
@@ -124,79 +188,368 @@ def get_user_by_id(user_id):
     cur = conn.cursor()
     cur.execute("SELECT * FROM users WHERE id = ?", (user_id,))
     row = cur.fetchone()
-    conn.close()
     return row
 
 
+def session_identity(user):
+    """Data user yang disimpan di session (dari row users)"""
+    keys = user.keys()
+    return {
+        'id': user['id'], 'name': user['name'], 'email': user['email'], 'membership': user['membership'],
+        'role': user['role'] if 'role' in keys and user['role'] else 'user',
+        'version': user['version'] if 'version' in keys else 1,
+    }
+
+
+class IdentityCache:
+    """Cache identitas user in-process (TTL + LRU).
+
+    Dipakai untuk menyegarkan session dan cek admin tanpa query per request.
+    admin_upgrade meng-invalidate entri langsung; perubahan dari proses lain
+    (mis. scripts/seed_admin.py) terlihat paling lambat setelah
+    IDENTITY_CACHE_TTL, lewat kolom users.version yang dinaikkan trigger.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # (path database, user id) -> (identity, waktu dimuat)
+
+    def get(self, user_id):
+        key = (app.config['DATABASE'], user_id)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and now - entry[1] < app.config['IDENTITY_CACHE_TTL']:
+                self._entries.move_to_end(key)
+                return entry[0]
+        row = get_user_by_id(user_id)
+        identity = session_identity(row) if row else None
+        self._store(key, identity, now)
+        return identity
+
+    def put(self, identity):
+        self._store((app.config['DATABASE'], identity['id']), identity, time.monotonic())
+
+    def _store(self, key, identity, loaded_at):
+        with self._lock:
+            self._entries[key] = (identity, loaded_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > app.config['IDENTITY_CACHE_SIZE']:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop((app.config['DATABASE'], user_id), None)
+
+
+identity_cache = IdentityCache()
+
+
 # Helper functions untuk order management
-def save_order_db(order):
-    """Simpan order ke database"""
-    conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        INSERT INTO orders (movie_id, movie_title, seat, ticket_type, showtime, ticket_price, admin_fee, price, membership, snack_included, customer, email, date, payment_method)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (
-            order.get('movie_id'),
-            order.get('movie_title'),
-            order.get('seat'),
-            order.get('ticket_type'),
-            order.get('showtime'),
-            order.get('ticket_price'),
-            order.get('admin_fee'),
-            order.get('price'),
-            order.get('membership'),
-            1 if order.get('snack_included') else 0,
-            order.get('customer'),
-            order.get('email'),
-            order.get('date'),
-            order.get('payment_method', '')
-        )
+class SeatUnavailable(Exception):
+    """Kursi sudah terjual atau sedang ditahan pemesan lain"""
+    def __init__(self, seats):
+        super().__init__(', '.join(seats))
+        self.seats = seats
+
+
+def _seats_held_by_others(conn, screening_id, ticket_type, seats, hold_token):
+    """Kursi dari `seats` yang masih ditahan (belum kedaluwarsa) token lain"""
+    placeholders = ', '.join('?' for _ in seats)
+    cur = conn.execute(
+        f"""SELECT seat FROM seat_holds
+            WHERE screening_id = ? AND ticket_type = ? AND seat IN ({placeholders})
+              AND expires_at > ? AND hold_token IS NOT ?""",
+        (screening_id, ticket_type, *seats, time.time(), hold_token)
     )
-    conn.commit()
-    oid = cur.lastrowid
-    conn.close()
+    return {r['seat'] for r in cur.fetchall()}
+
+
+def save_order_db(order, hold_token=None):
+    """Simpan order ke database.
+
+    Order dan baris order_seats ditulis dalam satu transaksi BEGIN IMMEDIATE,
+    lalu hold milik `hold_token` dilepas. Jika salah satu kursi sudah terjual
+    atau ditahan pemesan lain, transaksi dibatalkan dan fungsi mengembalikan None.
+    """
+    conn = get_db_connection()
+    seats = split_seats(order.get('seat'))
+    screening_id = order.get('screening_id')
+    ticket_type = order.get('ticket_type') or ''
+    try:
+        with db.immediate_transaction(conn):
+            held = _seats_held_by_others(conn, screening_id, ticket_type, seats, hold_token)
+            if held:
+                raise SeatUnavailable([seat for seat in seats if seat in held])
+            cur = conn.execute(
+                """
+                INSERT INTO orders (movie_id, screening_id, movie_title, seat, ticket_type, showtime, ticket_price, admin_fee, price, membership, snack_included, customer, email, date, payment_method)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    order.get('movie_id'),
+                    screening_id,
+                    order.get('movie_title'),
+                    order.get('seat'),
+                    order.get('ticket_type'),
+                    order.get('showtime'),
+                    order.get('ticket_price'),
+                    order.get('admin_fee'),
+                    order.get('price'),
+                    order.get('membership'),
+                    1 if order.get('snack_included') else 0,
+                    order.get('customer'),
+                    order.get('email'),
+                    order.get('date'),
+                    order.get('payment_method', '')
+                )
+            )
+            oid = cur.lastrowid
+            # Primary key order_seats menolak kursi yang sudah terjual
+            conn.executemany(
+                "INSERT INTO order_seats (screening_id, ticket_type, seat, order_id) VALUES (?, ?, ?, ?)",
+                [(screening_id, ticket_type, seat, oid) for seat in seats]
+            )
+            if hold_token:
+                conn.execute("DELETE FROM seat_holds WHERE hold_token = ?", (hold_token,))
+            _record_sale(conn, order, len(seats))
+    except (SeatUnavailable, sqlite3.IntegrityError):
+        return None
+    seatfeed.touch(screening_id)
     return oid
 
 
-def get_all_orders_db():
+def _record_sale(conn, order, seat_count):
+    """Perbarui tabel rollup penjualan (dipanggil di transaksi save_order_db)"""
+    revenue = order.get('price') or 0
+    upsert = " ON CONFLICT ({key}) DO UPDATE SET orders = orders + 1, seats = seats + excluded.seats, revenue = revenue + excluded.revenue"
+    conn.execute(
+        "INSERT INTO sales_daily (day, orders, seats, revenue) VALUES (?, 1, ?, ?)" + upsert.format(key='day'),
+        ((order.get('date') or '')[:10], seat_count, revenue)
+    )
+    conn.execute(
+        "INSERT INTO sales_by_movie (movie_id, movie_title, orders, seats, revenue) VALUES (?, ?, 1, ?, ?)" + upsert.format(key='movie_id'),
+        (order.get('movie_id'), order.get('movie_title'), seat_count, revenue)
+    )
+    conn.execute(
+        "INSERT INTO sales_by_screening (screening_id, orders, seats, revenue) VALUES (?, 1, ?, ?)" + upsert.format(key='screening_id'),
+        (order.get('screening_id'), seat_count, revenue)
+    )
+    conn.execute(
+        "INSERT INTO sales_by_payment (payment_method, orders, seats, revenue) VALUES (?, 1, ?, ?)" + upsert.format(key='payment_method'),
+        (order.get('payment_method') or '', seat_count, revenue)
+    )
+
+
+def get_sales_summary(days=7, top_movies=10):
+    """Angka utama dashboard admin, dibaca dari tabel rollup (hanya `top_movies`
+    film dengan pendapatan terbesar, bukan seluruh katalog)"""
     conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM orders ORDER BY id DESC")
-    rows = cur.fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+    totals = conn.execute(
+        "SELECT COALESCE(SUM(orders), 0) AS orders, COALESCE(SUM(seats), 0) AS seats, COALESCE(SUM(revenue), 0) AS revenue FROM sales_by_payment"
+    ).fetchone()
+    today = conn.execute(
+        "SELECT orders, seats, revenue FROM sales_daily WHERE day = ?", (datetime.now().strftime("%Y-%m-%d"),)
+    ).fetchone()
+    return {
+        'orders': totals['orders'],
+        'seats': totals['seats'],
+        'revenue': totals['revenue'],
+        'today': dict(today) if today else {'orders': 0, 'seats': 0, 'revenue': 0},
+        'daily': [dict(r) for r in conn.execute("SELECT * FROM sales_daily ORDER BY day DESC LIMIT ?", (days,))],
+        'by_movie': [dict(r) for r in conn.execute("SELECT * FROM sales_by_movie ORDER BY revenue DESC LIMIT ?", (top_movies,))],
+        'by_payment': [dict(r) for r in conn.execute("SELECT * FROM sales_by_payment ORDER BY revenue DESC")],
+    }
+
 
+def hold_seats(screening_id, ticket_type, seat_list, hold_token, ttl=None):
+    """Tahan kursi sementara untuk `hold_token` selama `ttl` detik.
 
-def get_orders_by_user_email(email):
+    Cek dan penulisan hold terjadi dalam satu transaksi BEGIN IMMEDIATE.
+    Hold lama milik token yang sama diganti. Kembalikan list kursi yang
+    tidak tersedia (kosong jika semua kursi berhasil ditahan).
+    """
+    ttl = app.config['SEAT_HOLD_TTL'] if ttl is None else ttl
     conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM orders WHERE email = ? ORDER BY id DESC", (email,))
-    rows = cur.fetchall()
-    conn.close()
-    return [dict(r) for r in rows]
+    placeholders = ', '.join('?' for _ in seat_list)
+    try:
+        with db.immediate_transaction(conn):
+            # Semua tipe tiket: order lama (sebelum denah bertier) bisa memakai kursi
+            # yang sama dengan tipe lain
+            cur = conn.execute(
+                f"SELECT seat FROM order_seats WHERE screening_id = ? AND seat IN ({placeholders})",
+                (screening_id, *seat_list)
+            )
+            taken = {r['seat'] for r in cur.fetchall()}
+            taken |= _seats_held_by_others(conn, screening_id, ticket_type, seat_list, hold_token)
+            if taken:
+                raise SeatUnavailable([seat for seat in seat_list if seat in taken])
+            # Satu token hanya memegang satu pilihan kursi aktif
+            conn.execute("DELETE FROM seat_holds WHERE hold_token = ?", (hold_token,))
+            expires_at = time.time() + ttl
+            # REPLACE menimpa hold kedaluwarsa milik token lain
+            conn.executemany(
+                "INSERT OR REPLACE INTO seat_holds (screening_id, ticket_type, seat, hold_token, expires_at) VALUES (?, ?, ?, ?, ?)",
+                [(screening_id, ticket_type, seat, hold_token, expires_at) for seat in seat_list]
+            )
+    except SeatUnavailable as e:
+        return e.seats
+    # Hold lama token ini di pemutaran lain ikut terdeteksi lewat data_version
+    seatfeed.touch(screening_id)
+    ensure_hold_sweeper()
+    return []
+
+
+def release_seat_holds(hold_token):
+    """Lepas semua hold milik token"""
+    conn = get_db_connection()
+    cur = conn.execute("DELETE FROM seat_holds WHERE hold_token = ?", (hold_token,))
+    conn.commit()
+    if cur.rowcount:
+        seatfeed.touch(None)
+
+
+def sweep_expired_holds():
+    """Hapus hold yang sudah kedaluwarsa, kembalikan jumlah baris yang dihapus"""
+    conn = get_db_connection()
+    cur = conn.execute("DELETE FROM seat_holds WHERE expires_at <= ?", (time.time(),))
+    conn.commit()
+    if cur.rowcount:
+        seatfeed.touch(None)
+    return cur.rowcount
+
+
+class HoldSweeper(threading.Thread):
+    """Thread latar belakang yang melepas hold kedaluwarsa secara berkala"""
+    def __init__(self, flask_app, interval):
+        super().__init__(name='seat-hold-sweeper', daemon=True)
+        self.flask_app = flask_app
+        self.interval = interval
+        self.pid = os.getpid()
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                with self.flask_app.app_context():
+                    sweep_expired_holds()
+            except sqlite3.Error as e:
+                self.flask_app.logger.warning('Gagal membersihkan seat hold: %s', e)
+
+    def stop(self):
+        self._stopped.set()
+
+
+_hold_sweeper = None
+_hold_sweeper_lock = threading.Lock()
+
+
+def ensure_hold_sweeper():
+    """Jalankan HoldSweeper sekali per proses (aman setelah fork)"""
+    global _hold_sweeper
+    with _hold_sweeper_lock:
+        if _hold_sweeper is None or _hold_sweeper.pid != os.getpid():
+            _hold_sweeper = HoldSweeper(app, app.config['SEAT_HOLD_SWEEP_INTERVAL'])
+            _hold_sweeper.start()
+    return _hold_sweeper
+
+
+def _fetch_page(table, columns, where=(), params=(), before_id=None, limit=None):
+    """Satu halaman keyset (id DESC): kembalikan (rows, next_cursor).
+
+    `before_id` adalah cursor dari halaman sebelumnya; next_cursor None berarti
+    halaman terakhir. Ukuran halaman dibatasi MAX_PAGE_SIZE.
+    """
+    limit = min(limit or app.config['PAGE_SIZE'], app.config['MAX_PAGE_SIZE'])
+    clauses, args = list(where), list(params)
+    if before_id is not None:
+        clauses.append("id < ?")
+        args.append(before_id)
+    sql = f"SELECT {columns} FROM {table}"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY id DESC LIMIT ?"
+    conn = get_db_connection()
+    rows = conn.execute(sql, (*args, limit + 1)).fetchall()
+    next_cursor = rows[limit - 1]['id'] if len(rows) > limit else None
+    return [dict(r) for r in rows[:limit]], next_cursor
+
 
+def get_orders_page_db(before_id=None, limit=None, email=None):
+    """Satu halaman order terbaru (semua order, atau milik satu email)"""
+    if email is not None:
+        return _fetch_page('orders', '*', ["email = ?"], [email], before_id, limit)
+    return _fetch_page('orders', '*', before_id=before_id, limit=limit)
 
-def get_booked_seats_db(movie_id, showtime, ticket_type):
+
+def get_users_page_db(before_id=None, limit=None):
+    """Satu halaman user terbaru untuk halaman admin /users"""
+    return _fetch_page('users', 'id, name, email, membership, role, created_at', before_id=before_id, limit=limit)
+
+
+def iter_orders_db(email=None, batch_size=500):
+    """Iterasi semua order (id DESC) per batch keyset, tanpa memuat seluruh tabel"""
+    before_id = None
+    while True:
+        rows, before_id = get_orders_page_db(before_id, batch_size, email)
+        yield from rows
+        if before_id is None:
+            return
+
+
+def get_booked_seats_db(screening_id, ticket_type):
+    """Daftar kursi terjual untuk satu pemutaran (ticket_type opsional)"""
     conn = get_db_connection()
     cur = conn.cursor()
-    # Select seats from orders that match movie_id and showtime; ticket_type optional
+    # Lookup lewat primary key order_seats; ticket_type optional
     if ticket_type:
-        cur.execute("SELECT seat FROM orders WHERE movie_id = ? AND showtime = ? AND ticket_type = ?", (movie_id, showtime, ticket_type))
+        cur.execute("SELECT seat FROM order_seats WHERE screening_id = ? AND ticket_type = ?", (screening_id, ticket_type))
     else:
-        cur.execute("SELECT seat FROM orders WHERE movie_id = ? AND showtime = ?", (movie_id, showtime))
+        cur.execute("SELECT DISTINCT seat FROM order_seats WHERE screening_id = ?", (screening_id,))
     rows = cur.fetchall()
-    conn.close()
-    seats = []
-    for r in rows:
-        s = r['seat'] or ''
-        for part in s.split(','):
-            p = part.strip()
-            if p and p not in seats:
-                seats.append(p)
-    return seats
+    return [r['seat'] for r in rows]
+
+
+def get_availability_by_screening(screening_ids, hold_token=None):
+    """Kursi tidak tersedia (terjual atau ditahan pemesan lain) untuk beberapa
+    pemutaran & semua tipe tiket dalam satu query (prefix primary key screening_id).
+
+    Struktur: { 12: { "Regular": ["A1", "A2"], "VIP": ["B1"] }, ... }
+    """
+    availability = {sid: {"Regular": [], "VIP": []} for sid in screening_ids}
+    if not availability:
+        return availability
+    placeholders = ', '.join('?' for _ in availability)
+    conn = get_db_connection()
+    cur = conn.cursor()
+    cur.execute(
+        f"""SELECT screening_id, ticket_type, seat FROM order_seats WHERE screening_id IN ({placeholders})
+            UNION ALL
+            SELECT screening_id, ticket_type, seat FROM seat_holds
+            WHERE screening_id IN ({placeholders}) AND expires_at > ? AND hold_token IS NOT ?""",
+        (*availability, *availability, time.time(), hold_token)
+    )
+    for r in cur.fetchall():
+        availability[r['screening_id']].setdefault(r['ticket_type'], []).append(r['seat'])
+    return availability
+
+
+def get_screenings_on(day):
+    """Semua pemutaran pada satu tanggal, dengan penjualan dari rollup"""
+    start = day.replace(hour=0, minute=0, second=0, microsecond=0)
+    return screenings.between(get_db_connection(), start, start + timedelta(days=1))
+
+
+def get_movie_screenings(movie_id):
+    """Pemutaran film yang masih bisa dipesan (jadwal diperpanjang sekali per hari)"""
+    conn = get_db_connection()
+    days = app.config['SCREENING_DAYS_AHEAD']
+    screenings.keeper.ensure(conn, app.config['DATABASE'], days)
+    rows = screenings.upcoming(conn, movie_id, days)
+    for row in rows:
+        row['label'] = screenings.label(row['starts_at'], row['hall'])
+        # Denah studio (immutable, di-cache per versi; lihat auditoriums.py)
+        row['layout'] = auditoriums.cache.get(conn, app.config['DATABASE'], row['hall'], row.pop('layout_version'))
+    return rows
 
 
 def apply_membership_discount(price, membership):
@@ -209,14 +562,19 @@ def apply_membership_discount(price, membership):
 
 
 # HELPER FUNCTION
+@lru_cache(maxsize=None)
 def generate_seats(rows=14, seats_per_row=20):
-    """Generate seat list from A1-A20, B1-B20, ..., N1-N20"""
+    """Generate seat list from A1-A20, B1-B20, ..., N1-N20.
+
+    Hasilnya tuple (immutable) yang dihitung sekali per ukuran lalu dipakai
+    ulang oleh setiap request /book.
+    """
     seat_rows = [chr(65 + i) for i in range(rows)]  # A to N (14 rows)
     seats = []
     for row in seat_rows:
         for seat_num in range(1, seats_per_row + 1):
             seats.append(f"{row}{seat_num}")
-    return seats
+    return tuple(seats)
 
 def format_currency(value):
     """Format number with thousand separator (dot)"""
@@ -239,6 +597,19 @@ def login_required(f):
     return decorated
 
 
+@app.before_request
+def refresh_session_user():
+    """Samakan data user di session dengan cache identitas (membership/role terbaru)"""
+    user = session.get('user')
+    if not user or request.endpoint in sessions.SESSIONLESS_ENDPOINTS:
+        return
+    identity = identity_cache.get(user.get('id'))
+    if identity is None:
+        session.pop('user', None)
+    elif identity['version'] != user.get('version'):
+        session['user'] = dict(identity)
+
+
 def admin_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
@@ -246,38 +617,106 @@ def admin_required(f):
         if not user:
             flash('Silakan login terlebih dulu')
             return redirect(url_for('login'))
-        # check role from session; fallback to DB lookup
+        # role di session sudah disegarkan dari cache identitas (refresh_session_user)
         if user.get('role') == 'admin':
             return f(*args, **kwargs)
-        # try retrieving fresh role from DB
-        db_user = get_user_by_id(user.get('id'))
-        if db_user and 'role' in db_user.keys() and db_user['role'] == 'admin':
-            # refresh session role
-            session['user']['role'] = 'admin'
-            return f(*args, **kwargs)
         flash('Akses ditolak: hanya admin yang dapat mengakses halaman ini')
         return redirect(url_for('home'))
     return decorated
 
 
 # ===== MOVIE MANAGEMENT FUNCTIONS =====
+class CatalogSnapshot:
+    """Isi katalog film pada satu versi (read-only, dipakai bersama antar request)"""
+    def __init__(self, version, rows, changed_at=None):
+        self.version = version
+        self.changed_at = changed_at  # catalog_version.changed_at (UTC), None di database lama
+        self.movies = []
+        for r in rows:
+            movie = dict(r)
+            movie['regular_price'] = int(movie['regular_price'] or 0)
+            movie['vip_price'] = int(movie['vip_price'] or 0)
+            self.movies.append(movie)
+        self.by_id = {m['id']: m for m in self.movies}
+        self.updated_at = max((m['updated_at'] or '' for m in self.movies), default='')
+        # Cache render yang ikut hangus bersama snapshot saat versi berubah
+        self.fragments = {}
+        self.pages = OrderedDict()
+        self.render_lock = threading.Lock()
+
+    @property
+    def last_modified(self):
+        """Waktu perubahan katalog untuk header Last-Modified (None jika tidak diketahui).
+
+        Hanya dari data di database: updated_at terbaru dan catalog_version.changed_at
+        (ikut dicatat saat film dihapus), jadi sama di setiap worker dan restart.
+        """
+        times = []
+        if self.updated_at:
+            times.append(datetime.strptime(self.updated_at, "%Y-%m-%d %H:%M").astimezone(timezone.utc))
+        if self.changed_at:
+            times.append(datetime.strptime(self.changed_at, "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc))
+        return max(times, default=None)
+
+
+class CatalogCache:
+    """Cache katalog film in-process (read-through).
+
+    Penulisan lewat add/update/delete_movie langsung meng-invalidate cache.
+    Perubahan dari proses lain terdeteksi lewat tabel catalog_version yang
+    dinaikkan trigger; versi itu dicek paling sering sekali per
+    CATALOG_CHECK_INTERVAL, sehingga request di antaranya tanpa query.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshots = {}  # path database -> (snapshot, waktu cek terakhir)
+
+    def peek(self):
+        """Snapshot yang masih dalam interval cek (tanpa query), atau None"""
+        cached = self._snapshots.get(app.config['DATABASE'])
+        if cached and time.monotonic() - cached[1] < app.config['CATALOG_CHECK_INTERVAL']:
+            return cached[0]
+        return None
+
+    def snapshot(self):
+        path = app.config['DATABASE']
+        now = time.monotonic()
+        cached = self._snapshots.get(path)
+        if cached and now - cached[1] < app.config['CATALOG_CHECK_INTERVAL']:
+            return cached[0]
+        with self._lock:
+            cached = self._snapshots.get(path)
+            conn = get_db_connection()
+            version, changed_at = conn.execute(
+                "SELECT version, changed_at FROM catalog_version WHERE id = 1").fetchone()
+            if cached and cached[0].version == version:
+                snap = cached[0]
+            else:
+                snap = CatalogSnapshot(version, conn.execute(
+                    """SELECT m.*, p.digest AS poster_digest, p.ext AS poster_ext, p.widths AS poster_widths
+                       FROM movies m
+                       LEFT JOIN poster_cache p ON p.source_url = m.poster AND p.status = 'ready'
+                       ORDER BY m.id DESC"""
+                ).fetchall(), changed_at)
+            self._snapshots[path] = (snap, now)
+            return snap
+
+    def invalidate(self):
+        with self._lock:
+            self._snapshots.pop(app.config['DATABASE'], None)
+
+
+catalog_cache = CatalogCache()
+
+
 def get_all_movies():
-    """Ambil semua film dari database"""
-    conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM movies ORDER BY id DESC")
-    movies_list = cur.fetchall()
-    conn.close()
-    return [dict(m) for m in movies_list]
+    """Ambil semua film (dari cache katalog)"""
+    return list(catalog_cache.snapshot().movies)
 
 
 def get_movie_by_id(movie_id):
-    """Ambil film berdasarkan ID"""
-    conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM movies WHERE id = ?", (movie_id,))
-    movie = cur.fetchone()
-    conn.close()
+    """Ambil film berdasarkan ID (dari cache katalog)"""
+    movie = catalog_cache.snapshot().by_id.get(movie_id)
     return dict(movie) if movie else None
 
 
@@ -292,12 +731,14 @@ def add_movie(title, genre, duration, poster, showtimes_str, regular_price, vip_
                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
             (title, genre, duration, poster, showtimes_str, regular_price, vip_price, now, now)
         )
-        conn.commit()
         movie_id = cur.lastrowid
-        conn.close()
+        screenings.materialize(conn, [(movie_id, showtimes_str)], app.config['SCREENING_DAYS_AHEAD'])
+        conn.commit()
+        catalog_cache.invalidate()
+        posters.schedule(poster)
         return get_movie_by_id(movie_id)
     except Exception as e:
-        conn.close()
+        conn.rollback()
         return None
 
 
@@ -312,11 +753,13 @@ def update_movie(movie_id, title, genre, duration, poster, showtimes_str, regula
                WHERE id=?""",
             (title, genre, duration, poster, showtimes_str, regular_price, vip_price, now, movie_id)
         )
+        screenings.materialize(conn, [(movie_id, showtimes_str)], app.config['SCREENING_DAYS_AHEAD'])
         conn.commit()
-        conn.close()
+        catalog_cache.invalidate()
+        posters.schedule(poster)
         return get_movie_by_id(movie_id)
     except Exception as e:
-        conn.close()
+        conn.rollback()
         return None
 
 
@@ -326,174 +769,82 @@ def delete_movie(movie_id):
     cur = conn.cursor()
     try:
         cur.execute("DELETE FROM movies WHERE id=?", (movie_id,))
+        screenings.cancel_upcoming(conn, movie_id)
         conn.commit()
-        conn.close()
+        catalog_cache.invalidate()
         return True
     except Exception as e:
-        conn.close()
+        conn.rollback()
         return False
 
 
+# Film default untuk database kosong (juga sumber fallback_movies())
+DEFAULT_MOVIES = (
+    ("Avengers: Doomsday", "Action / Superhero", 165,
+     "https://posterspy.com/wp-content/uploads/2024/10/Doomsday-by-VISCOM.jpg",
+     "10:00 AM, 01:00 PM, 04:00 PM, 07:00 PM, 10:00 PM", 50000, 75000),
+    ("Superman: Legacy", "Action / Superhero", 145,
+     "https://posterspy.com/wp-content/uploads/2023/11/20231130_142631_0-glazed-intensity-10-V1.jpg",
+     "10:00 AM, 01:00 PM, 04:00 PM, 07:00 PM, 10:00 PM", 50000, 75000),
+    ("Spider-Man: No Way Home", "Action / Sci-Fi", 135,
+     "https://cdn.marvel.com/content/2x/spider-mannowayhome_lob_crd_03.jpg",
+     "10:00 AM, 01:00 PM, 04:00 PM, 07:00 PM, 10:00 PM", 50000, 75000),
+    ("Batman: The Brave and The Bold", "Action / Crime", 150,
+     "https://i.pinimg.com/736x/c4/8b/ed/c48bedde3a9cb8b745a71369627a5005.jpg",
+     "10:00 AM, 01:00 PM, 04:00 PM, 07:00 PM, 10:00 PM", 50000, 75000),
+    ("Avatar 3", "Sci-Fi / Adventure", 170,
+     "https://m.media-amazon.com/images/M/MV5BZDYxY2I1OGMtN2Y0MS00ZmU1LTgyNDAtODA0MzAyYjI0N2Y2XkEyXkFqcGc@._V1_FMjpg_UX1000_.jpg",
+     "10:00 AM, 01:00 PM, 04:00 PM, 07:00 PM, 10:00 PM", 50000, 75000),
+    ("How to Train Your Dragon: Live-Action", "Adventure / Fantasy", 140,
+     "https://m.media-amazon.com/images/M/MV5BODA5Y2M0NjctNWQzMy00ODRhLWE0MzUtYmE1YTAzZjYyYmQyXkEyXkFqcGc@._V1_.jpg",
+     "10:00 AM, 01:00 PM, 04:00 PM, 07:00 PM, 10:00 PM", 50000, 75000),
+    ("Frozen 2", "Animation / Family", 120,
+     "https://myhotposters.com/cdn/shop/products/mL3767_grande.jpg?v=1748534166",
+     "10:00 AM, 01:00 PM, 04:00 PM, 07:00 PM, 10:00 PM", 50000, 75000),
+    ("Inside Out 2", "Animation / Family", 110,
+     "https://upload.wikimedia.org/wikipedia/id/thumb/9/9f/Inside_Out_2_Poster_Indonesian.webp/1000px-Inside_Out_2_Poster_Indonesian.webp.png",
+     "10:00 AM, 01:00 PM, 04:00 PM, 07:00 PM, 10:00 PM", 50000, 75000),
+    ("Mission Impossible: Reckoning Part 2", "Action / Thriller", 160,
+     "https://posterspy.com/wp-content/uploads/2023/06/M.I7v4-1.jpg",
+     "10:00 AM, 01:00 PM, 04:00 PM, 07:00 PM, 10:00 PM", 50000, 75000),
+    ("Mufasa: The Lion King", "Drama / Family", 130,
+     "https://www.laughingplace.com/uploads/ddimages/2024/12/06/7-new-posters-released-for-mufasa-the-lion-king-including-imax-dolby-4dx-and-other-special-formats.jpeg",
+     "10:00 AM, 01:00 PM, 04:00 PM, 07:00 PM, 10:00 PM", 50000, 75000),
+    ("Sonic the Hedgehog 3", "Action / Comedy", 120,
+     "https://i0.wp.com/mynintendonews.com/wp-content/uploads/2024/11/sonic_movie_3-poster.jpeg?resize=691%2C1024&ssl=1",
+     "10:00 AM, 01:00 PM, 04:00 PM, 07:00 PM, 10:00 PM", 50000, 75000),
+    ("Deadpool & Wolverine", "Action / Comedy", 130,
+     "https://cdn.marvel.com/content/2x/dp3_1sht_digital_srgb_ka_swords_v5_resized.jpg",
+     "10:00 AM, 01:00 PM, 04:00 PM, 07:00 PM, 10:00 PM", 50000, 75000),
+)
+
+
 def initialize_default_movies():
     """Seed database dengan film-film default jika database kosong"""
     db_movies = get_all_movies()
     if db_movies:
         return  # Database sudah ada movies
-    
-    default_movies = [
-        ("Avengers: Doomsday", "Action / Superhero", 165, 
-         "https://posterspy.com/wp-content/uploads/2024/10/Doomsday-by-VISCOM.jpg",
-         "10:00 AM, 01:00 PM, 04:00 PM, 07:00 PM, 10:00 PM", 50000, 75000),
-        ("Superman: Legacy", "Action / Superhero", 145,
-         "https://posterspy.com/wp-content/uploads/2023/11/20231130_142631_0-glazed-intensity-10-V1.jpg",
-         "10:00 AM, 01:00 PM, 04:00 PM, 07:00 PM, 10:00 PM", 50000, 75000),
-        ("Spider-Man: No Way Home", "Action / Sci-Fi", 135,
-         "https://cdn.marvel.com/content/2x/spider-mannowayhome_lob_crd_03.jpg",
-         "10:00 AM, 01:00 PM, 04:00 PM, 07:00 PM, 10:00 PM", 50000, 75000),
-        ("Batman: The Brave and The Bold", "Action / Crime", 150,
-         "https://i.pinimg.com/736x/c4/8b/ed/c48bedde3a9cb8b745a71369627a5005.jpg",
-         "10:00 AM, 01:00 PM, 04:00 PM, 07:00 PM, 10:00 PM", 50000, 75000),
-        ("Avatar 3", "Sci-Fi / Adventure", 170,
-         "https://m.media-amazon.com/images/M/MV5BZDYxY2I1OGMtN2Y0MS00ZmU1LTgyNDAtODA0MzAyYjI0N2Y2XkEyXkFqcGc@._V1_FMjpg_UX1000_.jpg",
-         "10:00 AM, 01:00 PM, 04:00 PM, 07:00 PM, 10:00 PM", 50000, 75000),
-        ("How to Train Your Dragon: Live-Action", "Adventure / Fantasy", 140,
-         "https://m.media-amazon.com/images/M/MV5BODA5Y2M0NjctNWQzMy00ODRhLWE0MzUtYmE1YTAzZjYyYmQyXkEyXkFqcGc@._V1_.jpg",
-         "10:00 AM, 01:00 PM, 04:00 PM, 07:00 PM, 10:00 PM", 50000, 75000),
-        ("Frozen 2", "Animation / Family", 120,
-         "https://myhotposters.com/cdn/shop/products/mL3767_grande.jpg?v=1748534166",
-         "10:00 AM, 01:00 PM, 04:00 PM, 07:00 PM, 10:00 PM", 50000, 75000),
-        ("Inside Out 2", "Animation / Family", 110,
-         "https://upload.wikimedia.org/wikipedia/id/thumb/9/9f/Inside_Out_2_Poster_Indonesian.webp/1000px-Inside_Out_2_Poster_Indonesian.webp.png",
-         "10:00 AM, 01:00 PM, 04:00 PM, 07:00 PM, 10:00 PM", 50000, 75000),
-        ("Mission Impossible: Reckoning Part 2", "Action / Thriller", 160,
-         "https://posterspy.com/wp-content/uploads/2023/06/M.I7v4-1.jpg",
-         "10:00 AM, 01:00 PM, 04:00 PM, 07:00 PM, 10:00 PM", 50000, 75000),
-        ("Mufasa: The Lion King", "Drama / Family", 130,
-         "https://www.laughingplace.com/uploads/ddimages/2024/12/06/7-new-posters-released-for-mufasa-the-lion-king-including-imax-dolby-4dx-and-other-special-formats.jpeg",
-         "10:00 AM, 01:00 PM, 04:00 PM, 07:00 PM, 10:00 PM", 50000, 75000),
-        ("Sonic the Hedgehog 3", "Action / Comedy", 120,
-         "https://i0.wp.com/mynintendonews.com/wp-content/uploads/2024/11/sonic_movie_3-poster.jpeg?resize=691%2C1024&ssl=1",
-         "10:00 AM, 01:00 PM, 04:00 PM, 07:00 PM, 10:00 PM", 50000, 75000),
-        ("Deadpool & Wolverine", "Action / Comedy", 130,
-         "https://cdn.marvel.com/content/2x/dp3_1sht_digital_srgb_ka_swords_v5_resized.jpg",
-         "10:00 AM, 01:00 PM, 04:00 PM, 07:00 PM, 10:00 PM", 50000, 75000),
-    ]
-    
-    for title, genre, duration, poster, showtimes, regular_price, vip_price in default_movies:
+
+    for title, genre, duration, poster, showtimes, regular_price, vip_price in DEFAULT_MOVIES:
         add_movie(title, genre, duration, poster, showtimes, regular_price, vip_price)
 
 
-# DATA FILM (STATIC)
-movies = [
-    {
-        "id": 1,
-        "title": "Avengers: Doomsday",
-        "genre": "Action / Superhero",
-        "duration": 165,
-        "seats": generate_seats(),
-        "poster": "https://posterspy.com/wp-content/uploads/2024/10/Doomsday-by-VISCOM.jpg",
-        "showtimes": ["10:00 AM", "01:00 PM", "04:00 PM", "07:00 PM", "10:00 PM"]
-    },
-    {
-        "id": 2,
-        "title": "Superman: Legacy",
-        "genre": "Action / Superhero",
-        "duration": 145,
-        "seats": generate_seats(),
-        "poster": "https://posterspy.com/wp-content/uploads/2023/11/20231130_142631_0-glazed-intensity-10-V1.jpg",
-        "showtimes": ["10:00 AM", "01:00 PM", "04:00 PM", "07:00 PM", "10:00 PM"]
-    },
-    {
-        "id": 3,
-        "title": "Spider-Man: No Way Home",
-        "genre": "Action / Sci-Fi",
-        "duration": 135,
-        "seats": generate_seats(),
-        "poster": "https://cdn.marvel.com/content/2x/spider-mannowayhome_lob_crd_03.jpg",
-        "showtimes": ["10:00 AM", "01:00 PM", "04:00 PM", "07:00 PM", "10:00 PM"]
-    },
-    {
-        "id": 4,
-        "title": "Batman: The Brave and The Bold",
-        "genre": "Action / Crime",
-        "duration": 150,
-        "seats": generate_seats(),
-        "poster": "https://i.pinimg.com/736x/c4/8b/ed/c48bedde3a9cb8b745a71369627a5005.jpg",
-        "showtimes": ["10:00 AM", "01:00 PM", "04:00 PM", "07:00 PM", "10:00 PM"]
-    },
-    {
-        "id": 5,
-        "title": "Avatar 3",
-        "genre": "Sci-Fi / Adventure",
-        "duration": 170,
-        "seats": generate_seats(),
-        "poster": "https://m.media-amazon.com/images/M/MV5BZDYxY2I1OGMtN2Y4MS00ZmU1LTgyNDAtODA0MzAyYjI0N2Y2XkEyXkFqcGc@._V1_FMjpg_UX1000_.jpg",
-        "showtimes": ["10:00 AM", "01:00 PM", "04:00 PM", "07:00 PM", "10:00 PM"]
-    },
-    {
-        "id": 6,
-        "title": "How to Train Your Dragon: Live-Action",
-        "genre": "Adventure / Fantasy",
-        "duration": 140,
-        "seats": generate_seats(),
-        "poster": "https://m.media-amazon.com/images/M/MV5BODA5Y2M0NjctNWQzMy00ODRhLWE0MzUtYmE1YTAzZjYyYmQyXkEyXkFqcGc@._V1_.jpg",
-        "showtimes": ["10:00 AM", "01:00 PM", "04:00 PM", "07:00 PM", "10:00 PM"]
-    },
-    {
-        "id": 7,
-        "title": "Frozen 2",
-        "genre": "Animation / Family",
-        "duration": 120,
-        "seats": generate_seats(),
-        "poster": "https://myhotposters.com/cdn/shop/products/mL3767_grande.jpg?v=1748534166",
-        "showtimes": ["10:00 AM", "01:00 PM", "04:00 PM", "07:00 PM", "10:00 PM"]
-    },
-    {
-        "id": 8,
-        "title": "Inside Out 2",
-        "genre": "Animation / Family",
-        "duration": 110,
-        "seats": generate_seats(),
-        "poster": "https://upload.wikimedia.org/wikipedia/id/thumb/9/9f/Inside_Out_2_Poster_Indonesian.webp/1000px-Inside_Out_2_Poster_Indonesian.webp.png",
-        "showtimes": ["10:00 AM", "01:00 PM", "04:00 PM", "07:00 PM", "10:00 PM"]
-    },
-    {
-        "id": 9,
-        "title": "Mission Impossible: Reckoning Part 2",
-        "genre": "Action / Thriller",
-        "duration": 160,
-        "seats": generate_seats(),
-        "poster": "https://posterspy.com/wp-content/uploads/2023/06/M.I7v4-1.jpg",
-        "showtimes": ["10:00 AM", "01:00 PM", "04:00 PM", "07:00 PM", "10:00 PM"]
-    },
-    {
-        "id": 10,
-        "title": "Mufasa: The Lion King",
-        "genre": "Drama / Family",
-        "duration": 130,
-        "seats": generate_seats(),
-        "poster": "https://www.laughingplace.com/uploads/ddimages/2024/12/06/7-new-posters-released-for-mufasa-the-lion-king-including-imax-dolby-4dx-and-other-special-formats.jpeg",
-        "showtimes": ["10:00 AM", "01:00 PM", "04:00 PM", "07:00 PM", "10:00 PM"]
-    },
-    {
-        "id": 11,
-        "title": "Sonic the Hedgehog 3",
-        "genre": "Action / Comedy",
-        "duration": 120,
-        "seats": generate_seats(),
-        "poster": "https://i0.wp.com/mynintendonews.com/wp-content/uploads/2024/11/sonic_movie_3-poster.jpeg?resize=691%2C1024&ssl=1",
-        "showtimes": ["10:00 AM", "01:00 PM", "04:00 PM", "07:00 PM", "10:00 PM"]
-    },
-    {
-        "id": 12,
-        "title": "Deadpool & Wolverine",
-        "genre": "Action / Comedy",
-        "duration": 130,
-        "seats": generate_seats(),
-        "poster": "https://cdn.marvel.com/content/2x/dp3_1sht_digital_srgb_ka_swords_v5_resized.jpg",
-        "showtimes": ["10:00 AM", "01:00 PM", "04:00 PM", "07:00 PM", "10:00 PM"]
-    }
-]
+# Fallback katalog saat database belum berisi film. Dibangun saat pertama
+# kali dibutuhkan (bukan saat import), jadi tidak menambah waktu startup worker.
+_fallback_movies = None
+
+
+def fallback_movies():
+    """Film default dalam format template (id 1..n), dibuat sekali lalu dipakai ulang"""
+    global _fallback_movies
+    if _fallback_movies is None:
+        _fallback_movies = [
+            {"id": n, "title": title, "genre": genre, "duration": duration,
+             "seats": generate_seats(), "poster": poster, "showtimes": [s.strip() for s in showtimes.split(",")]}
+            for n, (title, genre, duration, poster, showtimes, _, _) in enumerate(DEFAULT_MOVIES, 1)
+        ]
+    return _fallback_movies
+
 
 # Penyimpanan sementara order sebelum pembayaran
 orders = []
@@ -525,7 +876,7 @@ class Customer(User):
         price = ticket.calculate_price()
 
         # Ambil judul film untuk disimpan di order
-        movie_title = next((m['title'] for m in movies if m['id'] == movie_id), "")
+        movie_title = next((m['title'] for m in fallback_movies() if m['id'] == movie_id), "")
 
         order = {
             "id": len(orders) + 1,
@@ -582,15 +933,119 @@ def create_ticket(ticket_type, seat):
     return Ticket(seat, "Regular")
 
 
+# ===== HOME PAGE CACHE =====
+HOME_TEMPLATES = ('home.html', '_movie_cards.html')
+_home_template_stamp = None
+
+
+def home_template_stamp():
+    """Penanda versi template halaman utama (mtime file + build asset), bagian dari ETag"""
+    global _home_template_stamp
+    if _home_template_stamp is None or app.jinja_env.auto_reload:
+        _home_template_stamp = '-'.join(
+            [str(os.stat(os.path.join(app.root_path, app.template_folder, name)).st_mtime_ns)
+             for name in HOME_TEMPLATES] + [str(assets.manifest_stamp())]
+        )
+    return _home_template_stamp
+
+
+def home_user_key():
+    """Bagian halaman utama yang bergantung pada user: navbar (nama & role)"""
+    user = session.get('user')
+    if not user:
+        return 'anon'
+    return f"{user.get('id')}:{user.get('role')}:{user.get('name')}"
+
+
+def render_movie_cards(snap):
+    """Fragment kartu film, dirender sekali per versi katalog"""
+    cards = snap.fragments.get('movie_cards')
+    if cards is None:
+        # Jika database kosong, gunakan static data untuk demo
+        cards = Markup(render_template('_movie_cards.html', movies=snap.movies or fallback_movies()))
+        snap.fragments['movie_cards'] = cards
+    return cards
+
+
+def render_home_page(snap, page_key):
+    """HTML halaman utama dari cache LRU snapshot, render hanya saat miss"""
+    with snap.render_lock:
+        body = snap.pages.get(page_key)
+        if body is not None:
+            snap.pages.move_to_end(page_key)
+            return body
+    body = render_template('home.html', movie_cards=render_movie_cards(snap)).encode('utf-8')
+    with snap.render_lock:
+        snap.pages[page_key] = body
+        while len(snap.pages) > app.config['HOME_PAGE_CACHE_SIZE']:
+            snap.pages.popitem(last=False)
+    return body
+
+
+def is_not_modified(etag, last_modified):
+    """Conditional GET: If-None-Match diutamakan, If-Modified-Since hanya fallback"""
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if request.if_modified_since and last_modified is not None:
+        return last_modified <= request.if_modified_since
+    return False
+
+
 # Routes aplikasi
 @app.route('/')
 def home():
-    """Halaman utama dengan daftar film"""
-    db_movies = get_all_movies()
-    # Jika database kosong, gunakan static data untuk demo
-    if not db_movies:
-        db_movies = movies
-    return render_template('home.html', movies=db_movies)
+    """Halaman utama dengan daftar film.
+
+    ETag kuat dari versi katalog + status login + versi template, sehingga
+    304 bisa dijawab tanpa merender apa pun.
+    """
+    snap = catalog_cache.snapshot()
+    page_key = (home_user_key(), home_template_stamp())
+    etag = hashlib.sha1(
+        f"{app.config['DATABASE']}|{snap.version}|{page_key[0]}|{page_key[1]}".encode('utf-8')
+    ).hexdigest()[:24]
+    last_modified = snap.last_modified
+
+    if is_not_modified(etag, last_modified):
+        resp = app.response_class(status=304)
+    else:
+        resp = app.response_class(render_home_page(snap, page_key), mimetype='text/html')
+    resp.set_etag(etag)
+    resp.last_modified = last_modified
+    # Personal (navbar) -> jangan disimpan shared cache; browser wajib revalidasi
+    resp.headers['Cache-Control'] = 'private, no-cache'
+    resp.vary.add('Cookie')
+    return resp
+
+
+def book_movie(movie_data, movie_screenings):
+    """Data film untuk template book.html (dipakai juga oleh view async, asgi.py)"""
+    return {
+        'id': movie_data['id'],
+        'title': movie_data['title'],
+        'genre': movie_data['genre'],
+        'duration': movie_data['duration'],
+        'poster': movie_data['poster'],
+        'screenings': movie_screenings,
+        'regular_price': movie_data['regular_price'],
+        'vip_price': movie_data['vip_price'],
+        # Denah per studio dalam bentuk run-length, dibentangkan book.js
+        'seat_layouts': {s['hall']: s['layout'].encoded for s in movie_screenings} or
+                        {auditoriums.DEFAULT_HALL: auditoriums.default_layout().encoded},
+        'seat_types': auditoriums.SEAT_TYPES,
+    }
+
+
+def availability_response(movie_id, booked_seats_by_showtime):
+    """Response JSON ketersediaan kursi + ETag (conditional GET)"""
+    resp = jsonify({
+        'movie_id': movie_id,
+        'booked_seats_by_showtime': booked_seats_by_showtime
+    })
+    resp.vary.add('Cookie')
+    resp.add_etag()
+    resp.cache_control.no_cache = True
+    return resp.make_conditional(request)
 
 
 @app.route('/book/<int:movie_id>', methods=['GET', 'POST'])
@@ -603,17 +1058,7 @@ def book(movie_id):
         return "Film tidak ditemukan", 404
     
     # Konversi data film database ke format template
-    movie = {
-        'id': movie_data['id'],
-        'title': movie_data['title'],
-        'genre': movie_data['genre'],
-        'duration': movie_data['duration'],
-        'poster': movie_data['poster'],
-        'showtimes': [st.strip() for st in movie_data['showtimes'].split(',')] if movie_data['showtimes'] else [],
-        'regular_price': movie_data['regular_price'],
-        'vip_price': movie_data['vip_price'],
-        'seats': generate_seats()  # Generate daftar kursi yang tersedia
-    }
+    movie = book_movie(movie_data, get_movie_screenings(movie_id))
 
     if request.method == 'POST':
         # If user logged in, use their account info; otherwise use form inputs
@@ -628,40 +1073,35 @@ def book(movie_id):
             membership = 'guest'
 
         seats_input = request.form['seat'].strip()
-        ticket_type = request.form['ticket_type']
-        showtime = request.form.get('showtime', '')  # Get showtime from form
+        ticket_type = create_ticket(request.form['ticket_type'], None).ticket_type  # Regular / VIP
+        screening_id = request.form.get('screening_id', type=int)
+        # Hanya pemutaran film ini yang belum mulai yang bisa dipesan
+        screening = next((s for s in movie['screenings'] if s['id'] == screening_id), None)
 
         # Parse multiple seats (separated by comma and space)
-        seat_list = [s.strip() for s in seats_input.split(',') if s.strip()]
-
-        if not seat_list:
-            error = "Pilih minimal satu kursi!"
-            # Build booked_seats_by_showtime for error case
-            booked_seats_by_showtime = {}
-            for st in movie['showtimes']:
-                booked_seats_by_showtime[st] = {"Regular": [], "VIP": []}
-                for order in orders:
-                    if order['movie_id'] == movie_id and order['showtime'] == st:
-                        ticket_type = order.get('ticket_type', 'Regular')
-                        seats = [s.strip() for s in order['seat'].split(',')]
-                        for seat in seats:
-                            if seat not in booked_seats_by_showtime[st][ticket_type]:
-                                booked_seats_by_showtime[st][ticket_type].append(seat)
+        seat_list = split_seats(seats_input)
+
+        if not seat_list or screening is None:
+            error = "Pilih minimal satu kursi!" if screening is not None else "Pilih jadwal tayang yang tersedia!"
+            booked_seats_by_showtime = get_availability_by_screening([s['id'] for s in movie['screenings']], session.get('hold_token'))
+            return render_template("book.html", movie=movie, error=error, booked_seats_by_showtime=booked_seats_by_showtime)
+
+        # Kursi harus ada di denah studio dan sesuai tier tiket (zona VIP hanya tiket VIP)
+        invalid_seats = screening['layout'].invalid_seats(seat_list, ticket_type)
+        if invalid_seats:
+            error = f"Kursi {', '.join(invalid_seats)} tidak tersedia untuk tiket {ticket_type} di {screening['hall']}!"
+            booked_seats_by_showtime = get_availability_by_screening([s['id'] for s in movie['screenings']], session.get('hold_token'))
             return render_template("book.html", movie=movie, error=error, booked_seats_by_showtime=booked_seats_by_showtime)
 
-        # ====== VALIDASI SEAT SUDAH DIPESAN (menggunakan DB) ======
-        booked_seats = get_booked_seats_db(movie_id, showtime, ticket_type)
-        unavailable_seats = [seat for seat in seat_list if seat in booked_seats]
+        # ====== TAHAN KURSI (gagal jika sudah terjual / ditahan orang lain) ======
+        hold_token = session.get('hold_token')
+        if not hold_token:
+            hold_token = session['hold_token'] = uuid.uuid4().hex
+        unavailable_seats = hold_seats(screening_id, ticket_type, seat_list, hold_token)
 
         if unavailable_seats:
             error = f"Kursi {', '.join(unavailable_seats)} sudah dipesan!"
-            # Build booked_seats_by_showtime for error case using DB
-            booked_seats_by_showtime = {}
-            for st in movie['showtimes']:
-                booked_seats_by_showtime[st] = {"Regular": [], "VIP": []}
-                for ttype in ["Regular", "VIP"]:
-                    seats = get_booked_seats_db(movie_id, st, ttype)
-                    booked_seats_by_showtime[st][ttype] = seats
+            booked_seats_by_showtime = get_availability_by_screening([s['id'] for s in movie['screenings']], session.get('hold_token'))
             return render_template("book.html", movie=movie, error=error, booked_seats_by_showtime=booked_seats_by_showtime)
 
         # Create customer and book tickets for each seat
@@ -691,10 +1131,11 @@ def book(movie_id):
         order = {
             "id": len(orders) + 1,
             "movie_id": movie_id,
+            "screening_id": screening_id,
             "movie_title": movie_title,
             "seat": ", ".join(seat_list),  # Multiple seats
             "ticket_type": ticket_type,
-            "showtime": showtime,  # Add showtime
+            "showtime": screening['label'],  # Teks jadwal (tanggal, jam, studio)
             "ticket_price": ticket_price,  # Harga tiket tanpa admin
             "admin_fee": admin_fee_total,  # Biaya admin total
             "price": price,  # Total pembayaran (termasuk admin)
@@ -712,26 +1153,54 @@ def book(movie_id):
         # kirim seat dan price eksplisit supaya payment.html bisa menggunakan {{ seat }} dan {{ price }}
         return render_template('payment.html', order=order, movie=movie, seat=order['seat'], price=order['price'])
 
-    # GET request: collect booked seats for this movie, showtime, and ticket type
-    # Parse all booked seats (handle both single and multiple seats per order)
-    # Structure: { "10:00 AM": { "Regular": ["A1", "A2"], "VIP": ["B1"] }, ... }
-    booked_seats_by_showtime = {}
-    for showtime in movie['showtimes']:
-        booked_seats_by_showtime[showtime] = {"Regular": [], "VIP": []}
-        for order in orders:
-            if order['movie_id'] == movie_id and order['showtime'] == showtime:
-                # Split comma-separated seats and add each to set based on ticket type
-                ticket_type = order.get('ticket_type', 'Regular')
-                seats = [s.strip() for s in order['seat'].split(',')]
-                for seat in seats:
-                    if seat not in booked_seats_by_showtime[showtime][ticket_type]:
-                        booked_seats_by_showtime[showtime][ticket_type].append(seat)
-    
+    # GET request: kursi terjual untuk semua pemutaran & tipe tiket (satu query)
+    # Structure: { screening_id: { "Regular": ["A1", "A2"], "VIP": ["B1"] }, ... }
+    booked_seats_by_showtime = get_availability_by_screening([s['id'] for s in movie['screenings']], session.get('hold_token'))
+
     # Pass current user's membership to template (for client-side price preview)
     membership = session.get('user', {}).get('membership') if session.get('user') else 'guest'
     return render_template('book.html', movie=movie, booked_seats_by_showtime=booked_seats_by_showtime, membership=membership)
 
 
+@app.route('/api/movies/<int:movie_id>/availability')
+def movie_availability(movie_id):
+    """JSON kursi terjual per pemutaran, dengan ETag supaya peta kursi bisa di-refresh murah"""
+    movie_data = get_movie_by_id(movie_id)
+    if not movie_data:
+        return jsonify({'error': 'Film tidak ditemukan'}), 404
+    screening_ids = [s['id'] for s in get_movie_screenings(movie_id)]
+    return availability_response(movie_id, get_availability_by_screening(screening_ids, session.get('hold_token')))
+
+
+def seat_feed_response(events):
+    """Response text/event-stream (tanpa cache, tanpa buffering proxy)"""
+    resp = app.response_class(events, mimetype='text/event-stream')
+    resp.cache_control.no_cache = True
+    resp.headers['X-Accel-Buffering'] = 'no'
+    return resp
+
+
+def seat_feed_unavailable():
+    return jsonify({'error': 'Terlalu banyak koneksi live, peta kursi memakai refresh berkala'}), 503, {'Retry-After': '30'}
+
+
+@app.route('/api/movies/<int:movie_id>/screenings/<int:screening_id>/seats')
+def seat_feed(movie_id, screening_id):
+    """Server-Sent Events: kursi yang terisi/lepas di satu pemutaran, didorong
+    saat order/hold ditulis. Event pertama adalah snapshot (lihat seatfeed.py)"""
+    if not app.config['SEAT_FEED_ENABLED']:
+        return seat_feed_unavailable()
+    if not screenings.is_upcoming(get_db_connection(), movie_id, screening_id):
+        return jsonify({'error': 'Pemutaran tidak ditemukan'}), 404
+    feed = seatfeed.get_feed()
+    try:
+        sub = feed.subscribe(screening_id, session.get('hold_token'))
+    except seatfeed.FeedFull:
+        return seat_feed_unavailable()
+    return seat_feed_response(seatfeed.iter_events(
+        feed, sub, app.config['SEAT_FEED_HEARTBEAT'], app.config['SEAT_FEED_MAX_AGE']))
+
+
 # route fallback (tetap ada)
 @app.route('/book', methods=['GET', 'POST'])
 def book_no_id():
@@ -752,12 +1221,17 @@ def finish():
     pending_order['payment_method'] = payment_method
     
     # Sekarang simpan order ke database (pembayaran sudah dikonfirmasi)
-    oid = save_order_db(pending_order)
-    pending_order['id'] = oid
+    oid = save_order_db(pending_order, session.get('hold_token'))
 
     # Hapus dari session
     session.pop('pending_order', None)
 
+    if oid is None:
+        # Kursi keburu terjual ke pemesan lain sejak halaman booking dibuka
+        flash(f"Kursi {pending_order['seat']} sudah dipesan, silakan pilih kursi lain")
+        return redirect(url_for('book', movie_id=pending_order['movie_id']))
+    pending_order['id'] = oid
+
     movie_id = pending_order['movie_id']
     movie_data = get_movie_by_id(movie_id)
     
@@ -782,22 +1256,20 @@ def finish():
 @app.route('/admin')
 @admin_required
 def admin():
-    # read orders from DB
-    all_orders = get_all_orders_db()
-    db_movies = get_all_movies()
-    return render_template('admin.html', orders=all_orders, movies=db_movies)
+    # Angka utama dari rollup, tabel order dipaginasi keyset di server
+    before = request.args.get('before', type=int)
+    page_orders, next_cursor = get_orders_page_db(before)
+    return render_template('admin.html', orders=page_orders, summary=get_sales_summary(),
+                           today_screenings=get_screenings_on(datetime.now()),
+                           before=before, next_cursor=next_cursor)
 
 
 @app.route('/users')
 @admin_required
 def list_users():
-    conn = get_db_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT id, name, email, membership, role, created_at FROM users ORDER BY id DESC")
-    rows = cur.fetchall()
-    conn.close()
-    users = [dict(r) for r in rows]
-    return render_template('users.html', users=users)
+    before = request.args.get('before', type=int)
+    users, next_cursor = get_users_page_db(before)
+    return render_template('users.html', users=users, before=before, next_cursor=next_cursor)
 
 
 @app.route('/profile')
@@ -805,8 +1277,9 @@ def profile():
     if 'user' not in session:
         return redirect(url_for('login'))
     user = session['user']
-    orders = get_orders_by_user_email(user['email'])
-    return render_template('profile.html', user=user, orders=orders)
+    before = request.args.get('before', type=int)
+    orders, next_cursor = get_orders_page_db(before, email=user['email'])
+    return render_template('profile.html', user=user, orders=orders, before=before, next_cursor=next_cursor)
 
 
 @app.route('/admin/upgrade/<int:user_id>', methods=['POST'])
@@ -817,7 +1290,8 @@ def admin_upgrade(user_id):
     cur = conn.cursor()
     cur.execute("UPDATE users SET membership = 'vip' WHERE id = ?", (user_id,))
     conn.commit()
-    conn.close()
+    # Trigger menaikkan users.version; session user itu ikut segar di request berikutnya
+    identity_cache.invalidate(user_id)
     return redirect(url_for('list_users'))
 
 
@@ -855,6 +1329,12 @@ def add_movie_route():
         except ValueError:
             flash('Duration dan harga harus berupa angka')
             return render_template('movie_form.html', movie=None)
+
+        try:
+            screenings.parse_pattern(showtimes_str)
+        except ValueError as e:
+            flash(str(e))
+            return render_template('movie_form.html', movie=None)
         
         # Tambah ke database
         movie = add_movie(title, genre, duration, poster, showtimes_str, regular_price, vip_price)
@@ -898,6 +1378,12 @@ def edit_movie_route(movie_id):
         except ValueError:
             flash('Duration dan harga harus berupa angka')
             return render_template('movie_form.html', movie=movie)
+
+        try:
+            screenings.parse_pattern(showtimes_str)
+        except ValueError as e:
+            flash(str(e))
+            return render_template('movie_form.html', movie=movie)
         
         # Update database
         updated_movie = update_movie(movie_id, title, genre, duration, poster, showtimes_str, regular_price, vip_price)
@@ -956,9 +1442,9 @@ def register():
             flash('Gagal membuat user (email mungkin sudah terpakai)')
             return render_template('register.html')
 
-        # Auto-login setelah registrasi berhasil
-        role = user['role'] if user and 'role' in user.keys() else 'user'
-        session['user'] = { 'id': user['id'], 'name': user['name'], 'email': user['email'], 'membership': user['membership'], 'role': role }
+        # Auto-login setelah registrasi berhasil (ID session baru, cegah fixation)
+        sessions.regenerate()
+        session['user'] = user
         return redirect(url_for('home'))
 
     return render_template('register.html')
@@ -975,28 +1461,111 @@ def login():
             flash('Email tidak ditemukan')
             return render_template('login.html')
 
-        # Verifikasi password dengan hash
-        if not check_password_hash(user['password'], password):
+        # Verifikasi password dengan hash (di process pool); hash lama di-upgrade ke cost saat ini
+        ok, new_hash = passwords.verify_password(user['password'], password)
+        if not ok:
             flash('Password salah')
             return render_template('login.html')
+        if new_hash:
+            update_password_hash(user['id'], new_hash)
 
+        # ID session diganti saat login supaya ID lama tidak ikut terautentikasi
+        sessions.regenerate()
         # `user` is sqlite3.Row; read role safely
-        role = user['role'] if user and 'role' in user.keys() else 'user'
-        session['user'] = { 'id': user['id'], 'name': user['name'], 'email': user['email'], 'membership': user['membership'], 'role': role }
+        session['user'] = session_identity(user)
+        identity_cache.put(dict(session['user']))
         return redirect(url_for('home'))
 
     return render_template('login.html')
 
 
+@app.errorhandler(passwords.HashingOverloaded)
+def hashing_overloaded(e):
+    """Antrean hashing penuh: tolak cepat dengan 503 + Retry-After"""
+    flash(f'Server sedang sibuk, silakan coba lagi dalam {e.retry_after} detik')
+    template = 'register.html' if request.endpoint == 'register' else 'login.html'
+    return render_template(template), 503, {'Retry-After': str(e.retry_after)}
+
+
+@app.route('/admin/password-hashing')
+@admin_required
+def password_hashing_stats():
+    """Metrik hashing password (latensi, kedalaman antrean, penolakan)"""
+    return jsonify(passwords.hasher.stats())
+
+
+def metrics_response():
+    return app.response_class(metrics.exposition(), mimetype='text/plain; version=0.0.4')
+
+
+@app.route('/admin/metrics')
+def admin_metrics():
+    """Metrik format Prometheus: untuk admin yang login, atau scraper dengan METRICS_TOKEN"""
+    token = app.config['METRICS_TOKEN']
+    if token and hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return metrics_response()
+    return admin_required(metrics_response)()
+
+
 @app.route('/logout')
 def logout():
     session.pop('user', None)
+    sessions.regenerate()
     return redirect(url_for('home'))
 
 
+
+# ===== SERVER SETUP =====
+def configure_app(config=None):
+    """Terapkan `config` ke objek `app` modul ini lalu kembalikan objek itu.
+
+    Bukan application factory: route dan helper terikat ke `app` global, jadi
+    setiap panggilan mengubah objek yang sama (satu konfigurasi per proses).
+    Import modul ini hanya mendaftarkan route dan konfigurasi, tanpa I/O database.
+    """
+    if config:
+        app.config.update(config)
+    init_template_cache(app)
+    return app
+
+
+def prepare_app(flask_app, fetch_posters=True):
+    """Pekerjaan sekali per start/deploy: WAL, migrasi skema, seed film default.
+
+    Dengan fetch_posters=False poster film seed tidak dijadwalkan di proses ini
+    (master serve.py: thread unduhan tidak boleh ikut ter-fork ke worker).
+    """
+    with flask_app.app_context():
+        # Initialize database (users table)
+        init_db()
+        # Seed default movies if database is empty
+        poster_cache = flask_app.config['POSTER_CACHE']
+        flask_app.config['POSTER_CACHE'] = poster_cache and fetch_posters
+        try:
+            initialize_default_movies()
+        finally:
+            flask_app.config['POSTER_CACHE'] = poster_cache
+        # Jadwal hari ini dibentuk di sini, bukan oleh request pertama tiap worker
+        screenings.keeper.ensure(get_db_connection(), flask_app.config['DATABASE'],
+                                 flask_app.config['SCREENING_DAYS_AHEAD'])
+
+
+def warm_app(flask_app):
+    """Muat lebih dulu yang biasanya dibayar request pertama: semua template
+    terkompilasi, snapshot katalog dan halaman utama untuk pengunjung anonim"""
+    if flask_app.jinja_env.bytecode_cache is None:
+        init_template_cache(flask_app)
+    for name in flask_app.jinja_env.list_templates(filter_func=lambda n: n.endswith('.html')):
+        flask_app.jinja_env.get_template(name)
+    with flask_app.test_request_context('/'):
+        render_home_page(catalog_cache.snapshot(), ('anon', home_template_stamp()))
+
+
+# Development server (single process, debug). Produksi multi-proses: python serve.py
 if __name__ == '__main__':
-    # Initialize database (users table)
-    init_db()
-    # Seed default movies if database is empty
-    initialize_default_movies()
+    init_template_cache(app)
+    prepare_app(app)
+    with app.app_context():
+        # Ambil poster yang belum punya salinan lokal (background)
+        posters.schedule_missing()
     app.run(debug=True)
@@ -0,0 +1,370 @@
+# Mode async (opsional): aplikasi ASGI di atas app Flask yang sama.
+#
+# Route baca yang paling sering dibuka (home, GET book, profile, availability)
+# dilayani coroutine di event loop; semua akses database lewat aiodb.AsyncPool
+# (satu thread per koneksi), jadi ratusan koneksi klien yang menunggu tidak
+# masing-masing memegang thread. Route lain (POST, admin, static, ...) tetap
+# memakai view WSGI yang sama, dijalankan di thread pool terbatas.
+#
+# Stream SSE feed kursi (seatfeed.py) juga dilayani di sini: setiap koneksi
+# hanya coroutine yang menunggu event, tanpa thread, dan tidak dihitung dalam
+# ASYNC_MAX_INFLIGHT (body dialirkan setelah slot admission dilepas).
+#
+# Butuh server ASGI (dependency opsional, tidak ikut `pip install flask`):
+#     pip install uvicorn                   # atau hypercorn
+#     python asgi.py --port 8000            # prepare_app + uvicorn
+#     uvicorn asgi:application --port 8000
+import argparse
+import asyncio
+import io
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import jsonify, redirect, render_template, request, request_started, session, url_for
+from werkzeug.exceptions import HTTPException
+
+import aiodb
+import app as cinema
+import seatfeed
+import sessions
+
+ASYNC_METHODS = ('GET', 'HEAD')
+
+# endpoint Flask -> coroutine pengganti (dipanggil dengan pool + view_args)
+async_views = {}
+
+
+def async_view(endpoint):
+    def register(fn):
+        async_views[endpoint] = fn
+        return fn
+    return register
+
+
+async def _movie(adb, movie_id):
+    """Film dari snapshot katalog; snapshot yang perlu dicek ulang diambil di thread aiodb"""
+    snap = cinema.catalog_cache.peek() or await adb.call(cinema.catalog_cache.snapshot)
+    movie = snap.by_id.get(movie_id)
+    return dict(movie) if movie else None
+
+
+def _screenings_with_availability(movie_id, hold_token):
+    movie_screenings = cinema.get_movie_screenings(movie_id)
+    booked = cinema.get_availability_by_screening([s['id'] for s in movie_screenings], hold_token)
+    return movie_screenings, booked
+
+
+@async_view('home')
+async def home(adb):
+    # Biasanya hanya kerja CPU (halaman dari cache LRU), tetapi cek versi katalog
+    # bisa memakai koneksi database, jadi tidak dijalankan di event loop
+    return await adb.call(cinema.home)
+
+
+@async_view('book')
+async def book(adb, movie_id):
+    movie_data = await _movie(adb, movie_id)
+    if not movie_data:
+        return "Film tidak ditemukan", 404
+    movie_screenings, booked_seats_by_showtime = await adb.call(
+        _screenings_with_availability, movie_id, session.get('hold_token'))
+    membership = session.get('user', {}).get('membership') if session.get('user') else 'guest'
+    return render_template('book.html', movie=cinema.book_movie(movie_data, movie_screenings),
+                           booked_seats_by_showtime=booked_seats_by_showtime, membership=membership)
+
+
+@async_view('profile')
+async def profile(adb):
+    if 'user' not in session:
+        return redirect(url_for('login'))
+    user = session['user']
+    before = request.args.get('before', type=int)
+    orders, next_cursor = await adb.call(cinema.get_orders_page_db, before, email=user['email'])
+    return render_template('profile.html', user=user, orders=orders, before=before, next_cursor=next_cursor)
+
+
+@async_view('movie_availability')
+async def movie_availability(adb, movie_id):
+    if not await _movie(adb, movie_id):
+        return jsonify({'error': 'Film tidak ditemukan'}), 404
+    _, booked_seats_by_showtime = await adb.call(
+        _screenings_with_availability, movie_id, session.get('hold_token'))
+    return cinema.availability_response(movie_id, booked_seats_by_showtime)
+
+
+def _subscribe(feed, movie_id, screening_id, hold_token, loop, event):
+    if not cinema.screenings.is_upcoming(cinema.get_db_connection(), movie_id, screening_id):
+        return None
+    return feed.subscribe(screening_id, hold_token, loop, event)
+
+
+async def _seat_events(feed, sub, heartbeat, max_age):
+    """Padanan seatfeed.iter_events untuk event loop"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_age
+    try:
+        while True:
+            chunk = feed.take(sub)
+            if chunk:
+                yield chunk
+            remaining = deadline - loop.time()
+            if sub.closed or remaining <= 0:
+                return
+            try:
+                await asyncio.wait_for(sub.event.wait(), min(heartbeat, remaining))
+            except asyncio.TimeoutError:
+                yield seatfeed.HEARTBEAT
+            sub.event.clear()
+    finally:
+        feed.unsubscribe(sub)
+
+
+@async_view('seat_feed')
+async def seat_feed(adb, movie_id, screening_id):
+    config = cinema.app.config
+    if not config['SEAT_FEED_ENABLED']:
+        return cinema.seat_feed_unavailable()
+    feed = seatfeed.get_feed()
+    try:
+        sub = await adb.call(_subscribe, feed, movie_id, screening_id, session.get('hold_token'),
+                             asyncio.get_running_loop(), asyncio.Event())
+    except seatfeed.FeedFull:
+        return cinema.seat_feed_unavailable()
+    if sub is None:
+        return jsonify({'error': 'Pemutaran tidak ditemukan'}), 404
+    return cinema.seat_feed_response(_seat_events(feed, sub, config['SEAT_FEED_HEARTBEAT'], config['SEAT_FEED_MAX_AGE']))
+
+
+def build_environ(scope, body):
+    """Environ WSGI dari scope HTTP ASGI (untuk Request Flask dan fallback WSGI)"""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'REMOTE_PORT': str(client[1]),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        # Body sudah dibaca penuh: panjangnya diketahui walau klien memakai
+        # chunked transfer-encoding (tanpa header content-length)
+        'wsgi.input_terminated': True,
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope.get('headers', ()):
+        name, value = name.decode('latin-1'), value.decode('latin-1')
+        if name == 'content-type':
+            environ['CONTENT_TYPE'] = value
+        elif name != 'content-length':  # CONTENT_LENGTH diisi dari body di atas
+            key = 'HTTP_' + name.upper().replace('-', '_')
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+class AsyncCinema:
+    """Aplikasi ASGI: view async untuk endpoint di `async_views`, sisanya WSGI di thread pool"""
+    def __init__(self, app):
+        self.app = app
+        app.config.setdefault('ASYNC_DB_POOL_SIZE', 8)
+        app.config.setdefault('ASYNC_WSGI_THREADS', 16)
+        app.config.setdefault('ASYNC_MAX_INFLIGHT', 16)
+        self.db = None
+        self._wsgi_executor = None
+        self._inflight = None
+
+    def _start(self):
+        if self.db is None:
+            cinema.init_template_cache(self.app)
+            self.db = aiodb.AsyncPool(self.app.config['DATABASE'], self.app.config['ASYNC_DB_POOL_SIZE'])
+            self._wsgi_executor = ThreadPoolExecutor(self.app.config['ASYNC_WSGI_THREADS'],
+                                                     thread_name_prefix='asgi-wsgi')
+            # Admission control: request di atas batas ini menunggu giliran (FIFO)
+            # alih-alih berbagi thread database dengan ratusan request lain
+            self._inflight = asyncio.Semaphore(self.app.config['ASYNC_MAX_INFLIGHT'])
+
+    def _stop(self):
+        seatfeed.close_all()
+        if self.db is not None:
+            self.db.close_all()
+            self._wsgi_executor.shutdown(wait=False)
+            self.db = self._wsgi_executor = None
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            while True:
+                message = await receive()
+                if message['type'] == 'lifespan.startup':
+                    self._start()
+                    await send({'type': 'lifespan.startup.complete'})
+                elif message['type'] == 'lifespan.shutdown':
+                    self._stop()
+                    await send({'type': 'lifespan.shutdown.complete'})
+                    return
+        if scope['type'] != 'http':
+            return
+        self._start()
+
+        body, more_body = [], True
+        while more_body:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return
+            body.append(message.get('body', b''))
+            more_body = message.get('more_body', False)
+        environ = build_environ(scope, b''.join(body))
+
+        view = None
+        if scope['method'] in ASYNC_METHODS:
+            try:
+                rule, _ = self.app.url_map.bind_to_environ(environ).match(
+                    return_rule=True, method=scope['method'])
+                view = async_views.get(rule.endpoint)
+            except HTTPException:
+                view = None
+        async with self._inflight:
+            if view is None:
+                await self._dispatch_wsgi(environ, send)
+                return
+            response = await self._dispatch_async(view, environ)
+        if hasattr(response.response, '__aiter__'):
+            await self._send_stream(response, environ, send, receive)
+            return
+        await self._send_response(response, environ, send)
+
+    async def _dispatch_async(self, view, environ):
+        """Padanan Flask.wsgi_app + full_dispatch_request lewat API publik Flask:
+        urutan signal, hook, session dan error handling sama, tetapi setiap langkah
+        yang bisa menyentuh database berjalan di thread aiodb dan view di-await
+        di event loop"""
+        app = self.app
+        ctx = app.request_context(environ)
+        if isinstance(app.session_interface, sessions.ServerSideSessionInterface):
+            # Session server-side dibaca di thread aiodb; push() memakai hasilnya
+            environ[sessions.PRELOADED_KEY] = await self.db.call(
+                app.session_interface.open_session, app, ctx.request)
+        error = None
+        try:
+            try:
+                ctx.push()
+                try:
+                    rv = await self.db.call(self._preprocess)
+                    if rv is None:
+                        rv = await view(self.db, **request.view_args)
+                except Exception as e:
+                    rv = await self.db.call(app.handle_user_exception, e)
+                return await self.db.call(app.finalize_request, rv)
+            except Exception as e:
+                error = e
+                return await self.db.call(app.handle_exception, e)
+        finally:
+            if error is not None and app.should_ignore_error(error):
+                error = None
+            ctx.pop(error)
+
+    def _preprocess(self):
+        """Awal full_dispatch_request: signal request_started lalu before_request"""
+        request_started.send(self.app, _async_wrapper=self.app.ensure_sync)
+        return self.app.preprocess_request()
+
+    async def _send_response(self, response, environ, send):
+        app_iter, status, headers = response.get_wsgi_response(environ)
+        try:
+            body = b''.join(app_iter)
+        finally:
+            response.close()
+        await send({'type': 'http.response.start', 'status': int(status.split(' ', 1)[0]),
+                    'headers': [(k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in headers]})
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def _send_stream(self, response, environ, send, receive):
+        """Body async generator (SSE): dialirkan sampai habis atau klien putus"""
+        headers = response.get_wsgi_headers(environ)
+        await send({'type': 'http.response.start', 'status': response.status_code,
+                    'headers': [(k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in headers.to_wsgi_list()]})
+        chunks = response.response
+        disconnect = asyncio.ensure_future(receive())
+        try:
+            while True:
+                step = asyncio.ensure_future(chunks.__anext__())
+                await asyncio.wait((step, disconnect), return_when=asyncio.FIRST_COMPLETED)
+                if not step.done():
+                    # Klien putus saat generator menunggu event
+                    step.cancel()
+                    await asyncio.gather(step, return_exceptions=True)
+                    return
+                try:
+                    chunk = step.result()
+                except StopAsyncIteration:
+                    await send({'type': 'http.response.body', 'body': b''})
+                    return
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        finally:
+            disconnect.cancel()
+            await chunks.aclose()
+
+    async def _dispatch_wsgi(self, environ, send):
+        """View sinkron di thread pool; body dialirkan per chunk"""
+        loop = asyncio.get_running_loop()
+        started = {}
+
+        def start_response(status, headers, exc_info=None):
+            started['status'], started['headers'] = status, headers
+
+        def run():
+            result = self.app(environ, start_response)
+            return result, iter(result)
+
+        result, chunks = await loop.run_in_executor(self._wsgi_executor, run)
+        try:
+            chunk = await loop.run_in_executor(self._wsgi_executor, next, chunks, None)
+            await send({'type': 'http.response.start', 'status': int(started['status'].split(' ', 1)[0]),
+                        'headers': [(k.lower().encode('latin-1'), v.encode('latin-1'))
+                                    for k, v in started['headers']]})
+            if chunk is None:
+                await send({'type': 'http.response.body', 'body': b''})
+            while chunk is not None:
+                following = await loop.run_in_executor(self._wsgi_executor, next, chunks, None)
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': following is not None})
+                chunk = following
+        finally:
+            if hasattr(result, 'close'):
+                await loop.run_in_executor(self._wsgi_executor, result.close)
+
+
+application = AsyncCinema(cinema.app)
+
+
+def prepare():
+    """Inisialisasi database + seed seperti `python app.py`"""
+    cinema.prepare_app(cinema.app)
+    with cinema.app.app_context():
+        cinema.posters.schedule_missing()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Jalankan AbsoluteCinematic dalam mode async (ASGI)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+
+    try:
+        import uvicorn
+    except ImportError:
+        sys.exit('Mode async butuh server ASGI: pip install uvicorn '
+                 '(atau jalankan asgi:application dengan hypercorn)')
+    prepare()
+    uvicorn.run(application, host=args.host, port=args.port, lifespan='on')
+
+
+if __name__ == '__main__':
+    main()
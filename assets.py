@@ -0,0 +1,75 @@
+# Asset statis hasil build (scripts/build_assets.py): CSS/JS yang sudah
+# diminify, diberi hash isi di nama file, dan dikompres dulu (gzip/brotli).
+# Template memakai asset_url('css/book.css'); tanpa build, file sumber di
+# static/ dipakai langsung sehingga mode development tetap jalan.
+import json
+import mimetypes
+import os
+
+from flask import current_app, request, send_from_directory, url_for
+
+MANIFEST_NAME = 'manifest.json'
+# Nama file memuat hash isi, jadi boleh di-cache selamanya oleh browser
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+# Urutan preferensi encoding yang sudah dikompres saat build
+PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))
+
+_manifest = {'stamp': None, 'files': {}}
+
+
+def load_manifest():
+    """Isi manifest build ({'css/book.css': 'css/book.1a2b3c4d.css', ...})"""
+    path = os.path.join(current_app.config['ASSET_DIR'], MANIFEST_NAME)
+    try:
+        stamp = os.stat(path).st_mtime_ns
+    except OSError:
+        stamp = 0
+    if stamp != _manifest['stamp']:
+        files = {}
+        if stamp:
+            with open(path, encoding='utf-8') as f:
+                files = json.load(f)
+        _manifest.update(stamp=stamp, files=files)
+    return _manifest['files']
+
+
+def manifest_stamp():
+    """Penanda versi build, dipakai sebagai bagian ETag halaman yang di-cache"""
+    if _manifest['stamp'] is None or current_app.jinja_env.auto_reload:
+        load_manifest()
+    return _manifest['stamp']
+
+
+def asset_url(name):
+    """URL asset hasil build jika ada, jika tidak file sumber di static/"""
+    if _manifest['stamp'] is None or current_app.jinja_env.auto_reload:
+        load_manifest()
+    built = _manifest['files'].get(name)
+    if built is None:
+        return url_for('static', filename=name)
+    return url_for('asset_file', filename=built)
+
+
+def serve_asset(filename):
+    """File hasil build: varian .br/.gz sesuai Accept-Encoding, cache immutable"""
+    root = current_app.config['ASSET_DIR']
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    encoding, suffix = None, ''
+    for enc, ext in PRECOMPRESSED:
+        if request.accept_encodings[enc] and os.path.isfile(os.path.join(root, filename + ext)):
+            encoding, suffix = enc, ext
+            break
+    resp = send_from_directory(root, filename + suffix, mimetype=mimetype, max_age=IMMUTABLE_MAX_AGE)
+    if encoding:
+        resp.headers['Content-Encoding'] = encoding
+    resp.vary.add('Accept-Encoding')
+    resp.cache_control.public = True
+    resp.cache_control.immutable = True
+    return resp
+
+
+def init_app(app):
+    """Daftarkan asset hasil build ke aplikasi Flask"""
+    app.config.setdefault('ASSET_DIR', os.path.join(app.static_folder, 'dist'))
+    app.add_url_rule('/assets/<path:filename>', 'asset_file', serve_asset)
+    app.add_template_global(asset_url)
@@ -0,0 +1,194 @@
+# Studio (auditorium) dengan denah kursi sendiri. Denah ditulis sebagai teks,
+# satu baris teks per baris kursi:
+#
+#     RRRR_RRRRRRRRRRRR_RRRR      R/V/W = kursi (tipe, lihat SEAT_TYPES)
+#     RRRR_RRRRRRRRRRRR_RRRR      _     = lorong (kolom kosong)
+#                                 .     = celah tanpa kursi (tiang, tangga)
+#     VVVV_VVVVVVVVVVVV_VVVV      baris kosong = lorong melintang
+#
+# Label kursi = huruf baris (A, B, ..., Z, AA, ...) + nomor urut kursi di baris
+# itu, lorong dan celah tidak dihitung; denah 14 x 20 tanpa celah memberi label
+# A1..N20 yang sama dengan generate_seats(). Tipe kursi terikat ke tier harga
+# (ticket_type Regular/VIP -> movies.regular_price/vip_price), jadi kursi VIP
+# hanya bisa dipesan dengan tiket VIP.
+#
+# Denah diproses sekali per versi menjadi Layout (immutable) dan dikirim ke
+# browser dalam bentuk run-length (Layout.encoded) yang dibentangkan book.js,
+# bukan ratusan elemen kursi yang dirender server.
+import re
+import threading
+from types import MappingProxyType
+
+from screenings import DEFAULT_HALL
+
+# Kode sel -> (nama tipe kursi, tier harga / ticket_type)
+SEAT_TYPES = {
+    'R': ('Regular', 'Regular'),
+    'V': ('VIP', 'VIP'),
+    'W': ('Kursi roda', 'Regular'),
+}
+AISLE = '_'
+GAP = '.'
+MAX_ROWS = 52
+MAX_COLUMNS = 60
+
+# Denah studio tanpa baris di tabel auditoriums (sama dengan seed migrasi 0009)
+DEFAULT_LAYOUT = '\n'.join(['RRRR_RRRRRRRRRRRR_RRRR'] * 11 + [''] + ['VVVV_VVVVVVVVVVVV_VVVV'] * 3)
+
+_RUN = re.compile(r'(.)\1*')
+
+
+def row_label(index):
+    """0 -> A, 25 -> Z, 26 -> AA (seperti kolom spreadsheet)"""
+    label = ''
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        label = chr(65 + rem) + label
+    return label
+
+
+def _encode_row(cells):
+    """'RRRR_RR' -> '4R_2R' (jumlah 1 tidak ditulis)"""
+    return ''.join(f"{len(m.group(0)) if len(m.group(0)) > 1 else ''}{m.group(1)}" for m in _RUN.finditer(cells))
+
+
+def encode(rows):
+    """Run-length seluruh denah: baris dipisah '/', baris identik berurutan
+    ditulis sekali dengan akhiran '*n'; baris kosong = lorong melintang.
+
+    Contoh denah default: '4R_12R_4R*11//4V_12V_4V*3'
+    """
+    parts = []
+    for cells in rows:
+        encoded = _encode_row(cells)
+        if parts and parts[-1][0] == encoded:
+            parts[-1][1] += 1
+        else:
+            parts.append([encoded, 1])
+    return '/'.join(row if n == 1 else f"{row}*{n}" for row, n in parts)
+
+
+class Layout:
+    """Denah satu studio yang sudah diproses (read-only, dipakai bersama antar request)"""
+    __slots__ = ('name', 'version', 'rows', 'seats', 'capacity', 'capacity_by_tier', 'width', 'encoded')
+
+    def __init__(self, name, version, text):
+        rows = parse(text)
+        seats = {}
+        seat_row = 0
+        for cells in rows:
+            if not any(code in SEAT_TYPES for code in cells):
+                continue  # lorong melintang tidak memakai huruf baris
+            number = 0
+            letter = row_label(seat_row)
+            for code in cells:
+                if code in SEAT_TYPES:
+                    number += 1
+                    seats[f"{letter}{number}"] = SEAT_TYPES[code][1]
+            seat_row += 1
+        by_tier = {}
+        for tier in seats.values():
+            by_tier[tier] = by_tier.get(tier, 0) + 1
+        self.name = name
+        self.version = version
+        self.rows = tuple(rows)
+        self.seats = MappingProxyType(seats)  # label -> tier, urut baris lalu nomor
+        self.capacity = len(seats)
+        self.capacity_by_tier = MappingProxyType(by_tier)
+        self.width = max(len(cells) for cells in rows)
+        self.encoded = encode(rows)
+
+    def tier_of(self, seat):
+        """Tier harga kursi (Regular/VIP), None jika kursi tidak ada di denah"""
+        return self.seats.get(seat)
+
+    def invalid_seats(self, seats, ticket_type):
+        """Kursi dari `seats` yang tidak ada di denah atau bukan tier `ticket_type`"""
+        return [seat for seat in seats if self.seats.get(seat) != ticket_type]
+
+
+def parse(text):
+    """Teks denah -> list baris sel. Raise ValueError jika denah tidak valid.
+
+    Baris kosong di awal/akhir dibuang; spasi di akhir baris diabaikan.
+    """
+    lines = [line.rstrip() for line in (text or '').replace('\r\n', '\n').split('\n')]
+    while lines and not lines[0]:
+        lines.pop(0)
+    while lines and not lines[-1]:
+        lines.pop()
+    allowed = set(SEAT_TYPES) | {AISLE, GAP}
+    seat_rows = 0
+    for number, line in enumerate(lines, 1):
+        unknown = sorted(set(line) - allowed)
+        if unknown:
+            raise ValueError(f"Baris {number}: kode kursi tidak dikenal {''.join(unknown)!r}")
+        if len(line) > MAX_COLUMNS:
+            raise ValueError(f"Baris {number}: lebih dari {MAX_COLUMNS} kolom")
+        if line:
+            seat_rows += 1
+    if not any(code in SEAT_TYPES for line in lines for code in line):
+        raise ValueError("Denah tidak berisi kursi")
+    if seat_rows > MAX_ROWS:
+        raise ValueError(f"Denah lebih dari {MAX_ROWS} baris kursi")
+    return lines
+
+
+class LayoutCache:
+    """Layout per (file database, studio), dimuat ulang hanya jika versinya berubah.
+
+    Versi datang dari query pemutaran (LEFT JOIN auditoriums, lihat
+    screenings.upcoming), jadi request biasa tidak menambah query; denah hanya
+    dibaca dan diproses saat pertama kali atau setelah diubah (trigger di
+    migrasi 0009 menaikkan versi).
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._layouts = {}  # (path database, nama studio) -> Layout
+        self._default = None
+
+    def default(self):
+        if self._default is None:
+            self._default = Layout(DEFAULT_HALL, 0, DEFAULT_LAYOUT)
+        return self._default
+
+    def get(self, conn, path, name, version):
+        """Layout studio `name`; versi None = studio tanpa denah (pakai default)"""
+        if version is None:
+            return self.default()
+        key = (path, name)
+        layout = self._layouts.get(key)
+        if layout is not None and layout.version == version:
+            return layout
+        row = conn.execute("SELECT layout, version FROM auditoriums WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return self.default()
+        layout = Layout(name, row['version'], row['layout'])
+        with self._lock:
+            self._layouts[key] = layout
+        return layout
+
+
+cache = LayoutCache()
+default_layout = cache.default
+
+
+def save(conn, name, text):
+    """Tambah/ubah denah studio (di dalam transaksi milik pemanggil).
+
+    Pemutaran mendatang di studio itu ikut memakai kapasitas baru. Kembalikan
+    Layout hasil parse; raise ValueError jika denah tidak valid.
+    """
+    layout = Layout(name, 0, text)
+    conn.execute(
+        """INSERT INTO auditoriums (name, layout, capacity) VALUES (?, ?, ?)
+           ON CONFLICT (name) DO UPDATE SET layout = excluded.layout, capacity = excluded.capacity""",
+        (name, '\n'.join(layout.rows), layout.capacity)
+    )
+    conn.execute(
+        "UPDATE screenings SET capacity = ? WHERE hall = ? AND starts_at > strftime('%Y-%m-%d %H:%M', 'now', 'localtime')",
+        (layout.capacity, name)
+    )
+    return layout
+
@@ -0,0 +1,229 @@
+# Lapisan koneksi database SQLite: satu koneksi per request (via flask.g)
+# yang dipinjam dari pool terbatas, plus pragma tuning saat startup.
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from flask import current_app, g, has_app_context
+
+# Konfigurasi database default
+DB_PATH = os.path.join(os.path.dirname(__file__), 'database.db')
+
+# Pragma per koneksi (tidak persisten di file database)
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",     # aman untuk WAL, fsync hanya saat checkpoint
+    "PRAGMA cache_size = -20000",      # page cache ~20 MB per koneksi
+    "PRAGMA mmap_size = 268435456",    # 256 MB memory-mapped I/O
+    "PRAGMA temp_store = MEMORY",
+)
+
+
+class PoolTimeout(sqlite3.OperationalError):
+    """Semua koneksi di pool sedang dipakai lebih lama dari timeout"""
+
+
+class ConnectionPool:
+    """Pool koneksi SQLite berukuran tetap untuk worker thread.
+
+    Koneksi dibuat lazily sampai ``max_size``; thread berikutnya menunggu
+    sampai ada koneksi yang dikembalikan (maksimal ``timeout`` detik).
+    """
+
+    def __init__(self, path, max_size=8, timeout=10.0):
+        self.path = path
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+        self._all = []
+
+    def _connect(self):
+        conn = connect(self.path, check_same_thread=False)
+        with self._lock:
+            self._all.append(conn)
+        return conn
+
+    def acquire(self):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolTimeout(f"Tidak ada koneksi database tersedia dalam {self.timeout} detik")
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            return self._connect()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, conn):
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            # Koneksi rusak: buang, slot tetap dikembalikan
+            self._discard(conn)
+        else:
+            self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    def _discard(self, conn):
+        with self._lock:
+            if conn in self._all:
+                self._all.remove(conn)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def close_all(self):
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+# Hook instrumentasi: dipanggil dengan koneksi setiap kali request mendapat
+# koneksi (checkout) dan saat koneksi itu dikembalikan (release)
+checkout_hooks = []
+release_hooks = []
+
+# Subclass sqlite3.Connection untuk semua koneksi baru (None = bawaan);
+# diisi querylog.init_app saat mode diagnostik aktif
+connection_factory = None
+
+# Koneksi milik thread: thread executor aiodb.AsyncConnection memasang
+# koneksinya sendiri di sini supaya helper yang memanggil get_db_connection()
+# berjalan apa adanya di thread itu (lihat aiodb.py)
+_thread = threading.local()
+
+
+def bind_thread(conn):
+    """Pakai `conn` untuk semua get_db_connection() di thread saat ini"""
+    _thread.conn = conn
+
+
+def connect(path=DB_PATH, tuned=True, **kwargs):
+    """Buka koneksi baru (row_factory sqlite3.Row, pragma tuning opsional)"""
+    if connection_factory is not None:
+        kwargs.setdefault('factory', connection_factory)
+    conn = sqlite3.connect(path, timeout=kwargs.pop('timeout', 10.0), **kwargs)
+    conn.row_factory = sqlite3.Row  # Kembalikan hasil query sebagai dictionary
+    if tuned:
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+    return conn
+
+
+def get_pool(path=DB_PATH, max_size=8):
+    """Pool bersama untuk sebuah file database (dibuat sekali per proses)"""
+    with _pools_lock:
+        pool = _pools.get(path)
+        if pool is None:
+            pool = _pools[path] = ConnectionPool(path, max_size=max_size)
+        return pool
+
+
+def close_pools():
+    """Tutup semua pool proses ini. Dipanggil sebelum fork (serve.py): koneksi
+    SQLite tidak boleh dibawa ke proses anak, jadi setiap worker membuat poolnya sendiri."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close_all()
+        _pools.clear()
+
+
+def configure_database(path=DB_PATH):
+    """Aktifkan WAL (persisten di file database) supaya reader tidak memblok writer"""
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("PRAGMA journal_mode = WAL")
+    finally:
+        conn.close()
+
+
+def _app_pool():
+    return get_pool(current_app.config['DATABASE'], current_app.config['DB_POOL_SIZE'])
+
+
+def get_db_connection():
+    """Koneksi database untuk request/app context saat ini.
+
+    Di dalam app context, koneksi dipinjam dari pool sekali lalu dipakai ulang
+    oleh semua helper sampai teardown. Di luar app context (script, thread
+    lain) fungsi ini membuka koneksi baru yang harus ditutup pemanggil.
+    Thread yang punya koneksi terikat (bind_thread) selalu memakai koneksi itu.
+    """
+    bound = getattr(_thread, 'conn', None)
+    if bound is not None:
+        return bound
+    if not has_app_context():
+        return connect(DB_PATH)
+    if not current_app.config['DB_POOL']:
+        # Mode lama: koneksi baru tanpa pragma di setiap panggilan helper
+        # (dipakai sebagai pembanding di scripts/bench_db.py)
+        conn = connect(current_app.config['DATABASE'], tuned=False)
+        g.setdefault('_db_unpooled', []).append(conn)
+        for hook in checkout_hooks:
+            hook(conn)
+        return conn
+    conn = g.get('_db')
+    if conn is None:
+        conn = g._db = _app_pool().acquire()
+        for hook in checkout_hooks:
+            hook(conn)
+    return conn
+
+
+def close_db(exc=None):
+    """Kembalikan koneksi request ke pool (dipanggil saat teardown app context)"""
+    for conn in g.pop('_db_unpooled', []):
+        for hook in release_hooks:
+            hook(conn)
+        conn.close()
+    conn = g.pop('_db', None)
+    if conn is not None:
+        for hook in release_hooks:
+            hook(conn)
+        _app_pool().release(conn)
+
+
+@contextmanager
+def immediate_transaction(conn):
+    """Transaksi BEGIN IMMEDIATE: write lock diambil di awal, bukan saat
+    statement tulis pertama, sehingga cek-lalu-tulis tidak bisa disalip
+    koneksi lain. Commit jika blok selesai, rollback jika ada exception."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
+@contextmanager
+def pooled_connection():
+    """Pinjam koneksi dari pool untuk worker thread di luar request"""
+    pool = _app_pool() if has_app_context() else get_pool(DB_PATH)
+    conn = pool.acquire()
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+
+
+def init_app(app):
+    """Daftarkan lapisan database ke aplikasi Flask"""
+    app.config.setdefault('DATABASE', DB_PATH)
+    app.config.setdefault('DB_POOL', True)
+    app.config.setdefault('DB_POOL_SIZE', 8)
+    app.teardown_appcontext(close_db)
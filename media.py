@@ -0,0 +1,62 @@
+# Serving file media besar (video hero, GIF pembayaran): dukungan Range/206
+# supaya browser bisa seek dan memuat video per potongan, validator cache
+# yang panjang, dan varian bitrate rendah opsional untuk user agent mobile.
+import os
+import re
+
+from flask import current_app, request, send_from_directory, url_for
+
+# Nama file tidak di-hash, jadi cukup lama tapi tetap bisa direvalidasi (ETag/Last-Modified)
+MEDIA_MAX_AGE = 7 * 24 * 3600
+MOBILE_UA = re.compile(r'Mobi|Android|iPhone|iPod', re.I)
+
+
+def mobile_variant(filename):
+    """videos/BG.mp4 -> videos/BG.mobile.mp4"""
+    base, ext = os.path.splitext(filename)
+    return f"{base}.mobile{ext}"
+
+
+def media_url(filename):
+    """URL media di static/ yang disajikan lewat serve_media"""
+    return url_for('media_file', filename=filename)
+
+
+def serve_media(filename):
+    """File media dengan Range/206 dan cache panjang.
+
+    send_file menjawab header Range dengan 206 Partial Content dan memakai
+    wsgi.file_wrapper (sendfile di gunicorn/uwsgi) untuk respons penuh. Jika
+    MEDIA_X_ACCEL_PREFIX diisi, pengiriman file diserahkan ke nginx lewat
+    X-Accel-Redirect sehingga worker Python langsung bebas.
+    """
+    root = current_app.static_folder
+    vary_ua = False
+    if current_app.config['MEDIA_MOBILE_VARIANTS']:
+        variant = mobile_variant(filename)
+        if os.path.isfile(os.path.join(root, variant)):
+            vary_ua = True
+            if MOBILE_UA.search(request.user_agent.string or ''):
+                filename = variant
+    prefix = current_app.config['MEDIA_X_ACCEL_PREFIX']
+    if prefix:
+        # Validasi path tetap lewat send_from_directory (404 / path traversal)
+        resp = send_from_directory(root, filename, max_age=MEDIA_MAX_AGE, conditional=False)
+        resp.close()
+        resp.response = []
+        resp.headers['X-Accel-Redirect'] = prefix.rstrip('/') + '/' + filename
+        resp.headers.pop('Content-Length', None)
+    else:
+        resp = send_from_directory(root, filename, max_age=MEDIA_MAX_AGE)
+    resp.cache_control.public = True
+    if vary_ua:
+        resp.vary.add('User-Agent')
+    return resp
+
+
+def init_app(app):
+    """Daftarkan serving media ke aplikasi Flask"""
+    app.config.setdefault('MEDIA_MOBILE_VARIANTS', True)
+    app.config.setdefault('MEDIA_X_ACCEL_PREFIX', None)  # mis. '/_protected_static'
+    app.add_url_rule('/media/<path:filename>', 'media_file', serve_media)
+    app.add_template_global(media_url)
@@ -0,0 +1,195 @@
+# Instrumentasi request: histogram latensi per endpoint, jumlah query dan
+# koneksi database per request, dan waktu render template. Hasilnya disajikan
+# dalam format teks Prometheus di /admin/metrics (khusus admin).
+#
+# Metrik disimpan per proses; dengan beberapa worker, setiap worker punya
+# angka sendiri. Set METRICS_ENABLED = False untuk mematikan pengumpulan
+# (hook langsung return setelah satu cek konfigurasi).
+import threading
+import time
+from bisect import bisect_left
+
+from flask import before_render_template, current_app, g, request, template_rendered
+
+import db
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(names, values):
+    if not names:
+        return ''
+    return '{' + ','.join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + '}'
+
+
+class Counter:
+    def __init__(self, name, help_text, labels=()):
+        self.name, self.help, self.labels = name, help_text, labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_values=(), amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def expose(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for values, total in sorted(self._values.items()):
+                lines.append(f'{self.name}{_labels(self.labels, values)} {total}')
+        return lines
+
+
+class Histogram:
+    """Histogram Prometheus dengan bucket tetap (disimpan non-kumulatif)"""
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name, self.help, self.labels, self.buckets = name, help_text, labels, buckets
+        self._series = {}  # label values -> [counts per bucket (+Inf terakhir), sum]
+        self._lock = threading.Lock()
+
+    def observe(self, label_values, value):
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][i] += 1
+            series[1] += value
+
+    def expose(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            snapshot = sorted((k, list(v[0]), v[1]) for k, v in self._series.items())
+        for values, counts, total in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                labels = _labels(self.labels + ('le',), values + (bound,))
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            lines.append(f'{self.name}_sum{_labels(self.labels, values)} {total}')
+            lines.append(f'{self.name}_count{_labels(self.labels, values)} {cumulative}')
+        return lines
+
+
+class Sampled:
+    """Nilai yang dibaca lewat fungsi saat scrape (gauge, atau counter milik modul lain)"""
+    def __init__(self, name, help_text, read, kind='gauge'):
+        self.name, self.help, self.read, self.kind = name, help_text, read, kind
+
+    def expose(self):
+        return [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} {self.kind}', f'{self.name} {self.read()}']
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def expose(self):
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.expose())
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+requests_total = registry.register(Counter(
+    'http_requests_total', 'Jumlah request per endpoint, method dan status', ('endpoint', 'method', 'status')))
+request_seconds = registry.register(Histogram(
+    'http_request_duration_seconds', 'Latensi request (before_request sampai teardown)', ('endpoint', 'method')))
+queries_per_request = registry.register(Histogram(
+    'db_queries_per_request', 'Statement SQL yang dieksekusi per request', ('endpoint',), COUNT_BUCKETS))
+connections_per_request = registry.register(Histogram(
+    'db_connections_per_request', 'Koneksi database yang dipakai per request', ('endpoint',), COUNT_BUCKETS))
+template_seconds = registry.register(Histogram(
+    'template_render_seconds', 'Total waktu render template per request', ('endpoint',)))
+
+
+def _state():
+    """Penghitung request saat ini (dibuat saat pertama dipakai, bisa sebelum
+    before_request karena session dibuka lebih dulu)"""
+    state = g.get('_metrics')
+    if state is None:
+        state = g._metrics = {'start': time.perf_counter(), 'queries': [0], 'connections': 0,
+                              'template': 0.0, 'render_start': [], 'status': None}
+    return state
+
+
+def _on_checkout(conn):
+    if not current_app.config['METRICS_ENABLED']:
+        return
+    state = _state()
+    state['connections'] += 1
+    queries = state['queries']
+
+    def count_statement(sql):
+        queries[0] += 1
+    conn.set_trace_callback(count_statement)
+
+
+def _on_release(conn):
+    if g.get('_metrics') is not None:
+        conn.set_trace_callback(None)
+
+
+def _before_request():
+    if current_app.config['METRICS_ENABLED']:
+        _state()
+
+
+def _after_request(response):
+    state = g.get('_metrics')
+    if state is not None:
+        state['status'] = response.status_code
+    return response
+
+
+def _teardown_request(exc=None):
+    state = g.get('_metrics')
+    if state is None:
+        return
+    endpoint = request.endpoint or 'unknown'
+    status = state['status'] or 500
+    requests_total.inc((endpoint, request.method, str(status)))
+    request_seconds.observe((endpoint, request.method), time.perf_counter() - state['start'])
+    queries_per_request.observe((endpoint,), state['queries'][0])
+    connections_per_request.observe((endpoint,), state['connections'])
+    if state['template']:
+        template_seconds.observe((endpoint,), state['template'])
+
+
+def _before_render(sender, template, context, **extra):
+    state = g.get('_metrics')
+    if state is not None:
+        state['render_start'].append(time.perf_counter())
+
+
+def _rendered(sender, template, context, **extra):
+    state = g.get('_metrics')
+    if state is not None and state['render_start']:
+        state['template'] += time.perf_counter() - state['render_start'].pop()
+
+
+def exposition():
+    """Semua metrik dalam format teks Prometheus 0.0.4"""
+    return registry.expose()
+
+
+def init_app(app):
+    """Pasang hook instrumentasi ke aplikasi Flask"""
+    app.config.setdefault('METRICS_ENABLED', True)
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    db.checkout_hooks.append(_on_checkout)
+    db.release_hooks.append(_on_release)
+    before_render_template.connect(_before_render, app, weak=False)
+    template_rendered.connect(_rendered, app, weak=False)
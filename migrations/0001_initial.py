@@ -0,0 +1,106 @@
+# Skema awal: users, movies, orders, index okupansi kursi dan seat hold.
+# Idempoten supaya database lama (sebelum ada schema_version) ikut tercatat.
+
+
+def upgrade(conn):
+    cur = conn.cursor()
+    cur.execute(
+        '''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            email TEXT NOT NULL UNIQUE,
+            password TEXT NOT NULL,
+            membership TEXT NOT NULL DEFAULT 'member',
+            created_at TEXT
+        )
+        '''
+    )
+    # Ensure 'role' column exists for admin/user roles
+    cur.execute("PRAGMA table_info(users)")
+    cols = [r[1] for r in cur.fetchall()]
+    if 'role' not in cols:
+        try:
+            cur.execute("ALTER TABLE users ADD COLUMN role TEXT DEFAULT 'user'")
+        except Exception:
+            pass
+    # movies table - untuk menyimpan data film yang dapat dikelola admin
+    cur.execute(
+        '''
+        CREATE TABLE IF NOT EXISTS movies (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            genre TEXT,
+            duration INTEGER,
+            poster TEXT,
+            showtimes TEXT,
+            regular_price INTEGER DEFAULT 50000,
+            vip_price INTEGER DEFAULT 75000,
+            available_seats INTEGER DEFAULT 50,
+            created_at TEXT,
+            updated_at TEXT
+        )
+        '''
+    )
+    # orders table
+    cur.execute(
+        '''
+        CREATE TABLE IF NOT EXISTS orders (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            movie_id INTEGER,
+            movie_title TEXT,
+            seat TEXT,
+            ticket_type TEXT,
+            showtime TEXT,
+            ticket_price INTEGER,
+            admin_fee INTEGER,
+            price INTEGER,
+            membership TEXT,
+            snack_included INTEGER DEFAULT 0,
+            customer TEXT,
+            email TEXT,
+            date TEXT,
+            payment_method TEXT
+        )
+        '''
+    )
+    # order_seats - index okupansi per kursi, satu baris per kursi yang terjual.
+    # Primary key (movie_id, showtime, ticket_type, seat) membuat cek kursi
+    # menjadi lookup per kursi, bukan scan + parsing kolom orders.seat.
+    cur.execute(
+        '''
+        CREATE TABLE IF NOT EXISTS order_seats (
+            movie_id INTEGER NOT NULL,
+            showtime TEXT NOT NULL,
+            ticket_type TEXT NOT NULL,
+            seat TEXT NOT NULL,
+            order_id INTEGER NOT NULL,
+            PRIMARY KEY (movie_id, showtime, ticket_type, seat)
+        ) WITHOUT ROWID
+        '''
+    )
+    # seat_holds - kursi yang sedang ditahan sementara (belum dibayar).
+    # Satu hold per kursi; hold kedaluwarsa dibersihkan oleh HoldSweeper.
+    cur.execute(
+        '''
+        CREATE TABLE IF NOT EXISTS seat_holds (
+            movie_id INTEGER NOT NULL,
+            showtime TEXT NOT NULL,
+            ticket_type TEXT NOT NULL,
+            seat TEXT NOT NULL,
+            hold_token TEXT NOT NULL,
+            expires_at REAL NOT NULL,
+            PRIMARY KEY (movie_id, showtime, ticket_type, seat)
+        ) WITHOUT ROWID
+        '''
+    )
+    # Backfill index dari orders lama (sekali saja, saat index masih kosong)
+    cur.execute("SELECT 1 FROM order_seats LIMIT 1")
+    if cur.fetchone() is None:
+        cur.execute("SELECT id, movie_id, showtime, ticket_type, seat FROM orders")
+        for order_id, movie_id, showtime, ticket_type, seat_str in cur.fetchall():
+            seats = [p.strip() for p in (seat_str or '').split(',') if p.strip()]
+            cur.executemany(
+                "INSERT OR IGNORE INTO order_seats (movie_id, showtime, ticket_type, seat, order_id) VALUES (?, ?, ?, ?, ?)",
+                [(movie_id, showtime or '', ticket_type or '', seat, order_id) for seat in seats]
+            )
@@ -0,0 +1,20 @@
+# Index sekunder untuk query yang sering dipakai.
+# users.email sudah punya index implisit dari constraint UNIQUE.
+
+INDEXES = (
+    # Cek kursi lama & laporan per jadwal tayang
+    "CREATE INDEX IF NOT EXISTS idx_orders_movie_showtime_type ON orders (movie_id, showtime, ticket_type)",
+    # Riwayat order di /profile: WHERE email = ? ORDER BY id DESC
+    "CREATE INDEX IF NOT EXISTS idx_orders_email_id ON orders (email, id)",
+    # Pelepasan hold per session dan sweeper hold kedaluwarsa
+    "CREATE INDEX IF NOT EXISTS idx_seat_holds_token ON seat_holds (hold_token)",
+    "CREATE INDEX IF NOT EXISTS idx_seat_holds_expires ON seat_holds (expires_at)",
+    # Lookup order dari index kursi
+    "CREATE INDEX IF NOT EXISTS idx_order_seats_order ON order_seats (order_id)",
+)
+
+
+def upgrade(conn):
+    for statement in INDEXES:
+        conn.execute(statement)
+    conn.execute("ANALYZE")
@@ -0,0 +1,57 @@
+# Rollup penjualan yang diperbarui setiap kali order disimpan (save_order_db),
+# supaya dashboard admin tidak perlu menjumlah seluruh tabel orders.
+
+TABLES = (
+    """CREATE TABLE IF NOT EXISTS sales_daily (
+        day TEXT PRIMARY KEY,
+        orders INTEGER NOT NULL DEFAULT 0,
+        seats INTEGER NOT NULL DEFAULT 0,
+        revenue INTEGER NOT NULL DEFAULT 0
+    )""",
+    """CREATE TABLE IF NOT EXISTS sales_by_movie (
+        movie_id INTEGER PRIMARY KEY,
+        movie_title TEXT,
+        orders INTEGER NOT NULL DEFAULT 0,
+        seats INTEGER NOT NULL DEFAULT 0,
+        revenue INTEGER NOT NULL DEFAULT 0
+    )""",
+    """CREATE TABLE IF NOT EXISTS sales_by_showtime (
+        movie_id INTEGER NOT NULL,
+        showtime TEXT NOT NULL,
+        orders INTEGER NOT NULL DEFAULT 0,
+        seats INTEGER NOT NULL DEFAULT 0,
+        revenue INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (movie_id, showtime)
+    )""",
+    """CREATE TABLE IF NOT EXISTS sales_by_payment (
+        payment_method TEXT PRIMARY KEY,
+        orders INTEGER NOT NULL DEFAULT 0,
+        seats INTEGER NOT NULL DEFAULT 0,
+        revenue INTEGER NOT NULL DEFAULT 0
+    )""",
+)
+
+# Jumlah kursi per order dihitung dari index order_seats
+BACKFILL = (
+    """INSERT INTO sales_daily (day, orders, seats, revenue)
+       SELECT substr(o.date, 1, 10), COUNT(*), SUM(s.n), SUM(COALESCE(o.price, 0))
+       FROM orders o JOIN (SELECT order_id, COUNT(*) AS n FROM order_seats GROUP BY order_id) s ON s.order_id = o.id
+       GROUP BY substr(o.date, 1, 10)""",
+    """INSERT INTO sales_by_movie (movie_id, movie_title, orders, seats, revenue)
+       SELECT o.movie_id, MAX(o.movie_title), COUNT(*), SUM(s.n), SUM(COALESCE(o.price, 0))
+       FROM orders o JOIN (SELECT order_id, COUNT(*) AS n FROM order_seats GROUP BY order_id) s ON s.order_id = o.id
+       GROUP BY o.movie_id""",
+    """INSERT INTO sales_by_showtime (movie_id, showtime, orders, seats, revenue)
+       SELECT o.movie_id, COALESCE(o.showtime, ''), COUNT(*), SUM(s.n), SUM(COALESCE(o.price, 0))
+       FROM orders o JOIN (SELECT order_id, COUNT(*) AS n FROM order_seats GROUP BY order_id) s ON s.order_id = o.id
+       GROUP BY o.movie_id, COALESCE(o.showtime, '')""",
+    """INSERT INTO sales_by_payment (payment_method, orders, seats, revenue)
+       SELECT COALESCE(o.payment_method, ''), COUNT(*), SUM(s.n), SUM(COALESCE(o.price, 0))
+       FROM orders o JOIN (SELECT order_id, COUNT(*) AS n FROM order_seats GROUP BY order_id) s ON s.order_id = o.id
+       GROUP BY COALESCE(o.payment_method, '')""",
+)
+
+
+def upgrade(conn):
+    for statement in TABLES + BACKFILL:
+        conn.execute(statement)
@@ -0,0 +1,21 @@
+# Penanda versi katalog film untuk invalidasi cache antar proses.
+# Trigger menaikkan versi setiap kali tabel movies berubah, siapa pun penulisnya.
+
+STATEMENTS = (
+    """CREATE TABLE IF NOT EXISTS catalog_version (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        version INTEGER NOT NULL
+    )""",
+    "INSERT OR IGNORE INTO catalog_version (id, version) VALUES (1, 1)",
+    """CREATE TRIGGER IF NOT EXISTS movies_catalog_insert AFTER INSERT ON movies
+       BEGIN UPDATE catalog_version SET version = version + 1 WHERE id = 1; END""",
+    """CREATE TRIGGER IF NOT EXISTS movies_catalog_update AFTER UPDATE ON movies
+       BEGIN UPDATE catalog_version SET version = version + 1 WHERE id = 1; END""",
+    """CREATE TRIGGER IF NOT EXISTS movies_catalog_delete AFTER DELETE ON movies
+       BEGIN UPDATE catalog_version SET version = version + 1 WHERE id = 1; END""",
+)
+
+
+def upgrade(conn):
+    for statement in STATEMENTS:
+        conn.execute(statement)
@@ -0,0 +1,26 @@
+# Cache poster lokal: pemetaan URL poster asli ke file content-addressed
+# di static/posters/. Poster yang selesai diproses menaikkan versi katalog
+# supaya halaman yang sudah di-cache ikut memakai thumbnail lokal.
+
+STATEMENTS = (
+    """CREATE TABLE IF NOT EXISTS poster_cache (
+        source_url TEXT PRIMARY KEY,
+        status TEXT NOT NULL DEFAULT 'pending',
+        digest TEXT,
+        ext TEXT,
+        widths TEXT,
+        error TEXT,
+        updated_at TEXT
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS poster_cache_ready_insert AFTER INSERT ON poster_cache
+       WHEN NEW.status = 'ready'
+       BEGIN UPDATE catalog_version SET version = version + 1 WHERE id = 1; END""",
+    """CREATE TRIGGER IF NOT EXISTS poster_cache_ready_update AFTER UPDATE ON poster_cache
+       WHEN NEW.status = 'ready' OR OLD.status = 'ready'
+       BEGIN UPDATE catalog_version SET version = version + 1 WHERE id = 1; END""",
+)
+
+
+def upgrade(conn):
+    for statement in STATEMENTS:
+        conn.execute(statement)
@@ -0,0 +1,14 @@
+# Versi identitas per user untuk cache identitas in-process (lihat IdentityCache
+# di app.py). Trigger menaikkan versi setiap kali data yang disimpan di session
+# berubah (nama, email, membership, role), siapa pun penulisnya.
+
+
+def upgrade(conn):
+    cols = [r[1] for r in conn.execute("PRAGMA table_info(users)").fetchall()]
+    if 'version' not in cols:
+        conn.execute("ALTER TABLE users ADD COLUMN version INTEGER NOT NULL DEFAULT 1")
+    conn.execute(
+        """CREATE TRIGGER IF NOT EXISTS users_identity_version
+           AFTER UPDATE OF name, email, membership, role ON users
+           BEGIN UPDATE users SET version = OLD.version + 1 WHERE id = NEW.id; END"""
+    )
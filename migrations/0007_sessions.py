@@ -0,0 +1,17 @@
+# Session server-side (lihat sessions.py): cookie hanya berisi sid acak,
+# isi session disimpan di sini dan versinya naik setiap kali ditulis.
+
+STATEMENTS = (
+    """CREATE TABLE IF NOT EXISTS sessions (
+        sid TEXT PRIMARY KEY,
+        data TEXT NOT NULL,
+        version INTEGER NOT NULL DEFAULT 1,
+        expires_at REAL NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions (expires_at)",
+)
+
+
+def upgrade(conn):
+    for statement in STATEMENTS:
+        conn.execute(statement)
@@ -0,0 +1,108 @@
+# Jadwal tayang ternormalisasi: satu baris `screenings` per pemutaran (waktu
+# mulai, studio, kapasitas). Index kursi, hold, order dan rollup merujuk
+# screening_id, bukan teks jadwal "10:00 AM" dari movies.showtimes.
+#
+# Order lama dipetakan ke screening pada tanggal order + jam di teks jadwalnya.
+# Hold kursi yang sedang aktif tidak dimigrasikan (berumur pendek).
+from datetime import datetime
+
+DEFAULT_HALL = 'Studio 1'
+DEFAULT_CAPACITY = 280  # 14 baris x 20 kursi (generate_seats)
+
+TABLE = """CREATE TABLE IF NOT EXISTS screenings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    movie_id INTEGER NOT NULL,
+    starts_at TEXT NOT NULL,
+    hall TEXT NOT NULL DEFAULT 'Studio 1',
+    capacity INTEGER NOT NULL,
+    UNIQUE (movie_id, starts_at, hall)
+)"""
+
+STATEMENTS = (
+    # Jadwal semua film dalam rentang waktu (mis. "pemutaran malam ini")
+    "CREATE INDEX IF NOT EXISTS idx_screenings_starts ON screenings (starts_at)",
+    "CREATE INDEX IF NOT EXISTS idx_orders_screening ON orders (screening_id)",
+    "DROP INDEX IF EXISTS idx_orders_movie_showtime_type",
+    # order_seats: kunci kursi sekarang (screening_id, ticket_type, seat)
+    """CREATE TABLE order_seats_new (
+        screening_id INTEGER NOT NULL,
+        ticket_type TEXT NOT NULL,
+        seat TEXT NOT NULL,
+        order_id INTEGER NOT NULL,
+        PRIMARY KEY (screening_id, ticket_type, seat)
+    ) WITHOUT ROWID""",
+    """INSERT OR IGNORE INTO order_seats_new (screening_id, ticket_type, seat, order_id)
+       SELECT o.screening_id, s.ticket_type, s.seat, s.order_id
+       FROM order_seats s JOIN orders o ON o.id = s.order_id
+       WHERE o.screening_id IS NOT NULL""",
+    "DROP TABLE order_seats",
+    "ALTER TABLE order_seats_new RENAME TO order_seats",
+    "CREATE INDEX IF NOT EXISTS idx_order_seats_order ON order_seats (order_id)",
+    "DROP TABLE seat_holds",
+    """CREATE TABLE seat_holds (
+        screening_id INTEGER NOT NULL,
+        ticket_type TEXT NOT NULL,
+        seat TEXT NOT NULL,
+        hold_token TEXT NOT NULL,
+        expires_at REAL NOT NULL,
+        PRIMARY KEY (screening_id, ticket_type, seat)
+    ) WITHOUT ROWID""",
+    "CREATE INDEX IF NOT EXISTS idx_seat_holds_token ON seat_holds (hold_token)",
+    "CREATE INDEX IF NOT EXISTS idx_seat_holds_expires ON seat_holds (expires_at)",
+    # Rollup per pemutaran menggantikan sales_by_showtime (movie_id, teks jadwal)
+    """CREATE TABLE IF NOT EXISTS sales_by_screening (
+        screening_id INTEGER PRIMARY KEY,
+        orders INTEGER NOT NULL DEFAULT 0,
+        seats INTEGER NOT NULL DEFAULT 0,
+        revenue INTEGER NOT NULL DEFAULT 0
+    )""",
+    """INSERT INTO sales_by_screening (screening_id, orders, seats, revenue)
+       SELECT o.screening_id, COUNT(*), SUM(s.n), SUM(COALESCE(o.price, 0))
+       FROM orders o JOIN (SELECT order_id, COUNT(*) AS n FROM order_seats GROUP BY order_id) s ON s.order_id = o.id
+       WHERE o.screening_id IS NOT NULL
+       GROUP BY o.screening_id""",
+    "DROP TABLE IF EXISTS sales_by_showtime",
+)
+
+
+def to_clock(label):
+    """'07:00 PM' / '19:00' -> '19:00' (None jika tidak dikenali)"""
+    for fmt in ('%I:%M %p', '%H:%M', '%I %p'):
+        try:
+            return datetime.strptime(label.strip().upper(), fmt).strftime('%H:%M')
+        except ValueError:
+            continue
+    return None
+
+
+def upgrade(conn):
+    conn.execute(TABLE)
+    cols = [r[1] for r in conn.execute("PRAGMA table_info(orders)").fetchall()]
+    if 'screening_id' not in cols:
+        conn.execute("ALTER TABLE orders ADD COLUMN screening_id INTEGER")
+
+    groups = conn.execute(
+        """SELECT movie_id, substr(COALESCE(date, ''), 1, 10) AS day, COALESCE(showtime, '') AS showtime
+           FROM orders WHERE screening_id IS NULL AND movie_id IS NOT NULL
+           GROUP BY 1, 2, 3"""
+    ).fetchall()
+    for movie_id, day, showtime in groups:
+        screening_day = day if len(day) == 10 else datetime.now().strftime('%Y-%m-%d')
+        starts_at = f"{screening_day} {to_clock(showtime) or '00:00'}"
+        conn.execute(
+            "INSERT OR IGNORE INTO screenings (movie_id, starts_at, hall, capacity) VALUES (?, ?, ?, ?)",
+            (movie_id, starts_at, DEFAULT_HALL, DEFAULT_CAPACITY)
+        )
+        screening_id = conn.execute(
+            "SELECT id FROM screenings WHERE movie_id = ? AND starts_at = ? AND hall = ?",
+            (movie_id, starts_at, DEFAULT_HALL)
+        ).fetchone()[0]
+        conn.execute(
+            """UPDATE orders SET screening_id = ?
+               WHERE screening_id IS NULL AND movie_id = ?
+                 AND substr(COALESCE(date, ''), 1, 10) = ? AND COALESCE(showtime, '') = ?""",
+            (screening_id, movie_id, day, showtime)
+        )
+
+    for statement in STATEMENTS:
+        conn.execute(statement)
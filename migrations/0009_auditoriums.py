@@ -0,0 +1,33 @@
+# Studio dengan denah kursi sendiri (lihat auditoriums.py). screenings.hall
+# merujuk auditoriums.name; studio tanpa baris di sini memakai denah default.
+#
+# Studio 1 di-seed dengan denah 14 x 20 (label A1..N20 tetap sama dengan
+# kursi order lama), dua lorong memanjang, satu lorong melintang, dan tiga
+# baris belakang sebagai zona VIP.
+
+DEFAULT_HALL = 'Studio 1'
+STUDIO_1 = '\n'.join(['RRRR_RRRRRRRRRRRR_RRRR'] * 11 + [''] + ['VVVV_VVVVVVVVVVVV_VVVV'] * 3)
+STUDIO_1_CAPACITY = 280
+
+STATEMENTS = (
+    """CREATE TABLE IF NOT EXISTS auditoriums (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL UNIQUE,
+        layout TEXT NOT NULL,
+        capacity INTEGER NOT NULL,
+        version INTEGER NOT NULL DEFAULT 1
+    )""",
+    # Versi naik setiap denah berubah, siapa pun penulisnya (cache Layout per proses)
+    """CREATE TRIGGER IF NOT EXISTS auditoriums_layout_version
+       AFTER UPDATE OF layout ON auditoriums
+       BEGIN UPDATE auditoriums SET version = OLD.version + 1 WHERE id = NEW.id; END""",
+)
+
+
+def upgrade(conn):
+    for statement in STATEMENTS:
+        conn.execute(statement)
+    conn.execute(
+        "INSERT OR IGNORE INTO auditoriums (name, layout, capacity) VALUES (?, ?, ?)",
+        (DEFAULT_HALL, STUDIO_1, STUDIO_1_CAPACITY)
+    )
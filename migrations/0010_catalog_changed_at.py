@@ -0,0 +1,22 @@
+# Waktu perubahan katalog yang sama di semua proses (header Last-Modified
+# halaman utama). DELETE pada movies tidak meninggalkan updated_at, jadi setiap
+# trigger yang menaikkan catalog_version juga mencatat waktunya (UTC).
+
+BUMP = "UPDATE catalog_version SET version = version + 1, changed_at = strftime('%Y-%m-%d %H:%M:%S', 'now') WHERE id = 1"
+
+TRIGGERS = (
+    ('movies_catalog_insert', 'AFTER INSERT ON movies', ''),
+    ('movies_catalog_update', 'AFTER UPDATE ON movies', ''),
+    ('movies_catalog_delete', 'AFTER DELETE ON movies', ''),
+    ('poster_cache_ready_insert', 'AFTER INSERT ON poster_cache', "WHEN NEW.status = 'ready'"),
+    ('poster_cache_ready_update', 'AFTER UPDATE ON poster_cache', "WHEN NEW.status = 'ready' OR OLD.status = 'ready'"),
+)
+
+
+def upgrade(conn):
+    cols = [r[1] for r in conn.execute("PRAGMA table_info(catalog_version)").fetchall()]
+    if 'changed_at' not in cols:
+        conn.execute("ALTER TABLE catalog_version ADD COLUMN changed_at TEXT")
+    for name, event, when in TRIGGERS:
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+        conn.execute(f"CREATE TRIGGER {name} {event} {when} BEGIN {BUMP}; END")
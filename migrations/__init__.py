@@ -0,0 +1,62 @@
+"""
+Migrasi skema database berversi.
+
+Setiap file ``NNNN_nama.py`` di folder ini adalah satu migrasi dengan fungsi
+``upgrade(conn)``. Migrasi dijalankan berurutan menurut nomornya, masing-masing
+dalam satu transaksi, dan versi yang sudah diterapkan dicatat di tabel
+``schema_version``. Dipakai bersama oleh app.py dan scripts/seed_admin.py.
+"""
+import importlib
+import os
+import re
+from datetime import datetime
+
+MIGRATIONS_DIR = os.path.dirname(os.path.abspath(__file__))
+_FILENAME = re.compile(r'^(\d{4})_(\w+)\.py$')
+
+
+def discover():
+    """Daftar (versi, nama, modul) semua migrasi, terurut menurut versi"""
+    found = []
+    for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+        m = _FILENAME.match(filename)
+        if m:
+            module = importlib.import_module(f'{__name__}.{filename[:-3]}')
+            found.append((int(m.group(1)), m.group(2), module))
+    return found
+
+
+def current_version(conn):
+    """Versi skema tertinggi yang sudah diterapkan (0 jika belum ada)"""
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS schema_version (version INTEGER PRIMARY KEY, name TEXT NOT NULL, applied_at TEXT)"
+    )
+    conn.commit()
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return row[0] or 0
+
+
+def migrate(conn):
+    """Terapkan semua migrasi yang belum dijalankan, kembalikan versi yang diterapkan"""
+    version = current_version(conn)
+    applied = []
+    for number, name, module in discover():
+        if number <= version:
+            continue
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Cek ulang di dalam lock: proses lain mungkin sudah menerapkannya
+            if conn.execute("SELECT 1 FROM schema_version WHERE version = ?", (number,)).fetchone():
+                conn.rollback()
+                continue
+            module.upgrade(conn)
+            conn.execute(
+                "INSERT INTO schema_version (version, name, applied_at) VALUES (?, ?, ?)",
+                (number, name, datetime.now().strftime("%Y-%m-%d %H:%M"))
+            )
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+        applied.append(number)
+    return applied
@@ -0,0 +1,233 @@
+# Hashing password (scrypt/pbkdf2) di process pool terbatas, supaya lonjakan
+# login tidak menghabiskan thread request yang juga melayani pemilihan kursi.
+# Jika antrean penuh, request langsung ditolak (503 + Retry-After) daripada
+# menunggu lama.
+import functools
+import math
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+from flask import current_app
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+
+class HashingOverloaded(Exception):
+    """Antrean hashing penuh; klien diminta mencoba lagi setelah retry_after detik"""
+    def __init__(self, retry_after):
+        super().__init__(f"Hashing password sibuk, coba lagi dalam {retry_after} detik")
+        self.retry_after = retry_after
+
+
+@functools.lru_cache(maxsize=16)
+def expand_method(method):
+    """Metode hashing dengan semua parameter seperti yang disimpan werkzeug di
+    hash: 'scrypt' -> 'scrypt:32768:8:1', 'pbkdf2' -> 'pbkdf2:sha256:<iterasi default>'.
+
+    Raise ValueError untuk metode yang tidak dikenali werkzeug.
+    """
+    name, *args = method.split(':')
+    if name == 'scrypt' and not args:
+        return 'scrypt:32768:8:1'
+    if name == 'scrypt' and len(args) == 3:
+        return 'scrypt:' + ':'.join(str(int(a)) for a in args)
+    if name == 'pbkdf2' and len(args) <= 2:
+        hash_name = args[0] if args else 'sha256'
+        iterations = int(args[1]) if len(args) == 2 else DEFAULT_PBKDF2_ITERATIONS
+        return f"pbkdf2:{hash_name}:{iterations}"
+    raise ValueError(f"PASSWORD_HASH_METHOD tidak valid: {method!r}")
+
+
+def needs_rehash(pwhash, method):
+    """True jika hash dibuat dengan metode/cost selain konfigurasi saat ini
+    (shorthand seperti 'scrypt' disamakan dengan parameter lengkapnya)"""
+    try:
+        return expand_method(pwhash.split('$', 1)[0]) != expand_method(method)
+    except ValueError:
+        return True  # hash lama dengan format yang tidak dikenal
+
+
+# Fungsi di bawah dijalankan di proses worker (harus top-level supaya bisa di-pickle)
+def _ping():
+    return True
+
+
+def _hash(password, method):
+    return generate_password_hash(password, method=method)
+
+
+def _verify(pwhash, password, method):
+    """Verifikasi + rehash dalam satu perjalanan ke worker: (cocok, hash_baru/None)"""
+    if not check_password_hash(pwhash, password):
+        return False, None
+    if needs_rehash(pwhash, method):
+        return True, generate_password_hash(password, method=method)
+    return True, None
+
+
+class PasswordHasher:
+    """Process pool hashing dengan admission control berdasarkan kedalaman antrean.
+
+    ``workers=0`` menjalankan hashing langsung di thread pemanggil (tanpa
+    pool), berguna untuk script dan test. Hal yang sama dilakukan (dengan log
+    error) jika pool gagal start di proses ini.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+        self._inline_pid = None  # proses yang pool-nya gagal start: hashing di thread pemanggil
+        self._inflight = 0
+        self._latencies = deque(maxlen=1024)
+        self.counters = {'hash': 0, 'verify': 0, 'rehash': 0, 'rejected': 0, 'timeout': 0}
+        self.max_inflight = 0
+
+    def _executor_for(self, workers):
+        """Pool proses ini, atau None jika pool tidak bisa dipakai (hashing di thread pemanggil)"""
+        pid = os.getpid()
+        executor = self._executor
+        if executor is not None and self._pid == pid:
+            return executor
+        with self._start_lock:
+            if self._inline_pid == pid:
+                return None
+            if self._executor is not None and self._pid == pid:
+                return self._executor
+            # forkserver: worker tidak di-fork dari proses server yang punya banyak thread/lock
+            executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('forkserver'))
+            try:
+                # Worker meng-import ulang __main__; tanpa `if __name__ == '__main__':`
+                # di script utama worker mati saat bootstrap (BrokenProcessPool)
+                executor.submit(_ping).result(timeout=current_app.config['PASSWORD_HASH_TIMEOUT'])
+            except BrokenProcessPool:
+                executor.shutdown(cancel_futures=True)
+                self._inline_pid = pid
+                current_app.logger.error(
+                    "Process pool hashing password gagal start (script utama tanpa "
+                    "`if __name__ == '__main__':`?); hashing dijalankan di thread request")
+                return None
+            except FutureTimeout:
+                pass  # worker lambat start, bukan gagal: job berikutnya ikut antre
+            with self._lock:
+                self._executor, self._pid = executor, pid
+            return executor
+
+    def _retry_after(self, workers):
+        """Perkiraan detik sampai antrean saat ini habis diproses"""
+        avg = sum(self._latencies) / len(self._latencies) if self._latencies else 0.5
+        return max(1, math.ceil(avg * self._inflight / max(workers, 1)))
+
+    def run(self, kind, fn, *args):
+        config = current_app.config
+        workers = config['PASSWORD_HASH_WORKERS']
+        start = time.perf_counter()
+        with self._lock:
+            self.counters[kind] += 1
+        executor = self._executor_for(workers) if workers > 0 else None
+        if executor is None:
+            result = fn(*args)
+            self._record(start)
+            return result
+        with self._lock:
+            if self._inflight >= config['PASSWORD_HASH_MAX_QUEUE']:
+                self.counters['rejected'] += 1
+                raise HashingOverloaded(self._retry_after(workers))
+            self._inflight += 1
+            self.max_inflight = max(self.max_inflight, self._inflight)
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            self._finish(start)
+            self._discard(executor)
+            raise HashingOverloaded(1)
+        except Exception:
+            self._finish(start)
+            raise
+        # Slot antrean baru dilepas saat job benar-benar selesai di worker, bukan
+        # saat pemanggil berhenti menunggu; job yang timeout tetap terhitung
+        future.add_done_callback(lambda _: self._finish(start))
+        try:
+            return future.result(timeout=config['PASSWORD_HASH_TIMEOUT'])
+        except FutureTimeout:
+            with self._lock:
+                self.counters['timeout'] += 1
+            raise HashingOverloaded(self._retry_after(workers))
+        except BrokenProcessPool:
+            # Worker mati (mis. OOM): buat pool baru di panggilan berikutnya
+            self._discard(executor)
+            raise HashingOverloaded(1)
+
+    def _discard(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+
+    def _finish(self, start):
+        with self._lock:
+            self._inflight -= 1
+            self._latencies.append(time.perf_counter() - start)
+
+    def _record(self, start):
+        with self._lock:
+            self._latencies.append(time.perf_counter() - start)
+
+    def hash(self, password):
+        return self.run('hash', _hash, password, current_app.config['PASSWORD_HASH_METHOD'])
+
+    def verify(self, pwhash, password):
+        ok, new_hash = self.run('verify', _verify, pwhash, password, current_app.config['PASSWORD_HASH_METHOD'])
+        if new_hash:
+            with self._lock:
+                self.counters['rehash'] += 1
+        return ok, new_hash
+
+    def stats(self):
+        """Metrik: latensi hashing (termasuk waktu antre) dan kedalaman antrean"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            inflight = self._inflight
+        def pct(p):
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))] if latencies else 0.0
+        return {
+            **self.counters,
+            'inflight': inflight,
+            'max_inflight': self.max_inflight,
+            'latency_avg': sum(latencies) / len(latencies) if latencies else 0.0,
+            'latency_p50': pct(0.50),
+            'latency_p95': pct(0.95),
+            'latency_max': latencies[-1] if latencies else 0.0,
+        }
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+hasher = PasswordHasher()
+
+
+def hash_password(password):
+    """Hash password dengan PASSWORD_HASH_METHOD di process pool"""
+    return hasher.hash(password)
+
+
+def verify_password(pwhash, password):
+    """Cek password; kembalikan (cocok, hash_baru) -- hash_baru diisi jika cost berubah"""
+    return hasher.verify(pwhash, password)
+
+
+def init_app(app):
+    """Daftarkan konfigurasi hashing password ke aplikasi Flask"""
+    app.config.setdefault('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    expand_method(app.config['PASSWORD_HASH_METHOD'])  # metode tidak valid gagal saat start
+    app.config.setdefault('PASSWORD_HASH_WORKERS', min(2, os.cpu_count() or 1))
+    # Jumlah hashing (antre + berjalan) sebelum request baru ditolak 503
+    app.config.setdefault('PASSWORD_HASH_MAX_QUEUE', 16)
+    app.config.setdefault('PASSWORD_HASH_TIMEOUT', 10.0)  # detik
@@ -0,0 +1,301 @@
+# Cache poster lokal: setiap URL poster diunduh sekali di background,
+# disimpan content-addressed di static/posters/ dan di-resize ke beberapa
+# lebar tetap, sehingga halaman tidak bergantung pada host pihak ketiga
+# dan klien mobile tidak mengunduh gambar ukuran penuh.
+import hashlib
+import io
+import os
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from flask import current_app, send_from_directory, url_for
+
+import db
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow opsional: tanpa Pillow hanya file asli yang disimpan
+    Image = None
+
+# Bucket lebar thumbnail (px); gambar tidak pernah diperbesar
+POSTER_WIDTHS = (240, 480)
+MAX_POSTER_BYTES = 10 * 1024 * 1024
+# Nama file memuat hash isi, jadi boleh di-cache selamanya oleh browser
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+# URL poster diisi admin; skema lain (file://, ftp://, ...) tidak pernah diunduh
+FETCH_SCHEMES = ('http', 'https')
+
+
+class PosterFetchError(Exception):
+    """Poster tidak bisa diambil atau bukan file gambar"""
+
+
+def check_scheme(url):
+    """Raise PosterFetchError jika URL bukan http/https"""
+    if urllib.parse.urlsplit(url).scheme.lower() not in FETCH_SCHEMES:
+        raise PosterFetchError(f"Skema URL poster tidak diizinkan: {url}")
+
+
+class UrlFetcher:
+    """Unduh poster dari URL aslinya (hanya http/https, termasuk setelah redirect)"""
+    def __init__(self, timeout=10.0):
+        self.timeout = timeout
+        self._opener = None
+
+    def _build_opener(self):
+        import urllib.request  # hanya di thread unduhan, tidak saat import app
+
+        class RedirectHandler(urllib.request.HTTPRedirectHandler):
+            def redirect_request(self, req, fp, code, msg, headers, newurl):
+                check_scheme(newurl)
+                return super().redirect_request(req, fp, code, msg, headers, newurl)
+
+        # Hanya handler http/https: tanpa FileHandler/FTPHandler/DataHandler
+        opener = urllib.request.OpenerDirector()
+        for handler in (urllib.request.HTTPHandler, urllib.request.HTTPSHandler, RedirectHandler,
+                        urllib.request.HTTPErrorProcessor, urllib.request.HTTPDefaultErrorHandler):
+            opener.add_handler(handler())
+        return opener
+
+    def __call__(self, url):
+        check_scheme(url)
+        if self._opener is None:
+            self._opener = self._build_opener()
+        import urllib.request
+        req = urllib.request.Request(url, headers={'User-Agent': 'AbsoluteCinematic/1.0'})
+        with self._opener.open(req, timeout=self.timeout) as resp:
+            data = resp.read(MAX_POSTER_BYTES + 1)
+        if len(data) > MAX_POSTER_BYTES:
+            raise PosterFetchError(f"Poster lebih dari {MAX_POSTER_BYTES} byte: {url}")
+        return data
+
+
+class LocalDirFetcher:
+    """Ambil poster dari direktori lokal menurut nama file di URL (offline/test)"""
+    def __init__(self, directory):
+        self.directory = directory
+
+    def __call__(self, url):
+        name = os.path.basename(urllib.parse.urlsplit(url).path)
+        path = os.path.join(self.directory, name)
+        if not name or not os.path.isfile(path):
+            raise PosterFetchError(f"Poster tidak ada di {self.directory}: {name}")
+        with open(path, 'rb') as f:
+            return f.read()
+
+
+def sniff_extension(data):
+    """Ekstensi file dari magic bytes (URL poster sering tanpa ekstensi yang benar)"""
+    if data.startswith(b'\xff\xd8\xff'):
+        return 'jpg'
+    if data.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'png'
+    if data[:6] in (b'GIF87a', b'GIF89a'):
+        return 'gif'
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return 'webp'
+    raise PosterFetchError("Isi poster bukan gambar JPEG/PNG/GIF/WebP")
+
+
+def original_name(digest, ext):
+    return f"{digest[:2]}/{digest}.{ext}"
+
+
+def thumbnail_name(digest, width):
+    return f"{digest[:2]}/{digest}-{width}.jpg"
+
+
+def _write_once(root, name, data):
+    """Tulis file content-addressed secara atomik (lewati jika sudah ada)"""
+    path = os.path.join(root, name)
+    if os.path.exists(path):
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _make_thumbnails(root, digest, data):
+    if Image is None:
+        return []
+    widths = []
+    with Image.open(io.BytesIO(data)) as img:
+        img.load()
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+        for width in POSTER_WIDTHS:
+            if width >= img.width:
+                break
+            height = max(1, round(img.height * width / img.width))
+            out = io.BytesIO()
+            img.resize((width, height), Image.LANCZOS).save(out, 'JPEG', quality=82, optimize=True, progressive=True)
+            _write_once(root, thumbnail_name(digest, width), out.getvalue())
+            widths.append(width)
+    return widths
+
+
+def store_poster(root, data):
+    """Simpan file asli + thumbnail, kembalikan (digest, ext, widths)"""
+    ext = sniff_extension(data)
+    digest = hashlib.sha256(data).hexdigest()
+    _write_once(root, original_name(digest, ext), data)
+    return digest, ext, _make_thumbnails(root, digest, data)
+
+
+def _save_status(conn, url, status, digest=None, ext=None, widths=(), error=None):
+    now = datetime.now().strftime("%Y-%m-%d %H:%M")
+    conn.execute(
+        """INSERT INTO poster_cache (source_url, status, digest, ext, widths, error, updated_at)
+           VALUES (?, ?, ?, ?, ?, ?, ?)
+           ON CONFLICT(source_url) DO UPDATE SET
+               status = excluded.status, digest = excluded.digest, ext = excluded.ext,
+               widths = excluded.widths, error = excluded.error, updated_at = excluded.updated_at""",
+        (url, status, digest, ext, ','.join(map(str, widths)), error, now)
+    )
+    conn.commit()
+
+
+def cache_poster(url):
+    """Unduh dan simpan satu poster (dipanggil di worker, dalam app context).
+
+    Poster yang sudah 'ready' dan filenya masih ada tidak diunduh ulang.
+    Kegagalan dicatat sebagai 'failed'; halaman tetap memakai URL asli.
+    """
+    root = current_app.config['POSTER_DIR']
+    conn = db.get_db_connection()
+    row = conn.execute("SELECT status, digest, ext FROM poster_cache WHERE source_url = ?", (url,)).fetchone()
+    if row and row['status'] == 'ready' and os.path.exists(os.path.join(root, original_name(row['digest'], row['ext']))):
+        return row['digest']
+    fetcher = current_app.config['POSTER_FETCHER'] or UrlFetcher()
+    try:
+        digest, ext, widths = store_poster(root, fetcher(url))
+    except Exception as e:
+        current_app.logger.warning('Gagal mengambil poster %s: %s', url, e)
+        _save_status(conn, url, 'failed', error=str(e)[:500])
+        return None
+    _save_status(conn, url, 'ready', digest, ext, widths)
+    return digest
+
+
+class PosterWorkerPool:
+    """Thread pool untuk mengunduh poster tanpa memblok request admin.
+
+    URL yang sedang antre tidak dijadwalkan dua kali. Executor dibuat ulang
+    setelah fork supaya setiap proses punya thread sendiri.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pid = None
+        self._pending = set()
+
+    def submit(self, flask_app, url):
+        key = (flask_app.config['DATABASE'], url)
+        with self._lock:
+            if key in self._pending:
+                return None
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ThreadPoolExecutor(
+                    max_workers=flask_app.config['POSTER_WORKERS'], thread_name_prefix='poster'
+                )
+                self._pid = os.getpid()
+                self._pending.clear()
+            self._pending.add(key)
+            return self._executor.submit(self._run, flask_app, url, key)
+
+    def _run(self, flask_app, url, key):
+        try:
+            with flask_app.app_context():
+                return cache_poster(url)
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+worker_pool = PosterWorkerPool()
+
+
+def schedule(url):
+    """Jadwalkan pengambilan poster di background (no-op jika dimatikan)"""
+    if not url or not current_app.config['POSTER_CACHE']:
+        return None
+    return worker_pool.submit(current_app._get_current_object(), url)
+
+
+def schedule_missing(retry_failed=False):
+    """Jadwalkan semua poster film yang belum punya salinan lokal.
+
+    Poster yang gagal baru dicoba lagi setelah POSTER_RETRY_INTERVAL detik sejak
+    percobaan terakhir (worker 0 memanggil ini di setiap start/reload), kecuali
+    `retry_failed` (aksi eksplisit, mis. dari script).
+    """
+    conn = db.get_db_connection()
+    retry_before = (datetime.now() - timedelta(seconds=current_app.config['POSTER_RETRY_INTERVAL'])
+                    ).strftime("%Y-%m-%d %H:%M")
+    rows = conn.execute(
+        """SELECT DISTINCT m.poster FROM movies m
+           LEFT JOIN poster_cache p ON p.source_url = m.poster
+           WHERE m.poster <> '' AND (p.status IS NULL OR p.status = 'pending'
+                 OR (p.status = 'failed' AND (? OR p.updated_at IS NULL OR p.updated_at <= ?)))""",
+        (retry_failed, retry_before)
+    ).fetchall()
+    return [f for f in (schedule(r['poster']) for r in rows) if f is not None]
+
+
+def _widths(movie):
+    return [int(w) for w in (movie.get('poster_widths') or '').split(',') if w]
+
+
+def poster_src(movie, width=max(POSTER_WIDTHS)):
+    """URL poster untuk <img src>: thumbnail lokal terkecil yang >= width,
+    file asli lokal, atau URL asli jika poster belum di-cache"""
+    digest = movie.get('poster_digest')
+    if not digest:
+        return movie.get('poster') or ''
+    widths = _widths(movie)
+    fits = [w for w in widths if w >= width]
+    if fits or widths:
+        name = thumbnail_name(digest, min(fits) if fits else max(widths))
+    else:
+        name = original_name(digest, movie['poster_ext'])
+    return url_for('poster_file', filename=name)
+
+
+def poster_srcset(movie):
+    """Atribut srcset dari bucket thumbnail (kosong jika belum ada)"""
+    digest = movie.get('poster_digest')
+    if not digest:
+        return ''
+    return ', '.join(
+        f"{url_for('poster_file', filename=thumbnail_name(digest, w))} {w}w" for w in _widths(movie)
+    )
+
+
+def serve_poster(filename):
+    """File poster lokal dengan header cache immutable"""
+    resp = send_from_directory(current_app.config['POSTER_DIR'], filename, max_age=IMMUTABLE_MAX_AGE)
+    resp.cache_control.public = True
+    resp.cache_control.immutable = True
+    return resp
+
+
+def init_app(app):
+    """Daftarkan cache poster ke aplikasi Flask"""
+    app.config.setdefault('POSTER_CACHE', True)
+    app.config.setdefault('POSTER_DIR', os.path.join(app.static_folder, 'posters'))
+    app.config.setdefault('POSTER_WORKERS', 2)
+    app.config.setdefault('POSTER_FETCHER', None)  # None = UrlFetcher()
+    app.config.setdefault('POSTER_RETRY_INTERVAL', 6 * 3600)  # detik, sebelum URL gagal dicoba lagi
+    app.add_url_rule('/posters/<path:filename>', 'poster_file', serve_poster)
+    app.add_template_global(poster_src)
+    app.add_template_global(poster_srcset)
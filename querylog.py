@@ -0,0 +1,184 @@
+# Mode diagnostik database: setiap statement yang dijalankan lewat koneksi
+# dari db.connect() diukur (waktu execute + fetch, jumlah instruksi VM SQLite
+# lewat progress handler), dinormalisasi menjadi fingerprint, dan ditulis ke
+# log JSON Lines. Statement yang melewati DB_SLOW_QUERY_MS juga dicatat ke
+# logger beserta EXPLAIN QUERY PLAN-nya. Ringkasan: scripts/query_report.py.
+#
+# Aktifkan dengan environment variable DB_DIAGNOSTICS=1 (mahal; jangan
+# dinyalakan terus di produksi).
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+
+from flask import has_request_context, request
+
+import db
+
+logger = logging.getLogger('querylog')
+
+PROGRESS_STEP = 100  # progress handler dipanggil setiap N instruksi VM
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_SPACE = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    """Bentuk normal statement: literal jadi ?, daftar IN (?, ?, ...) jadi (?+)"""
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _IN_LIST.sub('(?+)', sql)
+    return _SPACE.sub(' ', sql).strip().lower()
+
+
+class QueryLog:
+    """Tujuan rekaman statement: file JSON Lines + logger untuk query lambat"""
+    def __init__(self, path=None, slow_ms=50.0):
+        self.path = path
+        self.slow_ms = slow_ms
+        self._lock = threading.Lock()
+        self._file = open(path, 'a', encoding='utf-8') if path else None
+
+    def record(self, conn, sql, params, elapsed, ops, rows):
+        ms = elapsed * 1000
+        entry = {
+            'ts': round(time.time(), 3),
+            'fp': fingerprint(sql),
+            'ms': round(ms, 3),
+            'ops': ops,
+            'rows': rows,
+            'endpoint': request.endpoint if has_request_context() else None,
+        }
+        if ms >= self.slow_ms:
+            # conn None: direkam dari finalizer cursor, plan tidak diambil
+            entry['plan'] = explain(conn, sql, params) if conn is not None else None
+            logger.warning('Query lambat %.1f ms (%s ops): %s | plan: %s',
+                           ms, ops, entry['fp'], '; '.join(entry['plan'] or []))
+        if self._file is not None:
+            line = json.dumps(entry, ensure_ascii=False)
+            with self._lock:
+                self._file.write(line + '\n')
+                self._file.flush()
+
+
+def explain(conn, sql, params):
+    """EXPLAIN QUERY PLAN untuk statement (None jika bukan query yang bisa di-explain)"""
+    if not sql.lstrip().lower().startswith(('select', 'with', 'update', 'delete', 'insert')):
+        return None
+    try:
+        cur = conn.cursor(sqlite3.Cursor)
+        return [row[-1] for row in cur.execute('EXPLAIN QUERY PLAN ' + sql, params or ())]
+    except sqlite3.Error:
+        return None
+
+
+class TracedCursor(sqlite3.Cursor):
+    """Cursor yang mengukur execute dan fetch untuk statement terakhirnya"""
+    _pending = None
+
+    def _start(self, sql, params, started, ops):
+        self._finish()
+        self._pending = [sql, params, time.perf_counter() - started, self.connection.vm_ops - ops, 0]
+
+    def _finish(self, with_plan=True):
+        pending, self._pending = self._pending, None
+        if pending is not None and self.connection.query_log is not None:
+            sql, params, elapsed, ops, rows = pending
+            self.connection.query_log.record(
+                self.connection if with_plan else None, sql, params, elapsed, ops * PROGRESS_STEP, rows)
+
+    def _timed(self, fetch, *args):
+        started, ops = time.perf_counter(), self.connection.vm_ops
+        result = fetch(*args)
+        if self._pending is not None:
+            self._pending[2] += time.perf_counter() - started
+            self._pending[3] += self.connection.vm_ops - ops
+        return result
+
+    def execute(self, sql, parameters=()):
+        started, ops = time.perf_counter(), self.connection.vm_ops
+        super().execute(sql, parameters)
+        self._start(sql, parameters, started, ops)
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        started, ops = time.perf_counter(), self.connection.vm_ops
+        super().executemany(sql, seq_of_parameters)
+        self._start(sql, None, started, ops)
+        return self
+
+    def fetchone(self):
+        row = self._timed(super().fetchone)
+        if row is None:
+            self._finish()
+        elif self._pending is not None:
+            self._pending[4] += 1
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._timed(super().fetchmany, size if size is not None else self.arraysize)
+        if self._pending is not None:
+            self._pending[4] += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(super().fetchall)
+        if self._pending is not None:
+            self._pending[4] += len(rows)
+        self._finish()
+        return rows
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        row = self.fetchone()
+        if row is None:
+            raise StopIteration
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        # Tanpa EXPLAIN: menjalankan SQL dari finalizer tidak aman
+        self._finish(with_plan=False)
+
+
+class TracedConnection(sqlite3.Connection):
+    """Koneksi yang memakai TracedCursor dan menghitung instruksi VM"""
+    query_log = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.vm_ops = 0
+        self.set_progress_handler(self._tick, PROGRESS_STEP)
+
+    def _tick(self):
+        self.vm_ops += 1
+        return 0
+
+    def cursor(self, factory=TracedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def init_app(app):
+    """Aktifkan mode diagnostik jika DB_DIAGNOSTICS diset (sebelum koneksi pertama dibuat)"""
+    app.config.setdefault('DB_DIAGNOSTICS', False)
+    app.config.setdefault('DB_SLOW_QUERY_MS', 50.0)
+    app.config.setdefault('DB_QUERY_LOG', 'querylog.jsonl')
+    if not app.config['DB_DIAGNOSTICS']:
+        return
+    TracedConnection.query_log = QueryLog(app.config['DB_QUERY_LOG'], app.config['DB_SLOW_QUERY_MS'])
+    db.connection_factory = TracedConnection
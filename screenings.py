@@ -0,0 +1,166 @@
+# Jadwal tayang: movies.showtimes tetap menjadi pola harian yang diisi admin
+# ("10:00 AM, 07:00 PM"), sedangkan pemutaran yang bisa dipesan adalah baris
+# tabel `screenings` (waktu mulai, studio, kapasitas) yang dibentuk dari pola
+# itu untuk SCREENING_DAYS_AHEAD hari ke depan. Order, kursi, hold dan rollup
+# merujuk screening_id, jadi ketersediaan dan daftar jadwal adalah range scan
+# ber-index, bukan pencocokan teks.
+import threading
+from datetime import datetime, timedelta
+
+import db
+
+DEFAULT_HALL = 'Studio 1'
+DEFAULT_CAPACITY = 280  # denah default auditoriums.DEFAULT_LAYOUT (14 baris x 20 kursi)
+STARTS_AT_FORMAT = '%Y-%m-%d %H:%M'
+DAYS_AHEAD = 7  # default SCREENING_DAYS_AHEAD
+
+
+def to_clock(label):
+    """'07:00 PM' / '19:00' -> '19:00' (None jika tidak dikenali)"""
+    for fmt in ('%I:%M %p', '%H:%M', '%I %p'):
+        try:
+            return datetime.strptime(label.strip().upper(), fmt).strftime('%H:%M')
+        except ValueError:
+            continue
+    return None
+
+
+def parse_pattern(showtimes):
+    """Pola harian "10:00 AM, 07:00 PM" -> ['10:00', '19:00'] (terurut, tanpa duplikat).
+
+    Raise ValueError untuk jam yang tidak dikenali."""
+    clocks = set()
+    for label in (showtimes or '').split(','):
+        if not label.strip():
+            continue
+        clock = to_clock(label)
+        if clock is None:
+            raise ValueError(f"Jam tayang tidak dikenali: {label.strip()!r}")
+        clocks.add(clock)
+    return sorted(clocks)
+
+
+def label(starts_at, hall=None):
+    """Teks jadwal untuk tampilan dan kolom orders.showtime"""
+    text = datetime.fromisoformat(starts_at).strftime('%a, %d %b %Y %I:%M %p')
+    return f"{text} · {hall}" if hall else text
+
+
+def _horizon(now, days):
+    start = now.strftime(STARTS_AT_FORMAT)
+    end = (now + timedelta(days=days)).strftime('%Y-%m-%d 23:59')
+    return start, end
+
+
+def hall_capacity(conn, hall):
+    """Kapasitas studio dari denahnya (tabel auditoriums), DEFAULT_CAPACITY jika tidak terdaftar"""
+    row = conn.execute("SELECT capacity FROM auditoriums WHERE name = ?", (hall,)).fetchone()
+    return row[0] if row else DEFAULT_CAPACITY
+
+
+def materialize(conn, movies, days, now=None, hall=DEFAULT_HALL, capacity=None):
+    """Bentuk pemutaran `days` hari ke depan dari pola tiap film.
+
+    `movies` berisi pasangan (movie_id, showtimes). Pemutaran yang sudah ada
+    dibiarkan; pemutaran mendatang yang tidak lagi ada di pola dihapus selama
+    belum ada kursi terjual atau ditahan. Pola yang tidak valid dilewati.
+    Kapasitas default diambil dari denah studio `hall`.
+    Dipanggil di dalam transaksi milik pemanggil; kembalikan jumlah baris baru.
+    """
+    now = now or datetime.now()
+    if capacity is None:
+        capacity = hall_capacity(conn, hall)
+    start, _ = _horizon(now, days)
+    rows, created = [], 0
+    for movie_id, showtimes in movies:
+        try:
+            clocks = parse_pattern(showtimes)
+        except ValueError:
+            continue
+        for offset in range(days + 1):
+            day = (now + timedelta(days=offset)).strftime('%Y-%m-%d')
+            rows.extend((movie_id, f"{day} {clock}", hall, capacity) for clock in clocks
+                        if f"{day} {clock}" > start)
+        placeholders = ', '.join('?' for _ in clocks)
+        conn.execute(
+            f"""DELETE FROM screenings
+                WHERE movie_id = ? AND starts_at > ? AND substr(starts_at, 12) NOT IN ({placeholders})
+                  AND NOT EXISTS (SELECT 1 FROM order_seats o WHERE o.screening_id = screenings.id)
+                  AND NOT EXISTS (SELECT 1 FROM seat_holds h WHERE h.screening_id = screenings.id)""",
+            (movie_id, start, *clocks)
+        )
+    if rows:
+        before = conn.total_changes
+        conn.executemany(
+            "INSERT OR IGNORE INTO screenings (movie_id, starts_at, hall, capacity) VALUES (?, ?, ?, ?)", rows
+        )
+        created = conn.total_changes - before
+    return created
+
+
+def cancel_upcoming(conn, movie_id, now=None):
+    """Hapus pemutaran mendatang film yang belum punya kursi terjual/ditahan"""
+    materialize(conn, [(movie_id, '')], 0, now)
+
+
+def upcoming(conn, movie_id, days, now=None):
+    """Pemutaran film yang belum mulai dalam `days` hari ke depan (range scan
+    di UNIQUE (movie_id, starts_at, hall)), plus jumlah kursi terjual dari rollup
+    dan versi denah studionya (None jika studio tidak punya denah)"""
+    start, end = _horizon(now or datetime.now(), days)
+    return [dict(r) for r in conn.execute(
+        """SELECT s.id, s.movie_id, s.starts_at, s.hall, s.capacity, COALESCE(r.seats, 0) AS sold,
+                  a.version AS layout_version
+           FROM screenings s
+           LEFT JOIN sales_by_screening r ON r.screening_id = s.id
+           LEFT JOIN auditoriums a ON a.name = s.hall
+           WHERE s.movie_id = ? AND s.starts_at >= ? AND s.starts_at <= ?
+           ORDER BY s.starts_at, s.hall""",
+        (movie_id, start, end)
+    )]
+
+
+def is_upcoming(conn, movie_id, screening_id, now=None):
+    """True jika pemutaran `screening_id` milik film ini dan belum mulai (lookup primary key)"""
+    row = conn.execute("SELECT 1 FROM screenings WHERE id = ? AND movie_id = ? AND starts_at >= ?",
+                       (screening_id, movie_id, (now or datetime.now()).strftime(STARTS_AT_FORMAT))).fetchone()
+    return row is not None
+
+
+def between(conn, start, end):
+    """Semua pemutaran dengan waktu mulai di [start, end) (idx_screenings_starts)"""
+    return [dict(r) for r in conn.execute(
+        """SELECT s.id, s.movie_id, m.title, s.starts_at, s.hall, s.capacity,
+                  COALESCE(r.orders, 0) AS orders, COALESCE(r.seats, 0) AS sold, COALESCE(r.revenue, 0) AS revenue
+           FROM screenings s
+           LEFT JOIN movies m ON m.id = s.movie_id
+           LEFT JOIN sales_by_screening r ON r.screening_id = s.id
+           WHERE s.starts_at >= ? AND s.starts_at < ?
+           ORDER BY s.starts_at, s.hall""",
+        (start.strftime(STARTS_AT_FORMAT), end.strftime(STARTS_AT_FORMAT))
+    )]
+
+
+class ScheduleKeeper:
+    """Perpanjang jadwal semua film sekali per hari per proses (per file database)"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._done = {}  # path database -> tanggal terakhir dibentuk
+
+    def ensure(self, conn, path, days):
+        today = datetime.now().strftime('%Y-%m-%d')
+        if self._done.get(path) == today:
+            return
+        with self._lock:
+            if self._done.get(path) == today:
+                return
+            with db.immediate_transaction(conn):
+                materialize(conn, conn.execute("SELECT id, showtimes FROM movies").fetchall(), days)
+            self._done[path] = today
+
+
+keeper = ScheduleKeeper()
+
+
+def init_app(app):
+    app.config.setdefault('SCREENING_DAYS_AHEAD', DAYS_AHEAD)
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Kelola denah studio (tabel auditoriums, lihat auditoriums.py).
+
+Usage (PowerShell):
+    python scripts\\auditorium.py --list
+    python scripts\\auditorium.py --show "Studio 1"
+    python scripts\\auditorium.py --set "Studio 2" denah_studio2.txt
+
+File denah berisi satu baris teks per baris kursi: R = Regular, V = VIP,
+W = kursi roda (harga Regular), _ = lorong, . = celah, baris kosong = lorong
+melintang. Pemutaran mendatang di studio itu ikut memakai kapasitas baru.
+Server yang sedang berjalan memuat denah baru pada request berikutnya (versi
+denah dinaikkan trigger).
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import auditoriums  # noqa: E402
+import db  # noqa: E402
+import migrations  # noqa: E402
+
+
+def show(layout):
+    tiers = ', '.join(f"{tier} {n}" for tier, n in sorted(layout.capacity_by_tier.items()))
+    print(f"{layout.name} (versi {layout.version}): {layout.capacity} kursi ({tiers})")
+    print(f"  run-length: {layout.encoded}")
+    for cells in layout.rows:
+        print(f"  {cells}")
+
+
+def orphaned_sales(conn, name, layout):
+    """Kursi terjual/ditahan di pemutaran mendatang yang tidak ada di denah baru"""
+    rows = conn.execute(
+        """SELECT DISTINCT o.seat FROM order_seats o JOIN screenings s ON s.id = o.screening_id
+           WHERE s.hall = ? AND s.starts_at > strftime('%Y-%m-%d %H:%M', 'now', 'localtime')
+           UNION
+           SELECT DISTINCT h.seat FROM seat_holds h JOIN screenings s ON s.id = h.screening_id
+           WHERE s.hall = ? AND s.starts_at > strftime('%Y-%m-%d %H:%M', 'now', 'localtime')""",
+        (name, name)
+    ).fetchall()
+    return sorted(r[0] for r in rows if r[0] not in layout.seats)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--db', default=db.DB_PATH)
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument('--list', action='store_true')
+    group.add_argument('--show', metavar='STUDIO')
+    group.add_argument('--set', nargs=2, metavar=('STUDIO', 'FILE'))
+    parser.add_argument('--force', action='store_true', help='simpan walau ada kursi terjual yang hilang dari denah')
+    args = parser.parse_args()
+
+    conn = db.connect(args.db)
+    migrations.migrate(conn)
+    if args.list:
+        for r in conn.execute("SELECT name, capacity, version FROM auditoriums ORDER BY name"):
+            print(f"{r['name']:<24} {r['capacity']:>5} kursi  versi {r['version']}")
+    elif args.show:
+        row = conn.execute("SELECT version FROM auditoriums WHERE name = ?", (args.show,)).fetchone()
+        if row is None:
+            sys.exit(f"Studio {args.show!r} tidak terdaftar (pemutaran di studio ini memakai denah default)")
+        show(auditoriums.cache.get(conn, args.db, args.show, row['version']))
+    else:
+        name, path = args.set
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+        try:
+            with db.immediate_transaction(conn):
+                layout = auditoriums.save(conn, name, text)
+                orphaned = orphaned_sales(conn, name, layout)
+                if orphaned and not args.force:
+                    raise ValueError(f"kursi {', '.join(orphaned[:20])} sudah terjual/ditahan di pemutaran "
+                                     f"mendatang tetapi tidak ada di denah baru (pakai --force)")
+        except ValueError as e:
+            sys.exit(f"Denah tidak disimpan: {e}")
+        version = conn.execute("SELECT version FROM auditoriums WHERE name = ?", (name,)).fetchone()[0]
+        show(auditoriums.cache.get(conn, args.db, name, version))
+    conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Benchmark mode sync (WSGI, thread per koneksi) vs mode async (asgi.py) untuk
+route baca: /, /book/<id>, /api/movies/<id>/availability dan /profile.
+
+Usage (PowerShell):
+    python scripts\\bench_async.py --clients 500 --duration 15
+    python scripts\\bench_async.py --clients 1000 --modes async
+
+Setiap mode menjalankan server di proses terpisah di atas database sementara
+yang sama (di-seed seperti scripts/loadtest.py). Klien asyncio menjalankan
+--clients klien bersamaan, masing-masing mengirim request berurutan selama
+--duration detik (setelah --warmup) lewat koneksi keep-alive; server
+werkzeug selalu menutup koneksi, jadi di mode sync klien menyambung ulang per
+request. Mode async dijalankan dengan uvicorn (pip install uvicorn).
+Dilaporkan throughput, latensi p50/p95/p99/maks per mode dan per route,
+jumlah error, serta jumlah thread dan memori puncak proses server.
+"""
+import argparse
+import asyncio
+import http.cookiejar
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from loadtest import load_movies, percentile, seed  # noqa: E402
+
+# route -> bobot campuran request
+MIX = (('home', 4), ('book', 3), ('availability', 2), ('profile', 1))
+USER = {'name': 'Bench Async', 'email': 'seed@example.com', 'password': 'bench-async-123'}
+
+
+def serve(mode, path, port, backlog, seat_feed_max=None):
+    """Proses server: 'sync' = werkzeug threaded (thread per koneksi), 'async' = asgi.py di uvicorn"""
+    import app as cinema
+    cinema.app.config['DATABASE'] = path
+    if seat_feed_max:
+        cinema.app.config['SEAT_FEED_MAX_SUBSCRIBERS'] = seat_feed_max
+    if mode == 'sync':
+        from werkzeug.serving import ThreadedWSGIServer, WSGIRequestHandler, make_server
+        WSGIRequestHandler.log_request = lambda *args, **kwargs: None
+        ThreadedWSGIServer.request_queue_size = backlog
+        make_server('127.0.0.1', port, cinema.app, threaded=True).serve_forever()
+    else:
+        import uvicorn
+
+        import asgi
+        uvicorn.run(asgi.application, host='127.0.0.1', port=port, backlog=backlog,
+                    lifespan='on', log_level='warning')
+
+
+def check_modes(modes):
+    """Daftar mode dari --modes; keluar jika mode async diminta tanpa uvicorn"""
+    modes = [mode.strip() for mode in modes.split(',')]
+    if 'async' in modes:
+        try:
+            import uvicorn  # noqa: F401
+        except ImportError:
+            sys.exit("Mode async butuh uvicorn: pip install uvicorn (atau --modes sync)")
+    return modes
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_ready(port, proc, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            sys.exit(f"Server berhenti (exit {proc.returncode})")
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    sys.exit("Server tidak siap dalam waktu yang ditentukan")
+
+
+def login(base):
+    """Register (jika perlu) + login; kembalikan header Cookie session"""
+    jar = http.cookiejar.CookieJar()
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(jar))
+    register = dict(USER, confirm_password=USER['password'])
+    opener.open(base + '/register', urllib.parse.urlencode(register).encode()).read()
+    opener.open(base + '/login', urllib.parse.urlencode(
+        {'email': USER['email'], 'password': USER['password']}).encode()).read()
+    return '; '.join(f"{c.name}={c.value}" for c in jar)
+
+
+class ServerStats(threading.Thread):
+    """Sampling jumlah thread dan RSS proses server dari /proc (Linux)"""
+    def __init__(self, pid):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.threads = 0
+        self.rss_kb = 0
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(0.2):
+            try:
+                with open(f'/proc/{self.pid}/status') as f:
+                    for line in f:
+                        if line.startswith('Threads:'):
+                            self.threads = max(self.threads, int(line.split()[1]))
+                        elif line.startswith('VmHWM:'):
+                            self.rss_kb = int(line.split()[1])
+            except OSError:
+                return
+
+
+async def fetch(reader, writer, target, cookie):
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: 127.0.0.1\r\nCookie: {cookie}\r\n\r\n".encode('latin-1'))
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split(' ')[1])
+    length, keep_alive = 0, lines[0].startswith('HTTP/1.1')
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        name = name.strip().lower()
+        if name == 'content-length':
+            length = int(value)
+        elif name == 'connection':
+            keep_alive = value.strip().lower() != 'close'
+    if length:
+        await reader.readexactly(length)
+    return status, keep_alive
+
+
+async def client(n, port, cookie, movies, start_at, warmup_end, end_at, results):
+    rng = random.Random(n)
+    routes = [route for route, weight in MIX for _ in range(weight)]
+    await asyncio.sleep(max(0.0, start_at - time.monotonic()))
+    reader = writer = None
+    while time.monotonic() < end_at:
+        route = rng.choice(routes)
+        movie_id = rng.choice(movies)
+        target = {'home': '/', 'book': f'/book/{movie_id}', 'profile': '/profile',
+                  'availability': f'/api/movies/{movie_id}/availability'}[route]
+        started = time.monotonic()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            status, keep_alive = await asyncio.wait_for(fetch(reader, writer, target, cookie), 30)
+            ok = status < 500
+            if not keep_alive:
+                writer.close()
+                reader = writer = None
+        except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError):
+            ok = False
+            if writer is not None:
+                writer.close()
+            reader = writer = None
+        if started >= warmup_end:
+            results.append((route, time.monotonic() - started, ok))
+    if writer is not None:
+        writer.close()
+
+
+async def drive(port, cookie, movies, clients, warmup, duration):
+    results = []
+    start_at = time.monotonic() + 0.5
+    warmup_end = start_at + warmup
+    end_at = warmup_end + duration
+    await asyncio.gather(*(client(n, port, cookie, movies, start_at + n * 0.001, warmup_end, end_at, results)
+                           for n in range(clients)))
+    return results
+
+
+def run_mode(mode, path, args, movies):
+    port = free_port()
+    with open(args.server_log, 'a') as log:
+        # Session sendiri: worker hashing password milik server ikut dihentikan
+        proc = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--serve', mode, '--db', path,
+                                 '--port', str(port), '--backlog', str(args.backlog)],
+                                stdout=log, stderr=log, start_new_session=True)
+    try:
+        wait_ready(port, proc)
+        cookie = login(f'http://127.0.0.1:{port}')
+        stats = ServerStats(proc.pid)
+        stats.start()
+        results = asyncio.run(drive(port, cookie, movies, args.clients, args.warmup, args.duration))
+        stats.stopped.set()
+    finally:
+        os.killpg(proc.pid, signal.SIGTERM)
+        proc.wait()
+    return results, stats
+
+
+def report(mode, results, stats, duration):
+    ok = sorted(t for _, t, good in results if good)
+    errors = sum(1 for _, _, good in results if not good)
+    print(f"\n== {mode}: {len(ok) / duration:.0f} req/s, {len(ok)} ok, {errors} error | "
+          f"p50={percentile(ok, 50) * 1000:.0f}  p95={percentile(ok, 95) * 1000:.0f}  "
+          f"p99={percentile(ok, 99) * 1000:.0f}  max={(ok[-1] if ok else 0) * 1000:.0f} ms | "
+          f"thread server puncak={stats.threads}, RSS puncak={stats.rss_kb / 1024:.0f} MB")
+    by_route = defaultdict(list)
+    for route, t, good in results:
+        if good:
+            by_route[route].append(t)
+    for route, _ in MIX:
+        times = sorted(by_route[route])
+        print(f"   {route:<13} n={len(times):<7} p50={percentile(times, 50) * 1000:7.1f}  "
+              f"p99={percentile(times, 99) * 1000:7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, default=500)
+    parser.add_argument('--duration', type=float, default=15.0)
+    parser.add_argument('--warmup', type=float, default=3.0)
+    parser.add_argument('--modes', default='sync,async')
+    parser.add_argument('--movies', type=int, default=200)
+    parser.add_argument('--orders', type=int, default=2000)
+    parser.add_argument('--backlog', type=int, default=1024, help='listen backlog kedua server')
+    parser.add_argument('--server-log', default=os.devnull, help='file untuk output server')
+    parser.add_argument('--serve', choices=('sync', 'async'), help=argparse.SUPPRESS)
+    parser.add_argument('--db', help=argparse.SUPPRESS)
+    parser.add_argument('--port', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--seat-feed-max', type=int, help=argparse.SUPPRESS)  # scripts/bench_sse.py
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.db, args.port, args.backlog, args.seat_feed_max)
+        return
+
+    modes = check_modes(args.modes)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        seed(path, args.movies, args.orders)
+        movies = [movie_id for movie_id, _ in load_movies(path, 50)]
+        print(f"{args.clients} klien, {args.duration:.0f} s per mode "
+              f"(warmup {args.warmup:.0f} s), {args.movies} film, {args.orders} order")
+        for mode in modes:
+            results, stats = run_mode(mode, path, args, movies)
+            report(mode, results, stats, args.duration)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark alur booking (home -> book GET -> book POST -> finish) dengan
+koneksi lama (satu koneksi per helper, rollback journal) dibandingkan
+koneksi per request dari pool (WAL + pragma tuning).
+
+Usage (PowerShell):
+    python scripts\\bench_db.py --threads 8 --iterations 200
+
+Database dibuat di folder sementara, database.db asli tidak disentuh.
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app as cinema  # noqa: E402
+import auditoriums  # noqa: E402
+
+# (kursi, tipe tiket) dari denah default: tipe tiket = tier kursi
+SEATS = tuple(auditoriums.default_layout().seats.items())
+
+
+def prepare(path, pooled):
+    """Siapkan database baru dan konfigurasi app untuk satu mode"""
+    app = cinema.app
+    app.config.update(TESTING=True, DATABASE=path, DB_POOL=pooled, DB_WAL=pooled, POSTER_CACHE=False)
+    if not pooled:
+        conn = sqlite3.connect(path)
+        conn.execute("PRAGMA journal_mode = DELETE")
+        conn.close()
+    with app.app_context():
+        cinema.init_db()
+        cinema.initialize_default_movies()
+        return [(m['id'], [s['id'] for s in cinema.get_movie_screenings(m['id'])]) for m in cinema.get_all_movies()]
+
+
+def login(client, n):
+    email = f'bench{n}@example.com'
+    client.post('/register', data={'name': f'Bench {n}', 'email': email, 'password': 'bench'})
+    client.post('/login', data={'email': email, 'password': 'bench'})
+
+
+def worker(n, iterations, movies, counter, lock, errors, ready):
+    client = cinema.app.test_client()
+    login(client, n)
+    ready.wait()
+    for _ in range(iterations):
+        with lock:
+            i = counter[0]
+            counter[0] += 1
+        movie_id, screening_ids = movies[i % len(movies)]
+        slot = i // len(movies)
+        screening_id = screening_ids[slot % len(screening_ids)]
+        seat, ticket_type = SEATS[(slot // len(screening_ids)) % len(SEATS)]
+        responses = (
+            client.get('/'),
+            client.get(f'/book/{movie_id}'),
+            client.post(f'/book/{movie_id}', data={
+                'name': 'Bench', 'email': 'bench@example.com', 'seat': seat,
+                'ticket_type': ticket_type, 'screening_id': screening_id,
+            }),
+            client.post('/finish', data={'payment_method': 'cash'}),
+        )
+        if any(r.status_code >= 500 for r in responses):
+            errors.append(i)
+
+
+def run(mode, threads, iterations):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        movies = prepare(path, pooled=(mode == 'pooled'))
+        counter, lock, errors = [0], threading.Lock(), []
+        ready = threading.Barrier(threads + 1)
+        pool = [threading.Thread(target=worker, args=(n, iterations, movies, counter, lock, errors, ready))
+                for n in range(threads)]
+        for t in pool:
+            t.start()
+        # Login (hash password) tidak ikut diukur: mulai timer setelah semua thread siap
+        ready.wait()
+        start = time.perf_counter()
+        for t in pool:
+            t.join()
+        elapsed = time.perf_counter() - start
+        cinema.db.get_pool(path).close_all()
+    requests_total = threads * iterations * 4
+    return requests_total / elapsed, elapsed, len(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--iterations', type=int, default=100, help='alur booking per thread')
+    args = parser.parse_args()
+
+    results = {}
+    for mode in ('legacy', 'pooled'):
+        rps, elapsed, errors = run(mode, args.threads, args.iterations)
+        results[mode] = rps
+        print(f"{mode:>7}: {rps:8.1f} req/s  ({elapsed:.2f}s, {errors} alur gagal)")
+    print(f"speedup: {results['pooled'] / results['legacy']:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
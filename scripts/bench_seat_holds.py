@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark kontensi seat hold: N thread berebut kursi yang sama untuk satu
+jadwal tayang. Setiap percobaan menahan 1-3 kursi acak dari sekumpulan
+kursi "favorit" lalu menyelesaikan order (atau membatalkan hold).
+
+Usage (PowerShell):
+    python scripts\\bench_seat_holds.py --threads 16 --hot-seats 40
+
+Melaporkan throughput percobaan hold, conflict rate, dan memverifikasi
+tidak ada kursi yang terjual dua kali. Database dibuat di folder sementara.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app as cinema  # noqa: E402
+
+TICKET_TYPE = 'Regular'
+
+
+def worker(movie_id, screening_id, hot_seats, attempts, checkout_ratio, stats, lock, ready):
+    rng = random.Random()
+    held = conflicts = sold = 0
+    ready.wait()
+    for _ in range(attempts):
+        seats = rng.sample(hot_seats, rng.randint(1, 3))
+        token = uuid.uuid4().hex
+        with cinema.app.app_context():
+            unavailable = cinema.hold_seats(screening_id, TICKET_TYPE, seats, token)
+            if unavailable:
+                conflicts += 1
+                continue
+            held += 1
+            if rng.random() < checkout_ratio:
+                order = {
+                    'movie_id': movie_id, 'screening_id': screening_id, 'movie_title': 'Bench',
+                    'seat': ', '.join(seats), 'ticket_type': TICKET_TYPE, 'price': 0,
+                    'customer': 'Bench', 'email': 'bench@example.com',
+                }
+                if cinema.save_order_db(order, token) is not None:
+                    sold += 1
+            else:
+                cinema.release_seat_holds(token)
+    with lock:
+        stats['held'] += held
+        stats['conflicts'] += conflicts
+        stats['sold'] += sold
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--attempts', type=int, default=100, help='percobaan hold per thread')
+    parser.add_argument('--hot-seats', type=int, default=40, help='jumlah kursi yang diperebutkan')
+    parser.add_argument('--checkout-ratio', type=float, default=0.3, help='peluang hold diteruskan ke order')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        cinema.app.config.update(DATABASE=path, DB_POOL_SIZE=args.threads, POSTER_CACHE=False)
+        with cinema.app.app_context():
+            cinema.init_db()
+            cinema.initialize_default_movies()
+            movie_id = cinema.get_all_movies()[0]['id']
+            screening_id = cinema.get_movie_screenings(movie_id)[0]['id']
+        hot_seats = cinema.generate_seats()[:args.hot_seats]
+
+        stats, lock = {'held': 0, 'conflicts': 0, 'sold': 0}, threading.Lock()
+        ready = threading.Barrier(args.threads + 1)
+        threads = [threading.Thread(target=worker,
+                                    args=(movie_id, screening_id, hot_seats, args.attempts, args.checkout_ratio, stats, lock, ready))
+                   for _ in range(args.threads)]
+        for t in threads:
+            t.start()
+        ready.wait()
+        start = time.perf_counter()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+
+        with cinema.app.app_context():
+            conn = cinema.get_db_connection()
+            order_seats = conn.execute("SELECT COUNT(*) FROM order_seats").fetchone()[0]
+            seats_in_orders = sum(len(cinema.split_seats(r['seat'])) for r in conn.execute("SELECT seat FROM orders"))
+        cinema.db.get_pool(path).close_all()
+
+    total = args.threads * args.attempts
+    print(f"threads        : {args.threads}")
+    print(f"attempts       : {total} ({total / elapsed:.1f} hold/s, {elapsed:.2f}s)")
+    print(f"held           : {stats['held']}")
+    print(f"conflict rate  : {stats['conflicts'] / total:.1%}")
+    print(f"orders sold    : {stats['sold']} ({order_seats} kursi)")
+    print(f"oversold seats : {seats_in_orders - order_seats}")
+
+
+if __name__ == '__main__':
+    main()
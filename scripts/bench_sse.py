@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Benchmark feed kursi SSE: berapa pelanggan idle yang bisa dipegang satu worker.
+
+Usage (PowerShell):
+    python scripts\\bench_sse.py
+    python scripts\\bench_sse.py --levels 1000,5000,10000 --modes async --rounds 10
+
+Setiap mode menjalankan satu proses server (seperti scripts/bench_async.py:
+'sync' = werkzeug threaded, satu thread per stream; 'async' = asgi.py di uvicorn) di
+atas database sementara. Klien asyncio membuka stream
+/api/movies/<id>/screenings/<id>/seats bertahap sampai setiap angka di
+--levels, semuanya ke pemutaran yang sama (film laris, fan-out terburuk).
+Di setiap level dilaporkan:
+  - RSS dan jumlah thread proses server, plus KB per pelanggan di atas baseline,
+  - latensi fan-out: POST /book (hold kursi baru) sampai delta diterima semua
+    pelanggan (p50/p99/maks antar pelanggan, median antar --rounds),
+  - latensi satu request biasa (availability) selagi semua stream terbuka.
+Klien dan server berbagi CPU mesin ini, jadi angka latensi adalah batas atas.
+"""
+import argparse
+import asyncio
+import os
+import resource
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.parse
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_async import check_modes, free_port, login, wait_ready  # noqa: E402
+from loadtest import load_movies, percentile, seed  # noqa: E402
+
+EVENT = b'event: seats'
+OPEN_BATCH = 200  # stream yang dibuka bersamaan (di bawah listen backlog)
+
+
+def proc_status(pid):
+    """(RSS KB, jumlah thread) proses dari /proc (Linux)"""
+    rss = threads = 0
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                rss = int(line.split()[1])
+            elif line.startswith('Threads:'):
+                threads = int(line.split()[1])
+    return rss, threads
+
+
+class Subscriber:
+    """Satu stream SSE; mencatat waktu tiba setiap event delta"""
+    def __init__(self, offset):
+        self.deliveries = []
+        self.offset = offset  # jumlah hold sebelum stream ini dibuka
+        self.writer = None
+
+    def received(self, round_number):
+        return len(self.deliveries) >= round_number - self.offset
+
+    async def open(self, port, target, cookie):
+        reader, self.writer = await asyncio.open_connection('127.0.0.1', port)
+        self.writer.write(f"GET {target} HTTP/1.1\r\nHost: 127.0.0.1\r\nCookie: {cookie}\r\n\r\n".encode('latin-1'))
+        head = await reader.readuntil(b'\r\n\r\n')
+        status = int(head.split(b' ', 2)[1])
+        if status != 200:
+            raise RuntimeError(f"stream ditolak: HTTP {status}")
+        buf = b''
+        while b'event: snapshot' not in buf:
+            data = await reader.read(65536)
+            if not data:
+                raise RuntimeError("stream ditutup sebelum snapshot")
+            buf += data
+        return reader
+
+    async def listen(self, reader):
+        tail = b''
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                return
+            buf = tail + data
+            now = time.monotonic()
+            self.deliveries.extend([now] * buf.count(EVENT))
+            tail = buf[-(len(EVENT) - 1):]
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def post_hold(base, cookie, movie_id, screening_id, seat):
+    """Hold kursi lewat form pemesanan (satu token per session: hold lama dilepas)"""
+    body = urllib.parse.urlencode({'seat': seat, 'ticket_type': 'Regular', 'screening_id': screening_id}).encode()
+    req = urllib.request.Request(f'{base}/book/{movie_id}', body, headers={'Cookie': cookie})
+    with urllib.request.urlopen(req, timeout=30) as resp:
+        resp.read()
+
+
+def timed_get(url, cookie):
+    started = time.monotonic()
+    with urllib.request.urlopen(urllib.request.Request(url, headers={'Cookie': cookie}), timeout=30) as resp:
+        resp.read()
+    return time.monotonic() - started
+
+
+async def run_levels(pid, port, cookie, movie_id, screening_id, args):
+    loop = asyncio.get_running_loop()
+    base = f'http://127.0.0.1:{port}'
+    target = f'/api/movies/{movie_id}/screenings/{screening_id}/seats'
+    await asyncio.sleep(args.settle)
+    base_rss, base_threads = proc_status(pid)
+    print(f"   baseline: RSS {base_rss / 1024:.1f} MB, {base_threads} thread")
+    subs, listeners, rows = [], [], []
+    rounds_done = 0
+    try:
+        for level in args.levels:
+            started = time.monotonic()
+            while len(subs) < level:
+                batch = [Subscriber(rounds_done) for _ in range(min(OPEN_BATCH, level - len(subs)))]
+                readers = await asyncio.gather(*(s.open(port, target, cookie) for s in batch))
+                subs.extend(batch)
+                listeners.extend(asyncio.ensure_future(s.listen(r)) for s, r in zip(batch, readers))
+            opened = time.monotonic() - started
+            await asyncio.sleep(args.settle)
+            rss, threads = proc_status(pid)
+
+            fanout = []
+            for _ in range(args.rounds):
+                rounds_done += 1
+                sent = time.monotonic()
+                await loop.run_in_executor(None, post_hold, base, cookie, movie_id, screening_id, f'A{rounds_done}')
+                deadline = time.monotonic() + args.timeout
+                while not all(s.received(rounds_done) for s in subs) and time.monotonic() < deadline:
+                    await asyncio.sleep(0.005)
+                arrived = sorted(s.deliveries[rounds_done - s.offset - 1] - sent
+                                 for s in subs if s.received(rounds_done))
+                missing = len(subs) - len(arrived)
+                fanout.append((percentile(arrived, 50), percentile(arrived, 99), arrived[-1] if arrived else 0, missing))
+                # Pelanggan yang terlambat dianggap sudah menerima (hitungan tetap sejajar)
+                for s in subs:
+                    while not s.received(rounds_done):
+                        s.deliveries.append(float('inf'))
+            probe = await loop.run_in_executor(None, timed_get, f'{base}/api/movies/{movie_id}/availability', cookie)
+            row = {
+                'subscribers': level,
+                'open_s': opened,
+                'rss_mb': rss / 1024,
+                'kb_per_subscriber': (rss - base_rss) / level,
+                'threads': threads,
+                'fanout_p50_ms': statistics.median(f[0] for f in fanout) * 1000,
+                'fanout_p99_ms': statistics.median(f[1] for f in fanout) * 1000,
+                'fanout_max_ms': max(f[2] for f in fanout) * 1000,
+                'missed': sum(f[3] for f in fanout),
+                'request_ms': probe * 1000,
+            }
+            rows.append(row)
+            print(f"   {level:>6} stream (dibuka {opened:.1f} s): RSS {row['rss_mb']:.1f} MB "
+                  f"({row['kb_per_subscriber']:.1f} KB/stream), {threads} thread | fan-out "
+                  f"p50={row['fanout_p50_ms']:.0f} p99={row['fanout_p99_ms']:.0f} "
+                  f"maks={row['fanout_max_ms']:.0f} ms, terlewat {row['missed']} | "
+                  f"request biasa {row['request_ms']:.0f} ms")
+    finally:
+        for s in subs:
+            s.close()
+        for task in listeners:
+            task.cancel()
+        await asyncio.gather(*listeners, return_exceptions=True)
+    return rows
+
+
+def run_mode(mode, path, args, movie_id, screening_id):
+    port = free_port()
+    bench_async = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_async.py')
+    with open(args.server_log, 'a') as log:
+        # Batas pelanggan default (SEAT_FEED_MAX_SUBSCRIBERS) dinaikkan ke level tertinggi
+        proc = subprocess.Popen([sys.executable, bench_async, '--serve', mode, '--db', path,
+                                 '--port', str(port), '--backlog', '1024',
+                                 '--seat-feed-max', str(max(args.levels))],
+                                stdout=log, stderr=log, start_new_session=True)
+    try:
+        wait_ready(port, proc)
+        cookie = login(f'http://127.0.0.1:{port}')
+        return asyncio.run(run_levels(proc.pid, port, cookie, movie_id, screening_id, args))
+    finally:
+        os.killpg(proc.pid, signal.SIGTERM)
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--levels', default='250,1000,2000',
+                        type=lambda value: sorted(int(n) for n in value.split(',')))
+    parser.add_argument('--modes', default='sync,async')
+    parser.add_argument('--rounds', type=int, default=5, help='hold per level untuk latensi fan-out')
+    parser.add_argument('--settle', type=float, default=1.0, help='jeda sebelum RSS dibaca (detik)')
+    parser.add_argument('--timeout', type=float, default=10.0, help='batas tunggu satu delta (detik)')
+    parser.add_argument('--server-log', default=os.devnull, help='file untuk output server')
+    args = parser.parse_args()
+
+    # Setiap stream = satu fd di klien dan satu di server (proses anak mewarisi limit)
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = max(args.levels) * 2 + 256
+    if soft < wanted:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(wanted, hard), hard))
+
+    modes = check_modes(args.modes)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        seed(path, 20, 0)
+        movie_id, screening_ids = load_movies(path, 1)[0]
+        screening_id = screening_ids[0]
+        print(f"Stream SSE ke satu pemutaran (film {movie_id}, screening {screening_id}), "
+              f"{args.rounds} hold per level")
+        for mode in modes:
+            print(f"\n== {mode}")
+            run_mode(mode, path, args, movie_id, screening_id)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Benchmark cold start: waktu import app.py dan time-to-first-response serve.py.
+
+Usage (PowerShell):
+    python scripts\\bench_startup.py
+    python scripts\\bench_startup.py --runs 10 --top 15 --out startup.json
+    python scripts\\bench_startup.py --check --max-import-ms 250 --max-first-response-ms 800
+
+Import diukur dengan `python -X importtime -c "import app"` (bytecode .pyc
+aktif, seperti di server). Dilaporkan median total import app, porsi modul
+milik repo ini vs library, dan modul repo dengan self time terbesar, supaya
+pekerjaan yang menyelinap ke waktu import langsung kelihatan asalnya.
+
+Time-to-first-response: serve.py --workers 1 dijalankan di atas database
+sementara (sudah di-seed), diukur dari spawn proses sampai GET / pertama
+dijawab 200. Dua varian: cache bytecode Jinja kosong (deploy pertama) dan
+cache yang sudah terisi (restart/reload berikutnya).
+
+Dengan --check script keluar dengan status 1 jika median melewati budget,
+sehingga bisa dipasang di CI/pre-deploy.
+"""
+import argparse
+import json
+import os
+import re
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Budget default (ms, median); sesuaikan dengan mesin CI lewat argumen
+IMPORT_BUDGET_MS = 300
+FIRST_RESPONSE_BUDGET_MS = 1500
+
+SERVE_LOG = re.compile(r'import (\d+) ms, migrasi \+ seed (\d+) ms, warm-up (\d+) ms')
+
+
+def child_env(**extra):
+    env = dict(os.environ, **extra)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)  # ukur seperti produksi: .pyc dipakai
+    return env
+
+
+def own_modules():
+    """Nama modul top-level milik repo (file .py dan package di ROOT)"""
+    names = set()
+    for entry in os.listdir(ROOT):
+        path = os.path.join(ROOT, entry)
+        if entry.endswith('.py'):
+            names.add(entry[:-3])
+        elif os.path.isfile(os.path.join(path, '__init__.py')):
+            names.add(entry)
+    return names
+
+
+def importtime_once():
+    """{modul: (self us, kumulatif us)} dari satu `python -X importtime -c "import app"`"""
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'], cwd=ROOT,
+                          env=child_env(), capture_output=True, text=True)
+    if proc.returncode != 0:
+        sys.exit("import app gagal:\n" + proc.stderr[-2000:])
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = (int(own), int(cumulative))
+    return modules
+
+
+def measure_import(runs, top):
+    importtime_once()  # tulis .pyc dulu
+    samples = [importtime_once() for _ in range(runs)]
+    mine = own_modules()
+    totals = [s['app'][1] / 1000 for s in samples]
+    own = [sum(self_us for name, (self_us, _) in s.items() if name.split('.')[0] in mine) / 1000
+           for s in samples]
+    # Self time per modul repo (median antar run)
+    per_module = {}
+    for name in samples[0]:
+        if name.split('.')[0] in mine:
+            per_module[name] = statistics.median(s.get(name, (0, 0))[0] for s in samples) / 1000
+    heaviest = sorted(per_module.items(), key=lambda item: -item[1])[:top]
+    return {
+        'import_ms': statistics.median(totals),
+        'import_own_ms': statistics.median(own),
+        'import_modules': len(samples[0]),
+        'heaviest_own': heaviest,
+    }
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def first_response(path, cache_dir, timeout=30.0):
+    """Spawn serve.py lalu ukur sampai GET / pertama 200; kembalikan (ms, log breakdown)"""
+    port = free_port()
+    url = f'http://127.0.0.1:{port}/'
+    with tempfile.TemporaryFile('w+') as log:
+        started = time.monotonic()
+        proc = subprocess.Popen([sys.executable, os.path.join(ROOT, 'serve.py'), '--workers', '1',
+                                 '--port', str(port), '--database', path],
+                                cwd=ROOT, env=child_env(JINJA_CACHE_DIR=cache_dir),
+                                stdout=log, stderr=log, start_new_session=True)
+        try:
+            while True:
+                if proc.poll() is not None or time.monotonic() - started > timeout:
+                    log.seek(0)
+                    sys.exit("serve.py tidak menjawab:\n" + log.read()[-2000:])
+                try:
+                    with urllib.request.urlopen(url, timeout=timeout) as resp:
+                        resp.read()
+                        if resp.status == 200:
+                            break
+                except (urllib.error.URLError, ConnectionError):
+                    time.sleep(0.005)
+            elapsed = (time.monotonic() - started) * 1000
+        finally:
+            os.killpg(proc.pid, signal.SIGTERM)
+            proc.wait()
+        log.seek(0)
+        match = SERVE_LOG.search(log.read())
+    breakdown = dict(zip(('import', 'prepare', 'warm'), map(int, match.groups()))) if match else {}
+    return elapsed, breakdown
+
+
+def measure_first_response(runs):
+    from loadtest import seed  # noqa: E402 (butuh sys.path scripts/)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'startup.db')
+        seed(path, 200, 500)
+        warm_dir = os.path.join(tmp, 'jinja-warm')
+        first_response(path, warm_dir)  # isi cache bytecode + jalankan migrasi/seed sekali
+        for variant in ('cold', 'warm'):
+            times, breakdowns = [], []
+            for n in range(runs):
+                cache_dir = os.path.join(tmp, f'jinja-cold-{n}') if variant == 'cold' else warm_dir
+                elapsed, breakdown = first_response(path, cache_dir)
+                times.append(elapsed)
+                breakdowns.append(breakdown)
+            results[variant] = {
+                'first_response_ms': statistics.median(times),
+                'max_ms': max(times),
+                'breakdown_ms': {key: statistics.median(b[key] for b in breakdowns if key in b)
+                                 for key in ('import', 'prepare', 'warm') if any(key in b for b in breakdowns)},
+            }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10, help='jumlah modul repo terberat yang ditampilkan')
+    parser.add_argument('--skip-serve', action='store_true', help='hanya ukur waktu import')
+    parser.add_argument('--check', action='store_true', help='exit 1 jika melewati budget')
+    parser.add_argument('--max-import-ms', type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument('--max-first-response-ms', type=float, default=FIRST_RESPONSE_BUDGET_MS)
+    parser.add_argument('--out', help='simpan hasil ke file JSON')
+    args = parser.parse_args()
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    result = measure_import(args.runs, args.top)
+    print(f"import app: {result['import_ms']:.0f} ms (median {args.runs} run), "
+          f"modul repo {result['import_own_ms']:.0f} ms, {result['import_modules']} modul dimuat")
+    for name, ms in result['heaviest_own']:
+        print(f"   {name:<24} {ms:7.1f} ms")
+
+    failures = []
+    if result['import_ms'] > args.max_import_ms:
+        failures.append(f"import {result['import_ms']:.0f} ms > budget {args.max_import_ms:.0f} ms")
+
+    if not args.skip_serve:
+        result['serve'] = measure_first_response(args.runs)
+        for variant, data in result['serve'].items():
+            parts = ', '.join(f"{key} {ms:.0f}" for key, ms in data['breakdown_ms'].items())
+            print(f"first response (cache Jinja {variant}): {data['first_response_ms']:.0f} ms median, "
+                  f"maks {data['max_ms']:.0f} ms | master: {parts} ms")
+        worst = result['serve']['cold']['first_response_ms']
+        if worst > args.max_first_response_ms:
+            failures.append(f"first response {worst:.0f} ms > budget {args.max_first_response_ms:.0f} ms")
+
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(result, f, indent=2)
+    if args.check:
+        if failures:
+            sys.exit("Startup melewati budget: " + '; '.join(failures))
+        print("Startup dalam budget")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Build asset statis: minify CSS/JS di static/css dan static/js, beri hash isi
+di nama file, lalu kompres dulu ke .gz (dan .br jika modul brotli terpasang).
+
+Usage (PowerShell):
+    python scripts\\build_assets.py
+
+Hasil ditulis ke static/dist/ beserta manifest.json yang dibaca assets.py.
+File build lama tidak dihapus, jadi halaman yang masih di-cache browser
+tetap bisa memuat asset versi sebelumnya.
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from assets import MANIFEST_NAME  # noqa: E402
+
+try:
+    import brotli
+except ImportError:  # brotli opsional: tanpa modul ini hanya .gz yang dibuat
+    brotli = None
+
+try:
+    import rcssmin
+    import rjsmin
+except ImportError:  # CSS memakai minifier bawaan di bawah, JS disalin apa adanya
+    rcssmin = rjsmin = None
+
+STATIC_DIR = os.path.join(ROOT, 'static')
+SOURCE_DIRS = ('css', 'js')
+# Literal string tidak boleh ikut diubah minifier
+_CSS_STRINGS = r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\''
+_CSS_COMMENTS = re.compile(rf'({_CSS_STRINGS})|/\*.*?\*/', re.S)
+_CSS_TOKENS = re.compile(rf'({_CSS_STRINGS})', re.S)
+
+
+def minify_css(source):
+    if rcssmin is not None:
+        return rcssmin.cssmin(source)
+    source = _CSS_COMMENTS.sub(lambda m: m.group(1) or '', source)
+    out = []
+    for i, part in enumerate(_CSS_TOKENS.split(source)):
+        if i % 2:
+            out.append(part)
+            continue
+        part = re.sub(r'\s+', ' ', part)
+        part = re.sub(r'\s*([{};,>])\s*', r'\1', part)
+        # Spasi di sekitar ':' hanya dibuang setelah nama properti (bukan selector :hover)
+        part = re.sub(r'([{;][-a-zA-Z]+) ?: ?', r'\1:', part)
+        out.append(part.replace(';}', '}'))
+    return ''.join(out).strip()
+
+
+def minify_js(source):
+    """Minify dengan rjsmin; tanpa rjsmin file disalin apa adanya.
+
+    Memotong JS baris per baris tidak aman ('//' di dalam string atau regex),
+    jadi tanpa tokenizer sungguhan ukuran diserahkan ke gzip/brotli saja.
+    """
+    if rjsmin is not None:
+        return rjsmin.jsmin(source)
+    return source
+
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+
+def write_if_missing(path, data):
+    if not os.path.exists(path):
+        with open(path, 'wb') as f:
+            f.write(data)
+
+
+def build(out_dir):
+    manifest, report = {}, []
+    for folder in SOURCE_DIRS:
+        src_dir = os.path.join(STATIC_DIR, folder)
+        for filename in sorted(os.listdir(src_dir)):
+            base, ext = os.path.splitext(filename)
+            if ext not in MINIFIERS:
+                continue
+            with open(os.path.join(src_dir, filename), encoding='utf-8') as f:
+                source = f.read()
+            data = MINIFIERS[ext](source).encode('utf-8')
+            digest = hashlib.sha256(data).hexdigest()[:10]
+            name = f"{folder}/{base}.{digest}{ext}"
+            path = os.path.join(out_dir, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            write_if_missing(path, data)
+            gz = gzip.compress(data, compresslevel=9, mtime=0)
+            write_if_missing(path + '.gz', gz)
+            br = None
+            if brotli is not None:
+                br = brotli.compress(data, quality=11)
+                write_if_missing(path + '.br', br)
+            manifest[f"{folder}/{filename}"] = name
+            report.append((name, len(source.encode('utf-8')), len(data), len(gz), len(br) if br else None))
+    with open(os.path.join(out_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--out', default=os.path.join(STATIC_DIR, 'dist'))
+    args = parser.parse_args()
+
+    report = build(args.out)
+    print(f"{'asset':<34} {'source':>8} {'minified':>9} {'gzip':>7} {'brotli':>7}")
+    for name, source, minified, gz, br in report:
+        print(f"{name:<34} {source:>8} {minified:>9} {gz:>7} {br if br is not None else '-':>7}")
+    totals = [sum(r[i] for r in report) for i in (1, 2, 3)]
+    print(f"{'total':<34} {totals[0]:>8} {totals[1]:>9} {totals[2]:>7}")
+    print(f"manifest: {os.path.join(args.out, MANIFEST_NAME)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Ambil poster film yang belum punya salinan lokal (lihat posters.py).
+
+Usage (PowerShell):
+    python scripts\\fetch_posters.py
+    python scripts\\fetch_posters.py --retry-failed
+
+Server hanya mencoba ulang URL yang gagal setelah POSTER_RETRY_INTERVAL;
+--retry-failed mencoba semuanya sekarang (mis. setelah URL poster diperbaiki
+atau jaringan kembali normal). Script menunggu sampai semua unduhan selesai.
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import wait
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app as cinema  # noqa: E402
+import db  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--db', default=db.DB_PATH)
+    parser.add_argument('--retry-failed', action='store_true', help='coba lagi poster yang pernah gagal')
+    args = parser.parse_args()
+
+    cinema.app.config['DATABASE'] = args.db
+    with cinema.app.app_context():
+        cinema.init_db()
+        futures = cinema.posters.schedule_missing(retry_failed=args.retry_failed)
+    wait(futures)
+    ready = sum(1 for f in futures if f.result())
+    print(f"{ready}/{len(futures)} poster tersimpan lokal, {len(futures) - ready} gagal")
+    cinema.posters.worker_pool.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Import katalog film / jadwal tayang dari CSV atau JSON Lines secara streaming.
+
+Usage (PowerShell):
+    python scripts\\import_catalog.py movies.csv
+    python scripts\\import_catalog.py jadwal.jsonl --kind showtimes --chunk-size 5000
+
+--kind movies     satu baris per film: title, genre, duration, poster, showtimes,
+                  regular_price, vip_price (showtimes dipisah koma, atau list di JSONL).
+                  Film dengan judul yang sama di-update, selain itu ditambahkan.
+--kind showtimes  satu baris per jadwal: title, showtime. Jadwal digabung ke
+                  film yang sudah ada (duplikat diabaikan).
+
+File dibaca per baris, divalidasi per chunk, lalu ditulis dengan executemany
+dalam satu transaksi per chunk. Baris tidak valid dilewati dan dilaporkan
+(atau import dihentikan dengan --strict).
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from itertools import islice
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import db  # noqa: E402
+import migrations  # noqa: E402
+import screenings  # noqa: E402
+
+MOVIE_DEFAULTS = {'genre': '', 'poster': '', 'regular_price': 50000, 'vip_price': 75000}
+
+
+class RowError(ValueError):
+    def __init__(self, line, message):
+        super().__init__(f"baris {line}: {message}")
+        self.line = line
+
+
+def read_rows(path, fmt):
+    """Generator (nomor baris, dict) dari CSV atau JSON Lines"""
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        if fmt == 'csv':
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    row = RowError(line_no, f"JSON tidak valid: {e.msg}")
+                yield line_no, row
+
+
+def split_showtimes(value):
+    if isinstance(value, (list, tuple)):
+        items = value
+    else:
+        items = str(value or '').split(',')
+    return [str(s).strip() for s in items if str(s).strip()]
+
+
+def check_clock(line, showtime):
+    if screenings.to_clock(showtime) is None:
+        raise RowError(line, f"jam tayang tidak dikenali: {showtime!r}")
+    return showtime
+
+
+def to_int(line, row, key, default=None, minimum=0):
+    value = row.get(key)
+    if value in (None, ''):
+        if default is None:
+            raise RowError(line, f"kolom '{key}' wajib diisi")
+        return default
+    try:
+        number = int(float(value))
+    except (TypeError, ValueError):
+        raise RowError(line, f"kolom '{key}' bukan angka: {value!r}") from None
+    if number < minimum:
+        raise RowError(line, f"kolom '{key}' minimal {minimum}: {number}")
+    return number
+
+
+def validate_movie(line, row):
+    title = str(row.get('title') or '').strip()
+    if not title:
+        raise RowError(line, "kolom 'title' wajib diisi")
+    return {
+        'title': title,
+        'genre': str(row.get('genre') or MOVIE_DEFAULTS['genre']).strip(),
+        'duration': to_int(line, row, 'duration', minimum=1),
+        'poster': str(row.get('poster') or MOVIE_DEFAULTS['poster']).strip(),
+        'showtimes': [check_clock(line, s) for s in split_showtimes(row.get('showtimes'))],
+        'regular_price': to_int(line, row, 'regular_price', MOVIE_DEFAULTS['regular_price']),
+        'vip_price': to_int(line, row, 'vip_price', MOVIE_DEFAULTS['vip_price']),
+    }
+
+
+def validate_showtime(line, row):
+    title = str(row.get('title') or '').strip()
+    showtime = str(row.get('showtime') or '').strip()
+    if not title or not showtime:
+        raise RowError(line, "kolom 'title' dan 'showtime' wajib diisi")
+    if ',' in showtime:
+        raise RowError(line, f"showtime tidak boleh mengandung koma: {showtime!r}")
+    return {'title': title, 'showtime': check_clock(line, showtime)}
+
+
+class CatalogImporter:
+    """Menulis chunk baris tervalidasi ke tabel movies.
+
+    Peta judul -> (id, jadwal) dimuat sekali di awal dan diperbarui per chunk,
+    jadi tidak ada SELECT per baris. Pemutaran (tabel screenings) film yang
+    berubah dibentuk ulang di transaksi yang sama.
+    """
+    def __init__(self, conn):
+        self.conn = conn
+        self.by_title = {}
+        for r in conn.execute("SELECT id, title, showtimes FROM movies ORDER BY id"):
+            self.by_title.setdefault(r['title'], [r['id'], split_showtimes(r['showtimes'])])
+        self.stats = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+
+    def write_movies(self, rows):
+        now = datetime.now().strftime("%Y-%m-%d %H:%M")
+        latest = {}
+        for row in rows:  # judul sama dalam satu chunk: baris terakhir menang
+            latest[row['title']] = row
+        inserts, updates = [], []
+        for title, row in latest.items():
+            values = (row['genre'], row['duration'], row['poster'], ', '.join(row['showtimes']),
+                      row['regular_price'], row['vip_price'], now)
+            if title in self.by_title:
+                updates.append(values + (self.by_title[title][0],))
+                self.by_title[title][1] = row['showtimes']
+            else:
+                inserts.append((title,) + values + (now,))
+        with db.immediate_transaction(self.conn):
+            self.conn.executemany(
+                """UPDATE movies SET genre=?, duration=?, poster=?, showtimes=?, regular_price=?, vip_price=?, updated_at=?
+                   WHERE id=?""", updates)
+            # Write lock dipegang sejak BEGIN IMMEDIATE, jadi semua id di atas
+            # max_id sebelum INSERT adalah baris dari chunk ini
+            max_id = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM movies").fetchone()[0]
+            self.conn.executemany(
+                """INSERT INTO movies (title, genre, duration, poster, showtimes, regular_price, vip_price, updated_at, created_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""", inserts)
+            for r in self.conn.execute("SELECT id, title, showtimes FROM movies WHERE id > ?", (max_id,)):
+                self.by_title[r['title']] = [r['id'], split_showtimes(r['showtimes'])]
+            self.schedule(self.by_title[title] for title in latest)
+        self.stats['inserted'] += len(inserts)
+        self.stats['updated'] += len(updates)
+
+    def write_showtimes(self, rows, errors, strict):
+        now = datetime.now().strftime("%Y-%m-%d %H:%M")
+        changed = {}
+        for row in rows:
+            entry = self.by_title.get(row['title'])
+            if entry is None:
+                error = RowError(row['line'], f"film tidak ditemukan: {row['title']!r}")
+                if strict:
+                    raise error
+                errors.append(str(error))
+                continue
+            if row['showtime'] in entry[1]:
+                self.stats['unchanged'] += 1
+                continue
+            entry[1].append(row['showtime'])
+            changed[entry[0]] = entry[1]
+            self.stats['updated'] += 1
+        if changed:
+            with db.immediate_transaction(self.conn):
+                self.conn.executemany(
+                    "UPDATE movies SET showtimes=?, updated_at=? WHERE id=?",
+                    [(', '.join(showtimes), now, movie_id) for movie_id, showtimes in changed.items()]
+                )
+                self.schedule(changed.items())
+
+    def schedule(self, entries):
+        """Bentuk pemutaran dari pasangan (id film, list jadwal)"""
+        screenings.materialize(self.conn, [(movie_id, ', '.join(showtimes)) for movie_id, showtimes in entries],
+                               screenings.DAYS_AHEAD)
+
+
+def chunks(iterable, size):
+    it = iter(iterable)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_import(path, kind, fmt, db_path, chunk_size, strict):
+    conn = db.connect(db_path)
+    migrations.migrate(conn)
+    importer = CatalogImporter(conn)
+    validate = validate_movie if kind == 'movies' else validate_showtime
+    errors, total = [], 0
+    start = time.perf_counter()
+    try:
+        for chunk in chunks(read_rows(path, fmt), chunk_size):
+            total += len(chunk)
+            valid = []
+            for line, raw in chunk:
+                try:
+                    if isinstance(raw, RowError):
+                        raise raw
+                    row = validate(line, raw)
+                except RowError as e:
+                    if strict:
+                        raise
+                    errors.append(str(e))
+                    continue
+                row['line'] = line
+                valid.append(row)
+            if kind == 'movies':
+                importer.write_movies(valid)
+            else:
+                importer.write_showtimes(valid, errors, strict)
+    finally:
+        conn.close()
+    return total, errors, importer.stats, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('path')
+    parser.add_argument('--kind', choices=('movies', 'showtimes'), default='movies')
+    parser.add_argument('--format', choices=('csv', 'jsonl'), help='default: dari ekstensi file')
+    parser.add_argument('--db', default=db.DB_PATH)
+    parser.add_argument('--chunk-size', type=int, default=2000)
+    parser.add_argument('--strict', action='store_true', help='hentikan import pada baris tidak valid pertama')
+    args = parser.parse_args()
+
+    fmt = args.format or ('csv' if args.path.lower().endswith('.csv') else 'jsonl')
+    try:
+        total, errors, stats, elapsed = run_import(args.path, args.kind, fmt, args.db, args.chunk_size, args.strict)
+    except RowError as e:
+        sys.exit(f"Import dihentikan, {e}")
+    for message in errors[:20]:
+        print(f"dilewati: {message}")
+    if len(errors) > 20:
+        print(f"... dan {len(errors) - 20} baris lain")
+    print(f"rows     : {total} ({len(errors)} dilewati)")
+    print(f"inserted : {stats['inserted']}")
+    print(f"updated  : {stats['updated']}")
+    if args.kind == 'showtimes':
+        print(f"duplikat : {stats['unchanged']}")
+    print(f"elapsed  : {elapsed:.2f}s ({total / elapsed if elapsed else 0:.0f} rows/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Load test end-to-end alur pemesanan: register -> login -> / -> book GET ->
+book POST -> finish -> profile, per virtual user, dengan banyak thread.
+
+Usage (PowerShell):
+    python scripts\\loadtest.py --users 200 --threads 16 --movies 500 --out hasil.json
+    python scripts\\loadtest.py --url http://127.0.0.1:5000 --db database.db --users 50
+
+Tanpa --url, aplikasi dijalankan lewat Flask test client di atas database
+sementara yang di-seed (--movies film, --orders order lama). Dengan --url,
+request dikirim ke server yang sudah berjalan dan --db menunjuk database
+server itu (untuk daftar film dan pengecekan oversell).
+
+Hasil: throughput, latensi p50/p95/p99 per route, jumlah konflik kursi dan
+jumlah kursi yang terjual lebih dari sekali (oversell). --out menyimpan JSON.
+"""
+import argparse
+import http.cookiejar
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import app as cinema  # noqa: E402
+import auditoriums  # noqa: E402
+import db  # noqa: E402
+import migrations  # noqa: E402
+import screenings  # noqa: E402
+from import_catalog import CatalogImporter  # noqa: E402
+
+TICKET_TYPES = ('Regular', 'VIP')
+SHOWTIMES = ('10:00 AM', '01:00 PM', '04:00 PM', '07:00 PM')
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class HttpClient:
+    """Klien HTTP dengan cookie jar; redirect tidak diikuti (sama seperti test client)"""
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()), _NoRedirect
+        )
+
+    def request(self, method, path, data=None):
+        body = urllib.parse.urlencode(data).encode() if data is not None else None
+        req = urllib.request.Request(self.base_url + path, data=body, method=method)
+        try:
+            with self.opener.open(req, timeout=30) as resp:
+                return resp.status, resp.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.read()
+
+
+class TestClient:
+    def __init__(self, flask_app):
+        self.client = flask_app.test_client()
+
+    def request(self, method, path, data=None):
+        resp = self.client.open(path, method=method, data=data)
+        return resp.status_code, resp.get_data()
+
+
+class Recorder:
+    """Latensi per route (thread-safe)"""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.counters = defaultdict(int)
+
+    def call(self, client, route, method, path, data=None):
+        start = time.perf_counter()
+        try:
+            status, body = client.request(method, path, data)
+        except OSError:
+            status, body = 599, b''
+        elapsed = time.perf_counter() - start
+        with self.lock:
+            self.latencies[route].append(elapsed)
+            if status >= 500:
+                self.errors[route] += 1
+        return status, body
+
+    def count(self, name):
+        with self.lock:
+            self.counters[name] += 1
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(p / 100 * len(sorted_values)))]
+
+
+def seed(path, movies, orders):
+    """Database baru: skema, `movies` film dengan 4 jadwal, dan `orders` order lama"""
+    conn = db.connect(path)
+    migrations.migrate(conn)
+    db.configure_database(path)
+    importer = CatalogImporter(conn)
+    importer.write_movies([
+        {'title': f'Film Load Test {i}', 'genre': 'Drama', 'duration': 90 + i % 60, 'poster': '',
+         'showtimes': list(SHOWTIMES), 'regular_price': 50000, 'vip_price': 75000}
+        for i in range(movies)
+    ])
+    if orders:
+        seats = list(auditoriums.default_layout().seats.items())  # (kursi, tier)
+        ids = [r['id'] for r in conn.execute("SELECT id FROM movies")]
+        now = datetime.now().strftime("%Y-%m-%d %H:%M")
+        with db.immediate_transaction(conn):
+            # Order lama memakai kursi unik per pemutaran (tipe tiket = tier kursi di
+            # denah) supaya index okupansi valid; tabel rollup penjualan tidak ikut diisi
+            by_movie = defaultdict(list)
+            for r in conn.execute("SELECT id, movie_id, starts_at, hall FROM screenings ORDER BY starts_at"):
+                by_movie[r['movie_id']].append((r['id'], screenings.label(r['starts_at'], r['hall'])))
+            rows = []
+            for i in range(orders):
+                movie_id = ids[i % len(ids)]
+                slot = i // len(ids)
+                slots = by_movie[movie_id]
+                screening_id, showtime = slots[slot % len(slots)]
+                seat, ticket_type = seats[(slot // len(slots)) % len(seats)]
+                rows.append((movie_id, screening_id, f'Film {movie_id}', seat, ticket_type, showtime, 50000, 3000,
+                             53000, 'member', 0, 'Seed', 'seed@example.com', now, 'cash'))
+            max_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM orders").fetchone()[0]
+            conn.executemany(
+                """INSERT INTO orders (movie_id, screening_id, movie_title, seat, ticket_type, showtime, ticket_price,
+                   admin_fee, price, membership, snack_included, customer, email, date, payment_method)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""", rows)
+            conn.execute(
+                """INSERT OR IGNORE INTO order_seats (screening_id, ticket_type, seat, order_id)
+                   SELECT screening_id, ticket_type, seat, id FROM orders WHERE id > ?""", (max_id,))
+    conn.close()
+
+
+def load_movies(path, limit):
+    """(id film, id pemutaran mendatang) untuk `limit` film pertama"""
+    conn = sqlite3.connect(path)
+    movies = []
+    for (movie_id,) in conn.execute("SELECT id FROM movies ORDER BY id LIMIT ?", (limit,)).fetchall():
+        ids = [r[0] for r in conn.execute(
+            "SELECT id FROM screenings WHERE movie_id = ? AND starts_at > ? ORDER BY starts_at",
+            (movie_id, datetime.now().strftime(screenings.STARTS_AT_FORMAT)))]
+        movies.append((movie_id, ids))
+    conn.close()
+    return movies
+
+
+def oversell(path):
+    """Kursi yang muncul di lebih dari satu order untuk pemutaran yang sama"""
+    conn = sqlite3.connect(path)
+    sold = defaultdict(int)
+    for screening_id, seat in conn.execute("SELECT screening_id, seat FROM orders"):
+        for s in (seat or '').split(','):
+            if s.strip():
+                sold[(screening_id, s.strip())] += 1
+    conn.close()
+    duplicates = {k: n for k, n in sold.items() if n > 1}
+    return len(duplicates), sum(n - 1 for n in duplicates.values())
+
+
+def virtual_user(n, make_client, rec, movies, seats, max_seats, rng):
+    client = make_client()
+    email = f'load{n}-{os.getpid()}-{int(time.time())}@example.com'
+    rec.call(client, 'POST /register', 'POST', '/register',
+             {'name': f'Load {n}', 'email': email, 'password': 'loadtest'})
+    status, _ = rec.call(client, 'POST /login', 'POST', '/login', {'email': email, 'password': 'loadtest'})
+    if status != 302:
+        rec.count('login_failed')
+        return
+    rec.call(client, 'GET /', 'GET', '/')
+    movie_id, screening_ids = rng.choice(movies)
+    rec.call(client, 'GET /book/<id>', 'GET', f'/book/{movie_id}')
+    # Kursi dipilih dari tier tiket (zona VIP hanya untuk tiket VIP)
+    ticket_type = rng.choice(TICKET_TYPES)
+    chosen = rng.sample(seats[ticket_type], rng.randint(1, max_seats))
+    status, body = rec.call(client, 'POST /book/<id>', 'POST', f'/book/{movie_id}', {
+        'name': f'Load {n}', 'email': email, 'seat': ', '.join(chosen),
+        'ticket_type': ticket_type, 'screening_id': rng.choice(screening_ids),
+    })
+    if b'sudah dipesan' in body:
+        rec.count('seat_conflicts')
+    else:
+        status, _ = rec.call(client, 'POST /finish', 'POST', '/finish', {'payment_method': 'cash'})
+        rec.count('orders' if status == 200 else 'finish_rejected')
+    rec.call(client, 'GET /profile', 'GET', '/profile')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=100, help='jumlah virtual user (satu alur penuh per user)')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--movies', type=int, default=50, help='film di database seed')
+    parser.add_argument('--orders', type=int, default=0, help='order lama di database seed')
+    parser.add_argument('--hot-movies', type=int, default=3, help='film yang diperebutkan virtual user')
+    parser.add_argument('--max-seats', type=int, default=4)
+    parser.add_argument('--url', help='server yang sudah berjalan (default: Flask test client)')
+    parser.add_argument('--db', help='database server untuk --url')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--out', help='simpan hasil sebagai JSON')
+    args = parser.parse_args()
+    if args.url and not args.db:
+        parser.error('--url membutuhkan --db')
+
+    tmp = None
+    if args.url:
+        path = args.db
+        make_client = lambda: HttpClient(args.url)  # noqa: E731
+    else:
+        tmp = tempfile.TemporaryDirectory()
+        path = os.path.join(tmp.name, 'loadtest.db')
+        seed(path, args.movies, args.orders)
+        cinema.app.config.update(TESTING=True, DATABASE=path, POSTER_CACHE=False)
+        make_client = lambda: TestClient(cinema.app)  # noqa: E731
+    seats = defaultdict(list)  # tier -> kursi di denah default
+    for seat, tier in auditoriums.default_layout().seats.items():
+        seats[tier].append(seat)
+    movies = load_movies(path, args.hot_movies)
+
+    rec = Recorder()
+    users = iter(range(args.users))
+    users_lock = threading.Lock()
+
+    def run_thread(thread_no):
+        rng = random.Random(args.seed * 1000 + thread_no)
+        while True:
+            with users_lock:
+                n = next(users, None)
+            if n is None:
+                return
+            virtual_user(n, make_client, rec, movies, seats, args.max_seats, rng)
+
+    threads = [threading.Thread(target=run_thread, args=(i,)) for i in range(args.threads)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    oversold_seats, extra_sales = oversell(path)
+    routes = {}
+    for route, values in rec.latencies.items():
+        values.sort()
+        routes[route] = {
+            'count': len(values),
+            'errors': rec.errors[route],
+            'rps': len(values) / elapsed,
+            'mean_ms': 1000 * sum(values) / len(values),
+            'p50_ms': 1000 * percentile(values, 50),
+            'p95_ms': 1000 * percentile(values, 95),
+            'p99_ms': 1000 * percentile(values, 99),
+            'max_ms': 1000 * values[-1],
+        }
+    total_requests = sum(r['count'] for r in routes.values())
+    result = {
+        'started_at': datetime.now().isoformat(timespec='seconds'),
+        'config': {k: v for k, v in vars(args).items() if k != 'out'},
+        'elapsed_s': elapsed,
+        'requests': total_requests,
+        'throughput_rps': total_requests / elapsed,
+        'flows_per_s': args.users / elapsed,
+        'routes': routes,
+        'counters': dict(rec.counters),
+        'oversold_seats': oversold_seats,
+        'duplicate_sales': extra_sales,
+    }
+
+    print(f"{args.users} alur, {total_requests} request dalam {elapsed:.2f}s "
+          f"({result['throughput_rps']:.1f} req/s, {result['flows_per_s']:.1f} alur/s)")
+    print(f"{'route':<18} {'count':>6} {'err':>4} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for route, r in sorted(routes.items()):
+        print(f"{route:<18} {r['count']:>6} {r['errors']:>4} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} "
+              f"{r['p99_ms']:>8.1f} {r['max_ms']:>8.1f}")
+    print(f"orders {rec.counters['orders']}, konflik kursi {rec.counters['seat_conflicts']}, "
+          f"finish ditolak {rec.counters['finish_rejected']}")
+    print(f"oversell: {oversold_seats} kursi terjual ganda ({extra_sales} penjualan berlebih)")
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        print(f"hasil disimpan di {args.out}")
+    if tmp is not None:
+        db.get_pool(path).close_all()
+        tmp.cleanup()
+
+
+if __name__ == '__main__':
+    main()
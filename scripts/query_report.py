@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Ringkasan log query dari mode diagnostik (querylog.py), diurutkan per total waktu.
+
+Usage (PowerShell):
+    $env:DB_DIAGNOSTICS = "1"; python app.py      # kumpulkan querylog.jsonl
+    python scripts\\query_report.py querylog.jsonl --top 15
+
+Per fingerprint ditampilkan jumlah eksekusi, total/rata-rata/p95/maks waktu,
+rata-rata instruksi VM SQLite dan baris, endpoint penyumbang terbesar, serta
+query plan dari eksekusi paling lambat yang melewati DB_SLOW_QUERY_MS.
+Plan yang mengandung "SCAN" tanpa index ditandai sebagai full scan.
+"""
+import argparse
+import json
+import sys
+from collections import Counter
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+def full_scans(plan):
+    """Langkah plan yang membaca seluruh tabel (SCAN tanpa index)"""
+    return [step for step in plan or [] if step.startswith('SCAN') and 'INDEX' not in step]
+
+
+def load(path):
+    stats = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            fp = stats.get(entry['fp'])
+            if fp is None:
+                fp = stats[entry['fp']] = {'ms': [], 'ops': 0, 'rows': 0, 'endpoints': Counter(),
+                                           'plan': None, 'plan_ms': -1.0}
+            fp['ms'].append(entry['ms'])
+            fp['ops'] += entry.get('ops') or 0
+            fp['rows'] += entry.get('rows') or 0
+            fp['endpoints'][entry.get('endpoint') or '-'] += entry['ms']
+            if entry.get('plan') and entry['ms'] > fp['plan_ms']:
+                fp['plan'], fp['plan_ms'] = entry['plan'], entry['ms']
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('path', nargs='?', default='querylog.jsonl')
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--endpoint', help='hanya statement dari endpoint ini')
+    args = parser.parse_args()
+
+    try:
+        stats = load(args.path)
+    except FileNotFoundError:
+        sys.exit(f"{args.path} tidak ditemukan (jalankan app dengan DB_DIAGNOSTICS=1)")
+    if args.endpoint:
+        stats = {k: v for k, v in stats.items() if args.endpoint in v['endpoints']}
+    ranked = sorted(stats.items(), key=lambda kv: sum(kv[1]['ms']), reverse=True)
+    grand_total = sum(sum(v['ms']) for v in stats.values()) or 1.0
+
+    print(f"{len(stats)} fingerprint, {sum(len(v['ms']) for v in stats.values())} statement, "
+          f"{grand_total:.1f} ms total\n")
+    for rank, (fp, s) in enumerate(ranked[:args.top], 1):
+        ms = sorted(s['ms'])
+        count, total = len(ms), sum(ms)
+        print(f"#{rank} {total:.1f} ms ({total / grand_total:.0%})  n={count}  "
+              f"avg={total / count:.2f}  p95={percentile(ms, 0.95):.2f}  max={ms[-1]:.2f} ms  "
+              f"ops/exec={s['ops'] // count}  rows/exec={s['rows'] / count:.1f}")
+        print(f"    {fp}")
+        endpoint, _ = s['endpoints'].most_common(1)[0]
+        print(f"    endpoint terbesar: {endpoint}")
+        if s['plan']:
+            print(f"    plan ({s['plan_ms']:.1f} ms): {'; '.join(s['plan'])}")
+            if full_scans(s['plan']):
+                print("    !! full scan: " + '; '.join(full_scans(s['plan'])))
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -11,26 +11,20 @@ If the user with the provided email exists the script will update the role to 'a
 import argparse
 import sqlite3
 import os
+import sys
 from werkzeug.security import generate_password_hash
 
-ROOT = os.path.dirname(os.path.dirname(__file__))
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DB_PATH = os.path.join(ROOT, 'database.db')
+sys.path.insert(0, ROOT)
+
+import migrations  # noqa: E402
 
 
 def ensure_db():
-    # ensure database exists and users table has role column
+    # ensure database exists and schema is up to date (same migrations as app.py)
     conn = sqlite3.connect(DB_PATH)
-    cur = conn.cursor()
-    cur.execute("CREATE TABLE IF NOT EXISTS users (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, email TEXT NOT NULL UNIQUE, password TEXT NOT NULL, membership TEXT NOT NULL DEFAULT 'member', created_at TEXT)")
-    # ensure role column
-    cur.execute("PRAGMA table_info(users)")
-    cols = [r[1] for r in cur.fetchall()]
-    if 'role' not in cols:
-        try:
-            cur.execute("ALTER TABLE users ADD COLUMN role TEXT DEFAULT 'user'")
-        except Exception:
-            pass
-    conn.commit()
+    migrations.migrate(conn)
     conn.close()
 
 
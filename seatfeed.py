@@ -0,0 +1,388 @@
+# Feed perubahan kursi untuk halaman /book yang sedang terbuka (Server-Sent
+# Events). Tanpa feed, peta kursi adalah snapshot saat halaman dirender dan
+# pemesan baru tahu kursinya diambil orang lain ketika POST ditolak.
+#
+# Per proses worker ada satu SeatFeed per file database:
+#   - penulis (hold_seats, release_seat_holds, sweep_expired_holds,
+#     save_order_db) memanggil touch() setelah commit; tanpa pelanggan ini
+#     hanya satu lookup dict,
+#   - satu thread hub menghitung ulang kursi tidak tersedia untuk pemutaran
+#     yang punya pelanggan (satu query untuk semua pemutaran yang berubah),
+#     membandingkan dengan keadaan terakhir dan menyusun event delta SEKALI;
+#     bytes yang sama ditambahkan ke antrean setiap pelanggan (fan-out murah),
+#   - tulisan dari worker lain terdeteksi lewat PRAGMA data_version (berubah
+#     setiap ada commit dari koneksi lain) paling sering sekali per
+#     SEAT_FEED_POLL_INTERVAL; hold yang kedaluwarsa tanpa disapu juga dicek.
+#
+# Antrean tiap koneksi dibatasi SEAT_FEED_BUFFER_BYTES. Klien yang terlalu
+# lambat membaca tidak menumpuk delta: antreannya dibuang dan klien menerima
+# snapshot baru (event `snapshot`) dari keadaan di memori, tanpa query.
+#
+# Event di stream:
+#     event: snapshot   data: {"screening_id": 12, "taken": ["A1", ...]}
+#     event: seats      data: {"screening_id": 12, "taken": [...], "freed": [...]}
+# plus komentar heartbeat (": ping") supaya koneksi mati cepat terdeteksi.
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+
+from flask import current_app, has_app_context
+
+import db
+
+HEARTBEAT = b': ping\n\n'
+
+
+class FeedFull(Exception):
+    """Jumlah pelanggan di worker ini sudah mencapai SEAT_FEED_MAX_SUBSCRIBERS"""
+
+
+def _event(name, seq, payload, retry=None):
+    head = f"retry: {retry}\n" if retry else ''
+    data = json.dumps(payload, separators=(',', ':'))
+    return f"{head}id: {seq}\nevent: {name}\ndata: {data}\n\n".encode()
+
+
+class _Screening:
+    """Keadaan satu pemutaran yang punya pelanggan"""
+    __slots__ = ('seq', 'taken', 'expiry', 'subscribers')
+
+    def __init__(self, taken, expiry):
+        self.seq = 0
+        self.taken = taken  # set kursi terjual + ditahan (semua token)
+        self.expiry = expiry  # hold terdekat yang kedaluwarsa (inf = tidak ada)
+        self.subscribers = set()
+
+
+class Subscriber:
+    """Satu koneksi SSE: antrean event (bytes) berbatas + pembangun thread/coroutine"""
+    __slots__ = ('screening_id', 'own', 'pending', 'size', 'resync', 'closed', 'event', 'loop')
+
+    def __init__(self, screening_id, own, event, loop=None):
+        self.screening_id = screening_id
+        self.own = own  # kursi yang ditahan hold_token pelanggan ini sendiri
+        self.pending = deque()
+        self.size = 0
+        self.resync = False
+        self.closed = False
+        self.event = event  # threading.Event, atau asyncio.Event milik `loop`
+        self.loop = loop
+
+
+class SeatFeed:
+    def __init__(self, path, poll_interval=1.0, buffer_bytes=65536, max_subscribers=128,
+                 retry_ms=3000, logger=None):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.buffer_bytes = buffer_bytes
+        self.max_subscribers = max_subscribers
+        self.retry_ms = retry_ms
+        self.logger = logger
+        self.pid = os.getpid()
+        self._lock = threading.Lock()
+        self._screenings = {}  # screening_id -> _Screening
+        self._count = 0
+        self._dirty = set()
+        self._dirty_all = False
+        self._wake = threading.Event()
+        self._thread = None
+        self._closed = False
+        self.events = 0  # delta yang dikirim (per pemutaran, bukan per pelanggan)
+        self.resyncs = 0  # antrean pelanggan yang dibuang karena melewati batas
+
+    # ----- sisi penulis -----
+    def touch(self, screening_id=None):
+        """Kursi pemutaran berubah (None = tidak tahu pemutaran mana)"""
+        if not self._count:
+            return
+        with self._lock:
+            if screening_id is None:
+                self._dirty_all = True
+            else:
+                self._dirty.add(screening_id)
+        self._wake.set()
+
+    # ----- sisi pelanggan -----
+    def subscribe(self, screening_id, hold_token=None, loop=None, event=None):
+        """Daftarkan pelanggan baru; snapshot sudah ada di antreannya.
+
+        Dipanggil di thread yang punya koneksi (request, atau thread aiodb):
+        kursi pemutaran dimuat jika belum dipantau, plus kursi yang ditahan
+        `hold_token` sendiri (tidak ditampilkan sebagai terisi). Raise FeedFull
+        jika batas pelanggan tercapai.
+        """
+        if self._count >= self.max_subscribers:
+            raise FeedFull()
+        conn = db.get_db_connection()
+        own = frozenset()
+        if hold_token:
+            own = frozenset(r[0] for r in conn.execute(
+                "SELECT seat FROM seat_holds WHERE screening_id = ? AND hold_token = ? AND expires_at > ?",
+                (screening_id, hold_token, time.time())))
+        with self._lock:
+            known = screening_id in self._screenings
+        loaded = None if known else self._load(conn, [screening_id]).get(screening_id, (set(), float('inf')))
+        sub = Subscriber(screening_id, own, event if event is not None else threading.Event(), loop)
+        with self._lock:
+            if self._count >= self.max_subscribers:
+                raise FeedFull()
+            state = self._screenings.get(screening_id)
+            if state is None:
+                state = self._screenings[screening_id] = _Screening(*loaded)
+                # Tulisan di antara load dan pendaftaran: hub memuat ulang sekali
+                self._dirty.add(screening_id)
+            state.subscribers.add(sub)
+            self._count += 1
+            self._push_snapshot(sub, state, retry=True)
+        self._ensure_hub()
+        self._wake.set()
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            state = self._screenings.get(sub.screening_id)
+            if state is not None and sub in state.subscribers:
+                state.subscribers.discard(sub)
+                self._count -= 1
+                if not state.subscribers:
+                    del self._screenings[sub.screening_id]
+        sub.closed = True
+
+    def take(self, sub):
+        """Event yang menunggu untuk `sub` (bytes, b'' jika kosong)"""
+        with self._lock:
+            if sub.resync:
+                state = self._screenings.get(sub.screening_id)
+                if state is not None:
+                    self._push_snapshot(sub, state)
+            chunk = b''.join(sub.pending)
+            sub.pending.clear()
+            sub.size = 0
+            return chunk
+
+    def close_all(self):
+        """Akhiri semua stream (shutdown worker); hub berhenti"""
+        with self._lock:
+            self._closed = True
+            subs = [sub for state in self._screenings.values() for sub in state.subscribers]
+            for sub in subs:
+                sub.closed = True
+        self._wake.set()
+        _notify(subs)
+
+    def stats(self):
+        return {'subscribers': self._count, 'screenings': len(self._screenings),
+                'events': self.events, 'resyncs': self.resyncs}
+
+    def _push_snapshot(self, sub, state, retry=False):
+        # dipanggil dengan self._lock
+        sub.pending.clear()
+        sub.pending.append(_event('snapshot', state.seq, {
+            'screening_id': sub.screening_id, 'taken': sorted(state.taken - sub.own)},
+            self.retry_ms if retry else None))
+        sub.size = len(sub.pending[0])
+        sub.resync = False
+
+    # ----- hub -----
+    def _ensure_hub(self):
+        with self._lock:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name='seat-feed', daemon=True)
+                self._thread.start()
+
+    def _load(self, conn, screening_ids):
+        """{screening_id: (set kursi tidak tersedia, hold terdekat yang kedaluwarsa)}"""
+        now = time.time()
+        result = {sid: (set(), float('inf')) for sid in screening_ids}
+        placeholders = ', '.join('?' for _ in result)
+        cur = conn.execute(
+            f"""SELECT screening_id, seat, NULL FROM order_seats WHERE screening_id IN ({placeholders})
+                UNION ALL
+                SELECT screening_id, seat, expires_at FROM seat_holds
+                WHERE screening_id IN ({placeholders}) AND expires_at > ?""",
+            (*result, *result, now)
+        )
+        for sid, seat, expires_at in cur:
+            taken, expiry = result[sid]
+            taken.add(seat)
+            if expires_at is not None and expires_at < expiry:
+                result[sid] = (taken, expires_at)
+        return result
+
+    def _run(self):
+        conn = db.connect(self.path, check_same_thread=False)
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        checked = time.monotonic()
+        try:
+            while not self._closed:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+                if self._closed:
+                    return
+                if not self._count:
+                    continue
+                try:
+                    if time.monotonic() - checked >= self.poll_interval:
+                        # Commit dari worker/proses lain (dan koneksi pool proses ini)
+                        checked = time.monotonic()
+                        current = conn.execute("PRAGMA data_version").fetchone()[0]
+                        if current != version:
+                            version = current
+                            self._dirty_all = True
+                    self._refresh(conn)
+                except sqlite3.Error as e:
+                    # Perubahan yang belum terkirim dicoba lagi di putaran berikutnya
+                    self._dirty_all = True
+                    if self.logger is not None:
+                        self.logger.warning('Feed kursi gagal membaca database: %s', e)
+        finally:
+            conn.close()
+
+    def _refresh(self, conn):
+        now = time.time()
+        with self._lock:
+            if self._dirty_all:
+                ids = set(self._screenings)
+            else:
+                ids = {sid for sid in self._dirty if sid in self._screenings}
+                ids.update(sid for sid, state in self._screenings.items() if state.expiry <= now)
+            self._dirty.clear()
+            self._dirty_all = False
+        if not ids:
+            return
+        loaded = self._load(conn, list(ids))
+        woken = []
+        with self._lock:
+            for sid, (taken, expiry) in loaded.items():
+                state = self._screenings.get(sid)
+                if state is None:
+                    continue
+                state.expiry = expiry
+                added, freed = taken - state.taken, state.taken - taken
+                if not added and not freed:
+                    continue
+                state.taken = taken
+                state.seq += 1
+                self.events += 1
+                chunk = _event('seats', state.seq, {
+                    'screening_id': sid, 'taken': sorted(added), 'freed': sorted(freed)})
+                for sub in state.subscribers:
+                    if sub.resync:
+                        continue
+                    if sub.size + len(chunk) > self.buffer_bytes:
+                        # Pelanggan lambat: buang antrean, kirim snapshot saat ia membaca lagi
+                        sub.pending.clear()
+                        sub.size = 0
+                        sub.resync = True
+                        self.resyncs += 1
+                    else:
+                        sub.pending.append(chunk)
+                        sub.size += len(chunk)
+                    woken.append(sub)
+        _notify(woken)
+
+
+def _notify(subs):
+    """Bangunkan pembaca: threading.Event langsung, asyncio.Event sekali per event loop"""
+    by_loop = {}
+    for sub in subs:
+        if sub.loop is None:
+            sub.event.set()
+        else:
+            by_loop.setdefault(sub.loop, []).append(sub.event)
+    for loop, events in by_loop.items():
+        try:
+            loop.call_soon_threadsafe(_set_all, events)
+        except RuntimeError:
+            pass  # event loop sudah ditutup
+
+
+def _set_all(events):
+    for event in events:
+        event.set()
+
+
+_feeds = {}
+_feeds_lock = threading.Lock()
+
+
+def get_feed(app=None):
+    """SeatFeed proses ini untuk database aplikasi (dibuat sekali per proses)"""
+    app = app or current_app
+    path = app.config['DATABASE']
+    feed = _feeds.get(path)
+    if feed is not None and feed.pid == os.getpid():
+        return feed
+    with _feeds_lock:
+        feed = _feeds.get(path)
+        if feed is None or feed.pid != os.getpid():
+            feed = _feeds[path] = SeatFeed(
+                path, app.config['SEAT_FEED_POLL_INTERVAL'], app.config['SEAT_FEED_BUFFER_BYTES'],
+                app.config['SEAT_FEED_MAX_SUBSCRIBERS'], app.config['SEAT_FEED_RETRY_MS'], app.logger)
+        return feed
+
+
+def touch(screening_id=None):
+    """Dipanggil penulis kursi setelah commit; murah jika tidak ada pelanggan"""
+    if not has_app_context():
+        return
+    feed = _feeds.get(current_app.config['DATABASE'])
+    if feed is not None and feed.pid == os.getpid():
+        feed.touch(screening_id)
+
+
+def close_all():
+    """Akhiri semua stream proses ini (dipanggil saat worker berhenti)"""
+    with _feeds_lock:
+        for path, feed in list(_feeds.items()):
+            if feed.pid == os.getpid():
+                feed.close_all()
+                del _feeds[path]
+
+
+def stats():
+    """Jumlahan semua feed proses ini (untuk /admin/metrics)"""
+    total = {'subscribers': 0, 'screenings': 0, 'events': 0, 'resyncs': 0}
+    for feed in list(_feeds.values()):
+        if feed.pid == os.getpid():
+            for key, value in feed.stats().items():
+                total[key] += value
+    return total
+
+
+def iter_events(feed, sub, heartbeat, max_age):
+    """Body WSGI: event untuk `sub` sampai klien putus, max_age lewat atau shutdown.
+
+    Setiap stream memegang satu thread server selama terbuka; mode async
+    (asgi.py) menunggu di event loop tanpa thread per koneksi.
+    """
+    deadline = time.monotonic() + max_age
+    try:
+        while True:
+            chunk = feed.take(sub)
+            if chunk:
+                yield chunk
+            remaining = deadline - time.monotonic()
+            if sub.closed or remaining <= 0:
+                return
+            if not sub.event.wait(min(heartbeat, remaining)):
+                yield HEARTBEAT  # tulis gagal = klien sudah pergi, generator ditutup server
+            sub.event.clear()
+    finally:
+        feed.unsubscribe(sub)
+
+
+def init_app(app):
+    """Konfigurasi feed kursi (SSE)"""
+    app.config.setdefault('SEAT_FEED_ENABLED', True)
+    app.config.setdefault('SEAT_FEED_POLL_INTERVAL', 1.0)  # detik, deteksi tulisan worker lain
+    app.config.setdefault('SEAT_FEED_BUFFER_BYTES', 65536)  # batas antrean per koneksi
+    # Per proses. Di server sync setiap stream memegang satu thread werkzeug selama
+    # koneksi terbuka, jadi batasnya kecil; mode async boleh jauh lebih besar
+    app.config.setdefault('SEAT_FEED_MAX_SUBSCRIBERS', 128)
+    app.config.setdefault('SEAT_FEED_HEARTBEAT', 15.0)  # detik
+    app.config.setdefault('SEAT_FEED_MAX_AGE', 600.0)  # detik, lalu browser menyambung ulang
+    app.config.setdefault('SEAT_FEED_RETRY_MS', 3000)
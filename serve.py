@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# Server produksi multi-proses (pre-fork).
+#
+# Proses master menjalankan migrasi + seed sekali, memanaskan template dan
+# katalog, lalu fork N worker yang berbagi satu socket listen (kernel membagi
+# accept() antar worker). Setiap worker menjalankan server WSGI threaded
+# werkzeug dengan pool koneksi database sendiri.
+#
+# SIGHUP = reload tanpa downtime: master memastikan kode baru bisa di-import,
+# lalu exec ulang dirinya dengan socket listen yang sama. Master baru
+# menjalankan migrasi, menyiapkan worker generasi baru, dan baru setelah semua
+# siap menghentikan worker lama dengan halus (request yang sedang berjalan,
+# termasuk pembayaran, diselesaikan dulu). Selama itu worker lama tetap melayani.
+#
+#     python serve.py --workers 4 --port 8000
+#     kill -HUP <pid master>        # reload kode
+#     kill -TERM <pid master>       # berhenti dengan halus
+import time
+
+STARTED = time.monotonic()  # sebelum import app, jadi waktu startup termasuk import
+
+import argparse  # noqa: E402
+import os  # noqa: E402
+import select  # noqa: E402
+import signal  # noqa: E402
+import socket  # noqa: E402
+import subprocess  # noqa: E402
+import sys  # noqa: E402
+import threading  # noqa: E402
+import traceback  # noqa: E402
+
+from werkzeug.serving import ThreadedWSGIServer, WSGIRequestHandler  # noqa: E402
+
+import app as cinema  # noqa: E402
+import db  # noqa: E402
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def log(message):
+    print(f"[serve {os.getpid()}] {message}", file=sys.stderr, flush=True)
+
+
+class WorkerServer(ThreadedWSGIServer):
+    """Server werkzeug satu worker. Thread request bukan daemon, jadi
+    server_close() menunggu request yang sedang berjalan (graceful stop)."""
+    daemon_threads = False
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+def listen(host, port, backlog):
+    sock = socket.socket(socket.AF_INET6 if ':' in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    return sock
+
+
+def run_worker(flask_app, listener, index, ready_fd, args):
+    """Badan proses worker: buka pool sendiri, beri tahu master, layani request"""
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)  # reload diurus master
+    handler = WSGIRequestHandler if args.access_log else QuietRequestHandler
+    host, port = listener.getsockname()[:2]
+    server = WorkerServer(host, port, flask_app, handler, fd=listener.fileno())
+
+    def stop(signum, frame):
+        # Stream SSE feed kursi tidak pernah selesai sendiri: akhiri supaya
+        # server_close() tidak menunggu koneksi itu (browser menyambung ke worker lain)
+        cinema.seatfeed.close_all()
+        # shutdown() menunggu serve_forever selesai, jadi jangan dari thread yang sama
+        threading.Thread(target=server.shutdown, daemon=True).start()
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    # Master menutup koneksinya sebelum fork; isi pool worker ini di depan
+    pool = db.get_pool(flask_app.config['DATABASE'], flask_app.config['DB_POOL_SIZE'])
+    for conn in [pool.acquire() for _ in range(pool.max_size)]:
+        pool.release(conn)
+    if index == 0:
+        with flask_app.app_context():
+            cinema.posters.schedule_missing()
+
+    os.write(ready_fd, b'1')
+    os.close(ready_fd)
+    server.serve_forever()
+    server.server_close()
+    db.close_pools()
+    # Worker keluar lewat os._exit (tanpa atexit): hentikan pool hashing di sini
+    cinema.passwords.hasher.shutdown()
+
+
+class Master:
+    """Supervisor worker: spawn, respawn jika mati, reload (SIGHUP), stop (SIGTERM/SIGINT)"""
+    def __init__(self, flask_app, listener, args):
+        self.app = flask_app
+        self.listener = listener
+        self.args = args
+        self.workers = {}  # pid -> nomor worker
+        self.retiring = set()  # worker generasi lama (sedang dihentikan)
+        self.pending = []
+        self.stopping = False
+
+    def spawn(self, index):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            code = 0
+            try:
+                run_worker(self.app, self.listener, index, write_fd, self.args)
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                os._exit(code)
+        os.close(write_fd)
+        self.workers[pid] = index
+        return pid, read_fd
+
+    def spawn_ready(self, indexes):
+        """Fork worker lalu tunggu semuanya siap; kembalikan jumlah yang siap"""
+        waiting = dict(self.spawn(index) for index in indexes)
+        deadline = time.monotonic() + self.args.ready_timeout
+        ready = 0
+        while waiting and time.monotonic() < deadline:
+            readable, _, _ = select.select(list(waiting.values()), [], [], deadline - time.monotonic())
+            for pid, fd in list(waiting.items()):
+                if fd in readable:
+                    ready += os.read(fd, 1) == b'1'  # EOF tanpa data = worker mati saat start
+                    os.close(fd)
+                    del waiting[pid]
+        for fd in waiting.values():
+            os.close(fd)
+        return ready
+
+    def retire(self, pids):
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+                self.retiring.add(pid)
+            except ProcessLookupError:
+                pass
+
+    def reap(self):
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            self.retiring.discard(pid)
+            index = self.workers.pop(pid, None)
+            if index is not None and not self.stopping:
+                log(f"worker {index} (pid {pid}) berhenti dengan status {status}, diganti")
+                self.spawn_ready([index])
+
+    def reload(self):
+        """Exec ulang master (kode baru) dengan socket yang sama; worker sekarang
+        diserahkan ke master baru untuk dihentikan setelah generasi baru siap"""
+        requested = time.monotonic()
+        check = subprocess.run([sys.executable, '-c', 'import app'], cwd=ROOT, capture_output=True, text=True)
+        if check.returncode != 0:
+            log("reload dibatalkan, kode baru gagal di-import:\n" + check.stderr.strip()[-2000:])
+            return
+        os.set_inheritable(self.listener.fileno(), True)
+        argv = [sys.executable, os.path.abspath(__file__),
+                '--host', self.args.host, '--port', str(self.args.port),
+                '--workers', str(self.args.workers), '--backlog', str(self.args.backlog),
+                '--graceful-timeout', str(self.args.graceful_timeout),
+                '--ready-timeout', str(self.args.ready_timeout),
+                '--listen-fd', str(self.listener.fileno()),
+                '--retire', ','.join(str(pid) for pid in list(self.workers) + list(self.retiring)),
+                '--reload-requested', repr(requested)]
+        if self.args.access_log:
+            argv.append('--access-log')
+        if self.args.database:
+            argv += ['--database', self.args.database]
+        log("reload: exec master baru")
+        os.execv(sys.executable, argv)
+
+    def stop(self):
+        self.stopping = True
+        self.retire(list(self.workers) + list(self.retiring))
+        deadline = time.monotonic() + self.args.graceful_timeout
+        while (self.workers or self.retiring) and time.monotonic() < deadline:
+            self.reap()
+            time.sleep(0.1)
+        for pid in set(self.workers) | self.retiring:
+            log(f"worker pid {pid} belum selesai setelah {self.args.graceful_timeout:.0f} s, dihentikan paksa")
+            try:
+                os.kill(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
+        self.listener.close()
+
+    def run(self):
+        wake_r, wake_w = os.pipe()
+        os.set_blocking(wake_w, False)
+        signal.set_wakeup_fd(wake_w)
+        signal.signal(signal.SIGHUP, lambda signum, frame: self.pending.append('reload'))
+        signal.signal(signal.SIGTERM, lambda signum, frame: self.pending.append('stop'))
+        signal.signal(signal.SIGINT, lambda signum, frame: self.pending.append('stop'))
+        signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+        while True:
+            if select.select([wake_r], [], [], 1.0)[0]:
+                os.read(wake_r, 512)
+            self.reap()
+            if 'stop' in self.pending:
+                log("berhenti: menunggu request yang sedang berjalan")
+                self.stop()
+                return
+            if 'reload' in self.pending:
+                self.pending.clear()
+                self.reload()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Server produksi pre-fork AbsoluteCinematic')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--backlog', type=int, default=1024)
+    parser.add_argument('--graceful-timeout', type=float, default=30.0)
+    parser.add_argument('--ready-timeout', type=float, default=30.0)
+    parser.add_argument('--access-log', action='store_true')
+    parser.add_argument('--database', help='file SQLite (default: database.db di samping app.py)')
+    # Dipakai master lama saat reload (SIGHUP)
+    parser.add_argument('--listen-fd', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--retire', default='', help=argparse.SUPPRESS)
+    parser.add_argument('--reload-requested', type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    flask_app = cinema.configure_app({'DATABASE': args.database} if args.database else None)
+    imported = time.monotonic()
+    if args.listen_fd is not None:
+        listener = socket.socket(fileno=args.listen_fd)
+    else:
+        listener = listen(args.host, args.port, args.backlog)
+    # Poster diambil worker 0 setelah fork, bukan thread di master
+    cinema.prepare_app(flask_app, fetch_posters=False)
+    prepared = time.monotonic()
+    cinema.warm_app(flask_app)
+    # Koneksi SQLite tidak boleh dibawa melewati fork
+    db.close_pools()
+    warmed = time.monotonic()
+    log(f"import {1000 * (imported - STARTED):.0f} ms, migrasi + seed {1000 * (prepared - imported):.0f} ms, "
+        f"warm-up {1000 * (warmed - prepared):.0f} ms")
+
+    if not hasattr(os, 'fork'):
+        # Windows: tanpa fork, satu proses threaded
+        log(f"fork tidak tersedia, satu proses di http://{args.host}:{args.port}")
+        with flask_app.app_context():
+            cinema.posters.schedule_missing()
+        handler = WSGIRequestHandler if args.access_log else QuietRequestHandler
+        WorkerServer(args.host, args.port, flask_app, handler, fd=listener.fileno()).serve_forever()
+        return
+
+    master = Master(flask_app, listener, args)
+    ready = master.spawn_ready(range(args.workers))
+    log(f"{ready}/{args.workers} worker siap dalam {1000 * (time.monotonic() - warmed):.0f} ms, "
+        f"startup total {1000 * (time.monotonic() - STARTED):.0f} ms (http://{args.host}:{args.port})")
+
+    old = [int(pid) for pid in args.retire.split(',') if pid]
+    if old:
+        if ready == args.workers:
+            master.retire(old)
+            log(f"reload selesai {1000 * (time.monotonic() - args.reload_requested):.0f} ms setelah SIGHUP, "
+                f"{len(old)} worker lama dihentikan dengan halus")
+        else:
+            # Generasi baru tidak lengkap: worker lama tetap melayani (dihentikan
+            # saat reload/stop berikutnya)
+            master.retiring.update(old)
+            log("reload: tidak semua worker baru siap, worker lama dipertahankan")
+    master.run()
+
+
+if __name__ == '__main__':
+    main()
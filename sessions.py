@@ -0,0 +1,228 @@
+# Session server-side: isi session (user, pending_order, hold_token) disimpan
+# di tabel SQLite `sessions` dengan cache LRU in-process di depannya. Cookie
+# hanya membawa ID acak, jadi tidak ada serialisasi + HMAC seluruh isi session
+# di setiap request dan pesanan banyak kursi tidak membengkakkan header.
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from flask import current_app, session
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SecureCookieSessionInterface, SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+import db
+
+serializer = TaggedJSONSerializer()
+# Key environ untuk session yang sudah dibuka di luar RequestContext.push()
+# (asgi.py membukanya di thread aiodb, bukan di event loop)
+PRELOADED_KEY = 'cinema.session'
+# File statis/asset/media/poster tidak memakai session: tanpa query ke tabel sessions
+SESSIONLESS_ENDPOINTS = ('static', 'asset_file', 'media_file', 'poster_file')
+
+
+class ServerSideSession(CallbackDict, SessionMixin):
+    """Session yang isinya disimpan di server; `sid` adalah isi cookie"""
+    def __init__(self, initial=None, sid=None, version=0, expires_at=0.0):
+        def on_update(self):
+            self.modified = True
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.version = version
+        self.expires_at = expires_at
+        self.new = sid is None
+        self.modified = False
+
+
+class SqliteSessionStore:
+    """Tabel `sessions` + LRU in-process berisi data yang sudah diserialisasi.
+
+    Setiap penyimpanan menaikkan kolom version. Saat membuka session cukup
+    membaca (version, expires_at) lewat primary key; data hanya diambil dan
+    di-parse ulang jika versinya berbeda dengan salinan di LRU (mis. session
+    diubah worker lain).
+    """
+    def __init__(self, cache_size=1024):
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()  # (path database, sid) -> (version, data)
+        self._last_sweep = time.monotonic()
+
+    def load(self, conn, path, sid):
+        row = conn.execute("SELECT version, expires_at FROM sessions WHERE sid = ?", (sid,)).fetchone()
+        if row is None or row['expires_at'] < time.time():
+            self.forget(path, sid)
+            return None
+        key = (path, sid)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and cached[0] == row['version']:
+                self._cache.move_to_end(key)
+                return row['version'], row['expires_at'], cached[1]
+        data = conn.execute("SELECT data FROM sessions WHERE sid = ?", (sid,)).fetchone()
+        if data is None:
+            return None
+        self._remember(key, row['version'], data['data'])
+        return row['version'], row['expires_at'], data['data']
+
+    def save(self, conn, path, sid, data, expires_at):
+        row = conn.execute(
+            """INSERT INTO sessions (sid, data, version, expires_at) VALUES (?, ?, 1, ?)
+               ON CONFLICT(sid) DO UPDATE SET
+                   data = excluded.data, version = version + 1, expires_at = excluded.expires_at
+               RETURNING version""",
+            (sid, data, expires_at)
+        ).fetchone()
+        conn.commit()
+        self._remember((path, sid), row['version'], data)
+        return row['version']
+
+    def touch(self, conn, sid, expires_at):
+        conn.execute("UPDATE sessions SET expires_at = ? WHERE sid = ?", (expires_at, sid))
+        conn.commit()
+
+    def delete(self, conn, path, sid):
+        conn.execute("DELETE FROM sessions WHERE sid = ?", (sid,))
+        conn.commit()
+        self.forget(path, sid)
+
+    def sweep(self, conn, interval):
+        """Hapus session kedaluwarsa, paling sering sekali per interval per proses"""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_sweep < interval:
+                return 0
+            self._last_sweep = now
+        cur = conn.execute("DELETE FROM sessions WHERE expires_at < ?", (time.time(),))
+        conn.commit()
+        return cur.rowcount
+
+    def _remember(self, key, version, data):
+        with self._lock:
+            self._cache[key] = (version, data)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def forget(self, path, sid):
+        with self._lock:
+            self._cache.pop((path, sid), None)
+
+
+class ServerSideSessionInterface(SessionInterface):
+    """SessionInterface Flask yang memakai SqliteSessionStore"""
+    session_class = ServerSideSession
+
+    def __init__(self, store):
+        self.store = store
+        self._sessionless = None
+
+    def _sessionless_prefixes(self, app):
+        """Awalan URL endpoint SESSIONLESS_ENDPOINTS, mis. '/static/'.
+
+        Session dibuka sebelum URL di-match (request.endpoint masih None),
+        jadi yang dicek path-nya.
+        """
+        if self._sessionless is None:
+            self._sessionless = tuple(rule.rule.split('<', 1)[0] for rule in app.url_map.iter_rules()
+                                      if rule.endpoint in SESSIONLESS_ENDPOINTS)
+        return self._sessionless
+
+    def _lifetime(self, app):
+        return app.permanent_session_lifetime.total_seconds()
+
+    def open_session(self, app, request):
+        preloaded = request.environ.pop(PRELOADED_KEY, None)
+        if preloaded is not None:
+            return preloaded
+        if request.path.startswith(self._sessionless_prefixes(app)):
+            # Null session: dibaca kosong dan tidak pernah disimpan
+            return self.make_null_session(app)
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            loaded = self.store.load(db.get_db_connection(), app.config['DATABASE'], sid)
+            if loaded is not None:
+                version, expires_at, data = loaded
+                return self.session_class(serializer.loads(data), sid=sid, version=version, expires_at=expires_at)
+        # Cookie kosong, tidak dikenal atau kedaluwarsa: session baru (ID tidak
+        # pernah diambil dari klien supaya tidak bisa dipaksakan/fixation)
+        return self.session_class()
+
+    def regenerate(self, app, session):
+        """Buang ID session lama; save_session memberi ID dan cookie baru.
+
+        Dipanggil saat status login berubah, supaya ID yang sudah diketahui
+        pihak lain sebelum login tidak ikut menjadi session yang terautentikasi.
+        """
+        if session.sid:
+            self.store.delete(db.get_db_connection(), app.config['DATABASE'], session.sid)
+        session.sid = None
+        session.version = 0
+        session.new = True
+        session.modified = True
+
+    def save_session(self, app, session, response):
+        conn = db.get_db_connection()
+        path = app.config['DATABASE']
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        cookie_path = self.get_cookie_path(app)
+        self.store.sweep(conn, app.config['SESSION_SWEEP_INTERVAL'])
+
+        if not session:
+            if session.modified:
+                if session.sid:
+                    self.store.delete(conn, path, session.sid)
+                response.delete_cookie(name, domain=domain, path=cookie_path,
+                                       secure=self.get_cookie_secure(app),
+                                       samesite=self.get_cookie_samesite(app),
+                                       httponly=self.get_cookie_httponly(app))
+                response.vary.add('Cookie')
+            return
+
+        lifetime = self._lifetime(app)
+        expires_at = time.time() + lifetime
+        set_cookie = session.new
+        if session.modified or session.new:
+            if session.sid is None:
+                session.sid = secrets.token_urlsafe(32)
+            session.version = self.store.save(conn, path, session.sid, serializer.dumps(dict(session)), expires_at)
+            set_cookie = set_cookie or session.permanent
+        elif session.expires_at - time.time() < lifetime / 2:
+            # Perpanjang masa berlaku tanpa menulis ulang data (paling sering 2x per lifetime)
+            self.store.touch(conn, session.sid, expires_at)
+            set_cookie = session.permanent
+        response.vary.add('Cookie')
+        if not set_cookie and not self.should_set_cookie(app, session):
+            return
+        cookie_expires = None
+        if session.permanent:
+            cookie_expires = datetime.fromtimestamp(expires_at, timezone.utc)
+        response.set_cookie(
+            name, session.sid, expires=cookie_expires,
+            httponly=self.get_cookie_httponly(app), domain=domain, path=cookie_path,
+            secure=self.get_cookie_secure(app), samesite=self.get_cookie_samesite(app),
+        )
+
+
+def regenerate():
+    """Ganti ID session request ini (login, registrasi, logout); cegah session fixation.
+
+    Session cookie bawaan Flask tidak punya ID di server, jadi tidak perlu apa-apa.
+    """
+    interface = current_app.session_interface
+    if isinstance(interface, ServerSideSessionInterface):
+        interface.regenerate(current_app, session)
+
+
+def init_app(app):
+    """Pilih backend session: 'sqlite' (server-side, default) atau 'cookie' (bawaan Flask)"""
+    app.config.setdefault('SESSION_BACKEND', 'sqlite')
+    app.config.setdefault('SESSION_CACHE_SIZE', 1024)
+    app.config.setdefault('SESSION_SWEEP_INTERVAL', 300)  # detik
+    if app.config['SESSION_BACKEND'] == 'sqlite':
+        app.session_interface = ServerSideSessionInterface(SqliteSessionStore(app.config['SESSION_CACHE_SIZE']))
+    else:
+        app.session_interface = SecureCookieSessionInterface()
@@ -0,0 +1,270 @@
+let currentBookedSeats = [];
+
+// Array to store selected seats
+let selectedSeats = [];
+
+// Studio yang denahnya sedang ditampilkan
+let currentHall = null;
+
+// Denah run-length -> list baris sel, mis. "4R_2R*2" -> ["RRRR_RR", "RRRR_RR"]
+// (R/V/W = kursi, "_" = lorong, "." = celah, baris kosong = lorong melintang)
+function expandLayout(encoded) {
+  const rows = [];
+  encoded.split("/").forEach((part) => {
+    const [row, times] = part.split("*");
+    const cells = row.replace(/(\d+)(\D)/g, (_, n, code) => code.repeat(Number(n)));
+    for (let i = 0; i < Number(times || 1); i++) rows.push(cells);
+  });
+  return rows;
+}
+
+// 0 -> A, 25 -> Z, 26 -> AA (sama dengan auditoriums.row_label)
+function rowLabel(index) {
+  let label = "";
+  for (let n = index + 1; n > 0; n = Math.floor((n - 1) / 26)) {
+    label = String.fromCharCode(65 + ((n - 1) % 26)) + label;
+  }
+  return label;
+}
+
+function renderSeatMap(hall) {
+  if (!(hall in seatLayouts)) hall = Object.keys(seatLayouts)[0];
+  if (hall === currentHall) return;
+  currentHall = hall;
+
+  const rows = expandLayout(seatLayouts[hall]);
+  const width = Math.max(...rows.map((cells) => cells.length));
+  const html = [];
+  let seatRow = 0;
+  rows.forEach((cells) => {
+    if (![...cells].some((code) => code in seatTypes)) {
+      html.push('<div class="seat-aisle-row"></div>');
+      return;
+    }
+    const letter = rowLabel(seatRow++);
+    let number = 0;
+    for (const code of cells.padEnd(width, ".")) {
+      if (!(code in seatTypes)) {
+        html.push('<div class="seat-gap"></div>');
+        continue;
+      }
+      const seat = letter + ++number;
+      const [typeName, tier] = seatTypes[code];
+      html.push(
+        `<div class="seat seat-${code}" id="seat-${seat}" data-seat="${seat}" ` +
+          `data-tier="${tier}" title="${seat} · ${typeName}">${seat}</div>`
+      );
+    }
+  });
+
+  const grid = document.getElementById("seatMap");
+  grid.style.setProperty("--cols", width);
+  grid.innerHTML = html.join("");
+}
+
+function updateBookedSeatsDisplay() {
+  // Get current showtime and ticket type
+  const showtimeSelect = document.querySelector('select[name="screening_id"]');
+  const showtime = showtimeSelect.value;
+  const ticketType = document.querySelector(
+    'select[name="ticket_type"]'
+  ).value;
+
+  if (showtime) {
+    renderSeatMap(showtimeSelect.options[showtimeSelect.selectedIndex].dataset.hall);
+  }
+
+  // Kursi di denah bertier hanya punya satu tipe tiket, tapi order lama bisa
+  // memakai kursi yang sama dengan tipe lain: gabungkan semua tipe
+  currentBookedSeats = Object.values(bookedSeatsByShowtime[showtime] || {}).flat();
+
+  // Update visual display of all seats
+  const allSeats = document.querySelectorAll(".seat");
+  allSeats.forEach((seatEl) => {
+    const seatId = seatEl.dataset.seat;
+
+    seatEl.classList.toggle("booked", currentBookedSeats.includes(seatId));
+    // Kursi di luar tier tiket yang dipilih tidak bisa dipilih
+    seatEl.classList.toggle("other-tier", !!ticketType && seatEl.dataset.tier !== ticketType);
+  });
+}
+
+// Ambil ulang kursi terjual dari server (ETag => 304 jika tidak berubah)
+function refreshAvailability() {
+  fetch(availabilityUrl, { cache: "no-cache" })
+    .then((res) => (res.ok ? res.json() : null))
+    .then((data) => {
+      if (!data) return;
+      bookedSeatsByShowtime = data.booked_seats_by_showtime;
+      updateBookedSeatsDisplay();
+      releaseTakenSelections();
+    })
+    .catch(() => {});
+}
+
+// Lepas kursi terpilih yang ternyata sudah terjual / ditahan orang lain
+function releaseTakenSelections() {
+  const taken = selectedSeats.filter((s) => currentBookedSeats.includes(s));
+  if (taken.length) {
+    taken.forEach((seat) => {
+      const el = document.getElementById("seat-" + seat);
+      if (el) el.classList.remove("selected");
+    });
+    selectedSeats = selectedSeats.filter((s) => !taken.includes(s));
+    document.getElementById("seatInput").value = selectedSeats.join(", ");
+    updateSummary();
+  }
+}
+
+// Feed live (SSE) untuk pemutaran terpilih: event "snapshot" berisi semua kursi
+// tidak tersedia, event "seats" hanya kursi yang baru terisi/lepas. Jika browser
+// atau server menolak (503 saat koneksi live penuh), refresh berkala tetap jalan.
+let seatFeed = null;
+
+function applySeatEvent(data, snapshot) {
+  const id = String(data.screening_id);
+  const booked = new Set(snapshot ? [] : Object.values(bookedSeatsByShowtime[id] || {}).flat());
+  data.taken.forEach((seat) => booked.add(seat));
+  (data.freed || []).forEach((seat) => booked.delete(seat));
+  bookedSeatsByShowtime[id] = { all: [...booked] };
+  if (document.querySelector('select[name="screening_id"]').value === id) {
+    updateBookedSeatsDisplay();
+    releaseTakenSelections();
+  }
+}
+
+function openSeatFeed() {
+  if (seatFeed) seatFeed.close();
+  seatFeed = null;
+  const screeningId = document.querySelector('select[name="screening_id"]').value;
+  if (!screeningId || !window.EventSource || document.hidden) return;
+  seatFeed = new EventSource(seatFeedUrl.replace("/screenings/0/", `/screenings/${screeningId}/`));
+  seatFeed.addEventListener("snapshot", (e) => applySeatEvent(JSON.parse(e.data), true));
+  seatFeed.addEventListener("seats", (e) => applySeatEvent(JSON.parse(e.data), false));
+}
+
+function seatFeedLive() {
+  return seatFeed !== null && seatFeed.readyState === EventSource.OPEN;
+}
+
+function selectSeat(seat) {
+  const el = document.getElementById("seat-" + seat);
+
+  if (!el || el.classList.contains("booked") || el.classList.contains("other-tier")) {
+    return; // Can't select booked seats / kursi tier lain
+  }
+
+  // Toggle seat selection
+  if (el.classList.contains("selected")) {
+    el.classList.remove("selected");
+    selectedSeats = selectedSeats.filter((s) => s !== seat);
+  } else {
+    el.classList.add("selected");
+    selectedSeats.push(seat);
+  }
+
+  // Update form and summary
+  document.getElementById("seatInput").value = selectedSeats.join(", ");
+  updateSummary();
+}
+
+function updateSummary() {
+  const seatsText = selectedSeats.join(", ") || "-";
+  const ticketType = document.querySelector(
+    'select[name="ticket_type"]'
+  ).value;
+  const showtimeSelect = document.querySelector('select[name="screening_id"]');
+  const showtime = showtimeSelect.value
+    ? showtimeSelect.options[showtimeSelect.selectedIndex].text
+    : "-";
+
+  document.getElementById("summarySeats").textContent = seatsText;
+  document.getElementById("summaryType").textContent =
+    ticketType || "-";
+  document.getElementById("summaryShowtime").textContent = showtime;
+
+  // Only show price if ticket type is selected and seats are selected
+  if (ticketType && selectedSeats.length > 0) {
+    let pricePerSeat = ticketType === "VIP" ? 75000 : 50000;
+
+    // Apply membership discount preview (guest/member/vip)
+    let discount = 0;
+    if (userMembership === 'member') discount = 0.02;
+    else if (userMembership === 'vip') discount = 0.05;
+    pricePerSeat = Math.round(pricePerSeat * (1 - discount));
+
+    const adminFeePerSeat = 5000; // Biaya admin per kursi
+    const totalPricePerSeat = pricePerSeat + adminFeePerSeat;
+    const totalPrice = totalPricePerSeat * selectedSeats.length;
+
+    document.getElementById("summaryPrice").textContent =
+      "Rp " + totalPricePerSeat.toLocaleString("id-ID");
+    document.getElementById("summaryTotal").textContent =
+      "Rp " + totalPrice.toLocaleString("id-ID");
+  } else {
+    document.getElementById("summaryPrice").textContent = "-";
+    document.getElementById("summaryTotal").textContent = "-";
+  }
+}
+
+function clearSeats() {
+  // Clear all selected seats visually and in array
+  selectedSeats.forEach((seat) => {
+    const el = document.getElementById("seat-" + seat);
+    if (el) {
+      el.classList.remove("selected");
+    }
+  });
+  selectedSeats = [];
+  document.getElementById("seatInput").value = "";
+  updateSummary();
+}
+
+// Event listener untuk jenis tiket
+document
+  .querySelector('select[name="ticket_type"]')
+  .addEventListener("change", function () {
+    // Reset jadwal tayang
+    document.querySelector('select[name="screening_id"]').value = "";
+    openSeatFeed();
+    // Reset kursi
+    clearSeats();
+    updateBookedSeatsDisplay();
+    updateSummary();
+  });
+
+// Event listener untuk jadwal tayang
+document
+  .querySelector('select[name="screening_id"]')
+  .addEventListener("change", function () {
+    // Update booked seats display based on selected showtime
+    updateBookedSeatsDisplay();
+    // Reset kursi saat jadwal berubah
+    clearSeats();
+    updateSummary();
+    openSeatFeed();
+    if (!seatFeed) refreshAvailability();
+  });
+
+// Refresh peta kursi berkala selama tab terlihat dan feed live tidak tersambung
+setInterval(() => {
+  if (!document.hidden && !seatFeedLive()) refreshAvailability();
+}, 30000);
+// Tab tersembunyi melepas koneksi live; saat terlihat lagi snapshot baru dikirim
+document.addEventListener("visibilitychange", () => {
+  openSeatFeed();
+  if (!document.hidden && !seatFeed) refreshAvailability();
+});
+
+// Satu listener untuk semua kursi (denah dibentuk ulang saat studio berganti)
+document.getElementById("seatMap").addEventListener("click", (event) => {
+  const el = event.target.closest(".seat");
+  if (el) selectSeat(el.dataset.seat);
+});
+
+// Initialize on page load
+const firstScreening = document.querySelector('select[name="screening_id"] option[data-hall]');
+renderSeatMap(firstScreening ? firstScreening.dataset.hall : null);
+updateBookedSeatsDisplay();
+updateSummary();
+openSeatFeed();
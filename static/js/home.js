@@ -0,0 +1,101 @@
+// Client-side pagination: show 2 rows per page.
+(function () {
+  const containerSelector = ".movies-section .row.g-4";
+  const itemSelector = containerSelector + ' > [class*="col-"]';
+  const items = Array.from(document.querySelectorAll(itemSelector));
+  const prevBtn = document.getElementById("prevPage");
+  const nextBtn = document.getElementById("nextPage");
+  const pageNumbersContainer = document.getElementById("pageNumbers");
+  const paginationWrap = document.getElementById("moviesPagination");
+
+  if (!items.length) {
+    paginationWrap.style.display = "none";
+    return;
+  }
+
+  let currentPage = 1;
+  let itemsPerPage = calcItemsPerPage();
+
+  function calcItemsPerPage() {
+    // On md and up (>=768px) we have 4 columns, so 2 rows => 8 items
+    // On smaller screens we use 2 columns, so 2 rows => 4 items
+    return window.innerWidth >= 768 ? 8 : 4;
+  }
+
+  function renderPageNumbers(totalPages) {
+    pageNumbersContainer.innerHTML = "";
+    for (let i = 1; i <= totalPages; i++) {
+      const btn = document.createElement("button");
+      btn.className = "btn btn-sm";
+      btn.style.minWidth = "40px";
+      btn.textContent = i;
+
+      if (i === currentPage) {
+        btn.classList.add("btn-warning");
+      } else {
+        btn.classList.add("btn-outline-light");
+      }
+
+      btn.addEventListener("click", () => {
+        currentPage = i;
+        render();
+      });
+
+      pageNumbersContainer.appendChild(btn);
+    }
+  }
+
+  function render() {
+    itemsPerPage = calcItemsPerPage();
+    const totalPages = Math.max(
+      1,
+      Math.ceil(items.length / itemsPerPage)
+    );
+    if (currentPage > totalPages) currentPage = totalPages;
+
+    const start = (currentPage - 1) * itemsPerPage;
+    const end = start + itemsPerPage;
+
+    items.forEach((el, idx) => {
+      el.style.display = idx >= start && idx < end ? "" : "none";
+    });
+
+    // Update page number buttons
+    renderPageNumbers(totalPages);
+    prevBtn.disabled = currentPage <= 1;
+    nextBtn.disabled = currentPage >= totalPages;
+
+    // hide pagination if only 1 page
+    paginationWrap.style.display = totalPages > 1 ? "flex" : "none";
+  }
+
+  prevBtn.addEventListener("click", () => {
+    if (currentPage > 1) {
+      currentPage--;
+      render();
+    }
+  });
+  nextBtn.addEventListener("click", () => {
+    const totalPages = Math.max(
+      1,
+      Math.ceil(items.length / itemsPerPage)
+    );
+    if (currentPage < totalPages) {
+      currentPage++;
+      render();
+    }
+  });
+
+  // Recalculate on resize
+  let resizeTimer;
+  window.addEventListener("resize", () => {
+    clearTimeout(resizeTimer);
+    resizeTimer = setTimeout(() => {
+      currentPage = 1;
+      render();
+    }, 150);
+  });
+
+  // initial render
+  render();
+})();
@@ -0,0 +1,83 @@
+let selectedMethod = null;
+
+const bankDetails = {
+  bca: "1234567890",
+  mandiri: "1234567891",
+  bni: "1234567892",
+  cimb: "1234567893",
+};
+
+function selectPayment(method) {
+  // Remove previous selection
+  document.querySelectorAll(".payment-method").forEach((el) => {
+    el.classList.remove("selected");
+  });
+
+  // Add selection to clicked method
+  event.target.closest(".payment-method").classList.add("selected");
+  selectedMethod = method;
+
+  // Enable pay button
+  document.getElementById("btnPay").disabled = false;
+
+  // Show bank detail jika bank dipilih
+  const bankDetail = document.getElementById("bankDetail");
+  if (bankDetails[method]) {
+    bankDetail.style.display = "block";
+    document.getElementById("rekening").textContent = bankDetails[method];
+  } else {
+    bankDetail.style.display = "none";
+  }
+}
+
+function processPayment() {
+  if (!selectedMethod) {
+    alert("Pilih metode pembayaran terlebih dahulu!");
+    return;
+  }
+
+  // Set payment method ke hidden input
+  document.getElementById("paymentMethod").value = selectedMethod;
+
+  // Update status ke "Loading..."
+  updateStatus("loading");
+
+  // Simulasi proses pembayaran (3 detik)
+  setTimeout(() => {
+    updateStatus("success");
+
+    // Submit form otomatis setelah 2 detik
+    setTimeout(() => {
+      document.getElementById("paymentForm").submit();
+    }, 2000);
+  }, 3000);
+}
+
+function updateStatus(status) {
+  const badge = document.getElementById("statusBadge");
+  const icon = document.getElementById("statusIcon");
+  const title = document.getElementById("statusTitle");
+  const desc = document.getElementById("statusDesc");
+  const btnPay = document.getElementById("btnPay");
+
+  if (status === "loading") {
+    badge.style.background = "rgba(255, 215, 0, 0.1)";
+    icon.innerHTML = '<div class="spinner"></div>';
+    title.textContent = "Sedang Memproses...";
+    desc.textContent =
+      "Tunggu sebentar, kami sedang memproses pembayaran Anda";
+    btnPay.disabled = true;
+  } else if (status === "success") {
+    badge.style.background = "rgba(76, 175, 80, 0.1)";
+    badge.style.borderColor = "#4CAF50";
+    icon.innerHTML =
+      '<img src="' +
+      checkmarkUrl +
+      '" alt="checkmark" />';
+    title.style.color = "#4CAF50";
+    title.textContent = "Pembayaran Berhasil!";
+    desc.textContent = "Tiket Anda akan dikirim dalam hitungan detik...";
+    btnPay.textContent = "✓ Pembayaran Sukses";
+    btnPay.style.background = "#4CAF50";
+  }
+}
@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as cinema  # noqa: E402
+import db  # noqa: E402
+
+
+@pytest.fixture
+def app(tmp_path):
+    """App modul dengan database sementara (konfigurasi dikembalikan setelah test)"""
+    flask_app = cinema.app
+    saved = dict(flask_app.config)
+    flask_app.config.update(TESTING=True, DATABASE=str(tmp_path / 'test.db'), POSTER_CACHE=False,
+                            POSTER_DIR=str(tmp_path / 'posters'))
+    with flask_app.app_context():
+        cinema.init_db()
+        yield flask_app
+    db.close_pools()
+    flask_app.config.clear()
+    flask_app.config.update(saved)
@@ -0,0 +1,36 @@
+import asyncio
+import urllib.parse
+
+import app as cinema
+import asgi
+
+
+def asgi_post(application, path, body, headers):
+    """Satu request lewat aplikasi ASGI; body dikirim dalam dua potong (seperti chunked)"""
+    messages = [{'type': 'http.request', 'body': body[:5], 'more_body': True},
+                {'type': 'http.request', 'body': body[5:], 'more_body': False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {'type': 'http', 'method': 'POST', 'path': path, 'query_string': b'', 'headers': headers,
+             'http_version': '1.1', 'scheme': 'http', 'server': ('127.0.0.1', 80), 'client': ('127.0.0.1', 1)}
+    asyncio.run(application(scope, receive, send))
+    return sent[0]['status']
+
+
+def test_post_without_content_length_reads_form(app):
+    application = asgi.AsyncCinema(app)
+    form = urllib.parse.urlencode({'name': 'Chunked', 'email': 'chunked@example.com', 'password': 'pw'}).encode()
+    try:
+        status = asgi_post(application, '/register', form,
+                           [(b'content-type', b'application/x-www-form-urlencoded'),
+                            (b'transfer-encoding', b'chunked')])
+    finally:
+        application._stop()
+    assert status == 302
+    assert cinema.get_user_by_email('chunked@example.com') is not None
@@ -0,0 +1,22 @@
+import pytest
+from werkzeug.security import generate_password_hash
+
+import passwords
+
+
+@pytest.mark.parametrize('method', ['pbkdf2', 'pbkdf2:sha256', 'pbkdf2:sha256:1000000'])
+def test_shorthand_method_does_not_force_rehash(method):
+    pwhash = generate_password_hash('rahasia', method='pbkdf2')
+    assert not passwords.needs_rehash(pwhash, method)
+
+
+def test_changed_cost_needs_rehash():
+    pwhash = generate_password_hash('rahasia', method='pbkdf2:sha256:1000')
+    assert passwords.needs_rehash(pwhash, 'pbkdf2:sha256:2000')
+    assert passwords.needs_rehash(pwhash, 'scrypt')
+
+
+def test_expand_method_rejects_unknown():
+    assert passwords.expand_method('scrypt') == 'scrypt:32768:8:1'
+    with pytest.raises(ValueError):
+        passwords.expand_method('md5')
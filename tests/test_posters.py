@@ -0,0 +1,70 @@
+import struct
+import zlib
+
+import pytest
+
+import app as cinema
+import posters
+
+URL = 'https://example.com/img/poster.png'
+
+
+def png(width, height):
+    """PNG RGB polos tanpa Pillow"""
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+    rows = b''.join(b'\x00' + b'\x80\x20\x20' * width for _ in range(height))
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+            + chunk(b'IDAT', zlib.compress(rows)) + chunk(b'IEND', b''))
+
+
+@pytest.fixture
+def poster_movie(app, tmp_path):
+    source = tmp_path / 'source'
+    source.mkdir()
+    (source / 'poster.png').write_bytes(png(600, 900))
+    app.config['POSTER_FETCHER'] = posters.LocalDirFetcher(str(source))
+    movie = cinema.add_movie('Film Poster', 'Drama', 100, URL, '10:00 AM', 50000, 75000)
+    return movie['id']
+
+
+def cached_movie(movie_id):
+    cinema.catalog_cache.invalidate()
+    return cinema.get_movie_by_id(movie_id)
+
+
+def test_local_dir_fetcher_caches_original(app, poster_movie):
+    digest = posters.cache_poster(URL)
+    assert digest
+
+    movie = cached_movie(poster_movie)
+    assert movie['poster_digest'] == digest
+    with app.test_request_context('/'):
+        src = posters.poster_src(movie)
+    assert src.startswith('/posters/') and src != URL
+
+
+def test_local_dir_fetcher_thumbnails(app, poster_movie, tmp_path):
+    pytest.importorskip('PIL')
+    digest = posters.cache_poster(URL)
+
+    movie = cached_movie(poster_movie)
+    with app.test_request_context('/'):
+        assert posters.poster_src(movie, 240) == f"/posters/{posters.thumbnail_name(digest, 240)}"
+        assert '480w' in posters.poster_srcset(movie)
+    assert (tmp_path / 'posters' / posters.thumbnail_name(digest, 240)).is_file()
+
+
+def test_failed_poster_waits_for_retry_interval(app, tmp_path):
+    app.config['POSTER_FETCHER'] = posters.LocalDirFetcher(str(tmp_path))  # poster.png tidak ada
+    cinema.add_movie('Film Gagal', 'Drama', 100, URL, '10:00 AM', 50000, 75000)
+    assert posters.cache_poster(URL) is None
+
+    app.config['POSTER_CACHE'] = True
+    try:
+        assert posters.schedule_missing() == []
+        futures = posters.schedule_missing(retry_failed=True)
+        assert len(futures) == 1
+        assert futures[0].result() is None
+    finally:
+        posters.worker_pool.shutdown()
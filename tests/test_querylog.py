@@ -0,0 +1,22 @@
+import gc
+import json
+
+import querylog
+
+
+def test_unconsumed_slow_cursor_is_logged_on_del(tmp_path):
+    log_path = tmp_path / 'querylog.jsonl'
+    conn = querylog.TracedConnection(str(tmp_path / 'diag.db'))
+    conn.query_log = querylog.QueryLog(str(log_path), slow_ms=0.0)  # semua statement dianggap lambat
+    try:
+        cur = conn.execute("SELECT 1 UNION ALL SELECT 2")
+        cur.fetchone()  # baris kedua tidak pernah dibaca
+        del cur
+        gc.collect()
+    finally:
+        conn.close()
+
+    entries = [json.loads(line) for line in log_path.read_text(encoding='utf-8').splitlines()]
+    assert [e['fp'] for e in entries] == ['select ? union all select ?']
+    assert entries[0]['rows'] == 1
+    assert entries[0]['plan'] is None
@@ -0,0 +1,19 @@
+import sessions
+
+
+def test_static_requests_do_not_load_session(app, monkeypatch):
+    client = app.test_client()
+    client.post('/register', data={'name': 'Tes', 'email': 'sesi@example.com', 'password': 'pw'})
+    assert client.get_cookie('session')
+
+    loads = []
+    original = sessions.SqliteSessionStore.load
+    monkeypatch.setattr(sessions.SqliteSessionStore, 'load',
+                        lambda self, *args: loads.append(args[-1]) or original(self, *args))
+    response = client.get('/static/css/book.css')
+    assert response.status_code == 200
+    assert 'Set-Cookie' not in response.headers
+    assert loads == []
+
+    client.get('/profile')
+    assert len(loads) == 1